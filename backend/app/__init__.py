@@ -8,7 +8,7 @@ from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from app.utils.redis_client import get_redis_client
+from app.utils.redis_client import redis_manager
 from flask_cors import CORS
 from flask_uploads import configure_uploads, IMAGES, UploadSet
 from config import Config
@@ -70,19 +70,32 @@ def create_app():
         except Exception as e:
             logger.warning(f"Flask-Uploads configuration warning: {e}")
 
-        # Initialize Redis client within app context
-        try:
-            with app.app_context():
-                app.redis_client = get_redis_client()
-        except Exception as e:
-            logger.warning(f"Redis connection warning: {e}")
-            app.redis_client = None
+        # Initialize the shared Redis connection pool
+        redis_manager.init_app(app)
+
+        # Flask-Caching uses the managed pool settings (size, timeouts, health
+        # checks) instead of building its own client from CACHE_REDIS_URL
+        cache_client = redis_manager.binary_client()
+        if (cache_client is not None and app.config.get('CACHE_TYPE') == 'redis'
+                and app.config.get('CACHE_REDIS_URL') in (None, '', app.config.get('REDIS_URL'))):
+            app.config['CACHE_REDIS_HOST'] = cache_client
+            app.config['CACHE_REDIS_URL'] = None
 
         # Initialize Flask extensions
         cache.init_app(app) 
         db.init_app(app)
         migrate.init_app(app, db)
         jwt.init_app(app)
+
+        # Compile every email template once, up front
+        from app.services.email_renderer import email_renderer
+        email_renderer.init_app(app)
+
+        # Background email delivery (Celery or a local thread pool)
+        from app.services.email_queue import email_queue
+        email_queue.init_app(app)
+        from app.services.bulk_email_service import bulk_email
+        bulk_email.init_app(app)
         
         # Initialize rate limiter with error handling
         try:
@@ -108,6 +121,16 @@ def create_app():
         # Register blueprints
         register_blueprints(app)
 
+        # Register CLI commands
+        from app.cli import register_commands
+        register_commands(app)
+
+        # Outbox relay and email sweeps start with the first request each process
+        # serves, so CLI commands, the Celery worker and scripts that only call
+        # create_app() never run them
+        if app.config.get('BACKGROUND_WORKERS_ENABLED', True):
+            app.before_request(lambda: start_background_workers(app))
+
         # Error handlers
         @app.errorhandler(422)
         def handle_validation_error(e):
@@ -136,6 +159,16 @@ def create_app():
         logger.error(f"Failed to initialize app extensions: {e}")
         raise
 
+def start_background_workers(app):
+    """Start this process's periodic outbox relay and email sweeps if they are not running."""
+    from app.services.outbox import outbox
+    from app.services.email_queue import email_queue
+    from app.services.bulk_email_service import bulk_email
+
+    outbox.start(app)
+    email_queue.start_workers(app)
+    bulk_email.start_workers(app)
+
 def register_blueprints(app):
     """Register all application blueprints"""
     try:
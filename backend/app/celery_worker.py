@@ -0,0 +1,12 @@
+# app/celery_worker.py
+"""
+Celery entry point for background email delivery:
+
+    celery -A app.celery_worker.celery worker
+"""
+
+from app import create_app
+from app.services.email_queue import email_queue
+
+app = create_app()
+celery = email_queue.celery
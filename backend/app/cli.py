@@ -1,4 +1,4 @@
-# In app/cli.py or similar file where you define Flask CLI commands
+# app/cli.py
 import click
 from flask.cli import with_appcontext
 from app import db
@@ -14,5 +14,57 @@ def update_backers_count_command():
     db.session.commit()
     click.echo('Updated backers count for all projects.')
 
-# Register the command
-app.cli.add_command(update_backers_count_command)
\ No newline at end of file
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Rebuild the project search index and tell running workers to rebuild theirs."""
+    from app.services.search_index import search_index
+
+    count = search_index.rebuild()
+    if search_index.bump_generation():
+        click.echo(f'Indexed {count} projects; running workers will rebuild on their next sync.')
+    else:
+        click.echo(f'Indexed {count} projects; Redis is unavailable, so running workers rebuild on their own schedule.')
+
+@click.command('compact-token-blocklist')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows deleted per transaction.')
+@click.option('--optimize', is_flag=True, help='Rebuild the table afterwards to reclaim space (MySQL only).')
+@with_appcontext
+def compact_token_blocklist_command(batch_size, optimize):
+    """Delete every token_blocklist row whose token has expired."""
+    from app.services.revocation_cache import revocation_cache
+
+    pruned = revocation_cache.prune_expired(batch_size=batch_size)
+    click.echo(f'Deleted {pruned} expired token_blocklist rows.')
+    if optimize and db.engine.dialect.name == 'mysql':
+        db.session.execute(db.text('OPTIMIZE TABLE token_blocklist'))
+        db.session.commit()
+        click.echo('Rebuilt token_blocklist.')
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Recompute project_stats and user_stats from donations and payouts."""
+    from app.services.stats_service import rebuild_stats
+
+    projects, users = rebuild_stats()
+    click.echo(f'Rebuilt stats for {projects} projects and {users} users.')
+
+@click.command('drain-outbox')
+@click.option('--batch-size', default=500, show_default=True, help='Messages relayed per transaction.')
+@with_appcontext
+def drain_outbox_command(batch_size):
+    """Relay every due outbox message now and delete old dispatched ones."""
+    from app.services.outbox import outbox
+
+    relayed = outbox.drain(batch_size=batch_size)
+    pruned = outbox.prune()
+    click.echo(f'Relayed {relayed} outbox messages; deleted {pruned} old dispatched ones.')
+
+def register_commands(app):
+    """Register the CLI commands with the app."""
+    app.cli.add_command(update_backers_count_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(compact_token_blocklist_command)
+    app.cli.add_command(rebuild_stats_command)
+    app.cli.add_command(drain_outbox_command)
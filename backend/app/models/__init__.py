@@ -15,12 +15,40 @@ from .project_update import ProjectUpdate
 from .tag import Tag
 from .faq import FAQ
 from .media import Media, MediaType
+from .project_funding_shard import ProjectFundingShard
 
 # Financial models
 from .donation import Donation
 # from .payment import Payment, PaymentStatus, PaymentMethod
 from .reward import Reward
 from .token_blocklist import TokenBlocklist
+from .payout import Payout, PayoutStatus
+from .stats import ProjectStats, UserStats
+from .email_delivery import EmailDelivery, EmailDeliveryStatus
+from .bulk_email_job import BulkEmailJob, BulkEmailJobStatus
+from .outbox import OutboxMessage, OutboxStatus
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import column_property
+from .project import project_backers
+
+# Aggregates for User.to_dict. They are deferred in one group, so the first
+# access loads all three in a single query; list queries can load them up
+# front with .options(undefer_group('stats')).
+User.projects_created_count = column_property(
+    select(func.count(Project.id)).where(Project.creator_id == User.id).correlate_except(Project).scalar_subquery(),
+    deferred=True, group='stats'
+)
+User.backed_projects_count = column_property(
+    select(func.count(project_backers.c.project_id)).where(project_backers.c.user_id == User.id)
+    .correlate_except(project_backers).scalar_subquery(),
+    deferred=True, group='stats'
+)
+User.total_donations_amount = column_property(
+    select(func.coalesce(UserStats.donation_amount, 0)).where(UserStats.user_id == User.id)
+    .correlate_except(UserStats).scalar_subquery(),
+    deferred=True, group='stats'
+)
 
 # We don't need to create a Base here since we're using Flask-SQLAlchemy
 # The db.Model will serve as our declarative base
@@ -0,0 +1,57 @@
+# app/models/bulk_email_job.py
+from datetime import datetime
+from enum import Enum as PyEnum
+from app import db
+
+class BulkEmailJobStatus(PyEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class BulkEmailJob(db.Model):
+    """One email rendered once and fanned out to every backer of a project, with its progress."""
+    __tablename__ = 'bulk_email_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    email_type = db.Column(db.String(50), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    text_content = db.Column(db.Text, nullable=False)
+    html_content = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Enum(BulkEmailJobStatus), nullable=False, default=BulkEmailJobStatus.PENDING)
+    total_recipients = db.Column(db.Integer, nullable=False, default=0)
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)
+    batches_total = db.Column(db.Integer, nullable=False, default=0)
+    batches_done = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    # Set when the job starts and after every chunk; the stale-job sweep reads it
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_bulk_email_jobs_status_heartbeat', 'status', 'heartbeat_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'email_type': self.email_type,
+            'status': self.status.value,
+            'total_recipients': self.total_recipients,
+            'sent_count': self.sent_count,
+            'failed_count': self.failed_count,
+            'batches_total': self.batches_total,
+            'batches_done': self.batches_done,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f'<BulkEmailJob {self.id} {self.email_type} for project {self.project_id} {self.status.value}>'
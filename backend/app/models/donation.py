@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Boolean, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 from .enums import DonationStatus
 from sqlalchemy import UniqueConstraint
@@ -10,13 +10,14 @@ class Donation(db.Model):
 
     
     id = db.Column(db.Integer, primary_key=True)
-    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    # active_history keeps the replaced value for the project_stats/user_stats flush hook
+    amount = column_property(db.Column(db.Numeric(10, 2), nullable=False), active_history=True)
     currency = db.Column(db.String(3), nullable=False, default='USD')
     created_at = db.Column(DateTime(timezone=True), server_default=func.now())
     updated_at = db.Column(DateTime(timezone=True), onupdate=func.now())
     user_id = db.Column(db.Integer, ForeignKey('users.id'), nullable=False)
     project_id = db.Column(db.Integer, ForeignKey('projects.id'), nullable=False)
-    status = db.Column(db.Enum(DonationStatus), default=DonationStatus.PENDING)
+    status = column_property(db.Column(db.Enum(DonationStatus), default=DonationStatus.PENDING), active_history=True)
     payment_session_id = db.Column(db.String(255), unique=True, nullable=True)
     payment_id = db.Column(db.String(255), unique=True, nullable=True)
     completed_at = db.Column(db.DateTime, nullable=True)
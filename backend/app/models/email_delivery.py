@@ -0,0 +1,36 @@
+# app/models/email_delivery.py
+from datetime import datetime
+from enum import Enum as PyEnum
+from app import db
+
+class EmailDeliveryStatus(PyEnum):
+    QUEUED = "QUEUED"
+    SENDING = "SENDING"
+    RETRYING = "RETRYING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+class EmailDelivery(db.Model):
+    """One queued email, rendered at enqueue time, and the outcome of sending it."""
+    __tablename__ = 'email_deliveries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(120), nullable=False, index=True)
+    email_type = db.Column(db.String(50), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    text_content = db.Column(db.Text, nullable=False)
+    html_content = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Enum(EmailDeliveryStatus), nullable=False, default=EmailDeliveryStatus.QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(500), nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # The requeue sweep looks for unfinished deliveries that are due
+        db.Index('ix_email_deliveries_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f'<EmailDelivery {self.id} {self.email_type} to {self.to_email} {self.status.value}>'
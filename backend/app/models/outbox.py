@@ -0,0 +1,31 @@
+# app/models/outbox.py
+from datetime import datetime
+from enum import Enum as PyEnum
+from app import db
+
+class OutboxStatus(PyEnum):
+    PENDING = "PENDING"
+    DISPATCHED = "DISPATCHED"
+    FAILED = "FAILED"
+
+class OutboxMessage(db.Model):
+    """A side effect recorded in the same transaction as the change that caused it, relayed after commit."""
+    __tablename__ = 'outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(500), nullable=True)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    dispatched_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # The relay claims pending messages that are due, oldest first
+        db.Index('ix_outbox_status_available', 'status', 'available_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<OutboxMessage {self.id} {self.kind} {self.status.value}>'
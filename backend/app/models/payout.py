@@ -1,6 +1,6 @@
 # app/models/payout.py
 from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, String, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 from app import db
 from enum import Enum as PyEnum
@@ -17,10 +17,11 @@ class Payout(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    # active_history keeps the replaced value for the project_stats flush hook
+    amount = column_property(db.Column(db.Numeric(10, 2), nullable=False), active_history=True)
     fee_amount = db.Column(db.Numeric(10, 2), nullable=False, default=0)
     currency = db.Column(db.String(3), nullable=False, default='USD')
-    status = db.Column(db.Enum(PayoutStatus), default=PayoutStatus.PENDING)
+    status = column_property(db.Column(db.Enum(PayoutStatus), default=PayoutStatus.PENDING), active_history=True)
     stripe_payout_id = db.Column(db.String(255), unique=True, nullable=True)
     created_at = db.Column(db.DateTime, server_default=func.now())
     processed_at = db.Column(db.DateTime, nullable=True)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Table, Boolean, Enum, Numeric
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Table, Boolean, Enum, Numeric, Index
+from sqlalchemy import case, event, func, inspect
 from sqlalchemy.orm import relationship
 from . import db
 from decimal import Decimal
@@ -12,12 +13,22 @@ project_backers = Table('project_backers', db.metadata,
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Backs /projects/search on MySQL; other databases use the Python ranker
+        Index('ix_projects_fulltext', 'title', 'description', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        # Listing sorts: funding progress, newest active, a creator's projects
+        Index('ix_projects_status_deleted_ratio', 'status', 'is_deleted', 'funding_ratio'),
+        Index('ix_projects_status_created', 'status', 'created_at'),
+        Index('ix_projects_creator_status_created', 'creator_id', 'status', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=False)
     current_amount = Column(Numeric(10, 2))  # 10 digits in total, 2 after decimal point
     goal_amount = Column(Numeric(10, 2))
+    # current_amount / goal_amount, stored so funding progress sorts can use an index
+    funding_ratio = Column(Float, default=0, server_default='0', nullable=False)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -35,6 +46,10 @@ class Project(db.Model):
     is_deleted = Column(Boolean, default=False, nullable=False)
     deleted_at = Column(DateTime)
     backers_count = db.Column(db.Integer, default=0)
+    # When set, pledges go to project_funding_shards instead of current_amount
+    sharded_funding = db.Column(db.Boolean, default=False, server_default='0', nullable=False)
+    # Written in bulk by the view counter flusher, never on the request path
+    view_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     payouts = db.relationship("Payout", back_populates="project")
     # Add a field to track if the project funds are available for withdrawal
@@ -86,13 +101,41 @@ class Project(db.Model):
             else:
                 self.status = ProjectStatus.DRAFT
 
-    def to_dict(self):
+    def get_current_amount(self):
+        """Current amount including pledges still held in funding shards."""
+        if not self.sharded_funding:
+            return self.current_amount
+        from app.services.funding_counter_service import funding_counter
+        return funding_counter.get_current_amount(self.id)
+
+    def compute_funding_ratio(self):
+        if not self.goal_amount or self.goal_amount <= 0:
+            return 0.0
+        return float(Decimal(self.current_amount or 0) / Decimal(self.goal_amount))
+
+    @classmethod
+    def funding_ratio_after(cls, new_amount):
+        """
+        SQL expression for funding_ratio once current_amount becomes `new_amount`.
+
+        Put it before current_amount in an ordered UPDATE: MySQL evaluates
+        SET assignments left to right, so it must still see the old value.
+        """
+        return case((cls.goal_amount > 0, new_amount / cls.goal_amount), else_=0)
+
+    def to_dict(self, live_amount=False):
+        """
+        With `live_amount`, current_amount includes pledges still held in
+        funding shards, at the cost of a cache lookup or shard query for
+        sharded projects. Listings leave it off and show the folded amount,
+        which lags by at most FUNDING_SHARD_FOLD_INTERVAL.
+        """
         return {
             "id": self.id,
             "title": self.title,
             "description": self.description,
             "goal_amount": self.goal_amount,
-            "current_amount": self.current_amount,
+            "current_amount": self.get_current_amount() if live_amount else self.current_amount,
             "start_date": self.start_date.isoformat(),
             "end_date": self.end_date.isoformat(),
             "created_at": self.created_at.isoformat(),
@@ -105,4 +148,26 @@ class Project(db.Model):
             "video_url": self.video_url,
             "is_deleted": self.is_deleted,
             "deleted_at": self.deleted_at.isoformat() if self.deleted_at else None,
-        }
\ No newline at end of file
+            "view_count": self.view_count or 0,
+            "funding_ratio": self.funding_ratio or 0,
+        }
+
+
+@event.listens_for(Project, 'before_insert')
+def _set_funding_ratio_on_insert(mapper, connection, target):
+    target.funding_ratio = target.compute_funding_ratio()
+
+
+@event.listens_for(Project, 'before_update')
+def _set_funding_ratio_on_update(mapper, connection, target):
+    state = inspect(target)
+    amount_changed = state.attrs.current_amount.history.has_changes()
+    if not amount_changed and not state.attrs.goal_amount.history.has_changes():
+        return
+    if amount_changed:
+        target.funding_ratio = target.compute_funding_ratio()
+    elif target.goal_amount and target.goal_amount > 0:
+        # current_amount may have moved in SQL since this object was loaded
+        target.funding_ratio = func.coalesce(Project.current_amount, 0) / target.goal_amount
+    else:
+        target.funding_ratio = 0
\ No newline at end of file
@@ -0,0 +1,22 @@
+# app/models/project_funding_shard.py
+
+from app import db
+
+
+class ProjectFundingShard(db.Model):
+    """
+    One slice of a project's pledged amount.
+
+    Pledges to a sharded project increment a random shard instead of the
+    projects row; a background job folds the shards back into
+    Project.current_amount.
+    """
+    __tablename__ = 'project_funding_shards'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    shard_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    amount = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    pledge_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ProjectFundingShard project_id={self.project_id} shard_id={self.shard_id} amount={self.amount}>'
@@ -0,0 +1,201 @@
+# app/models/stats.py
+
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import db
+from .donation import Donation
+from .enums import DonationStatus
+from .payout import Payout, PayoutStatus
+from .project import Project
+from .user import User
+
+# Payouts in these states count against a project's available funds
+PAID_OUT_STATUSES = (PayoutStatus.COMPLETED, PayoutStatus.PROCESSING)
+
+
+class ProjectStats(db.Model):
+    """Per-project donation and payout aggregates, kept current at flush time."""
+    __tablename__ = 'project_stats'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    donation_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    donation_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+    completed_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+    backer_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    paid_out_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+
+    @property
+    def average_amount(self):
+        if not self.donation_count:
+            return Decimal('0')
+        return self.donation_amount / self.donation_count
+
+    def __repr__(self):
+        return f'<ProjectStats {self.project_id}>'
+
+
+class UserStats(db.Model):
+    """Per-user donation aggregates, kept current at flush time."""
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    donation_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    donation_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+    completed_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<UserStats {self.user_id}>'
+
+
+def _previous(obj, attr):
+    """The attribute's value as of the last flush (Donation and Payout track status/amount with active_history)."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    # Read loaded state directly: a deleted row can no longer be refreshed
+    return inspect(obj).dict.get(attr)
+
+
+def _money(amount):
+    return Decimal(str(amount)) if amount is not None else Decimal('0')
+
+
+def _donation_deltas(status, amount, sign):
+    amount = _money(amount) * sign
+    completed = amount if status == DonationStatus.COMPLETED else Decimal('0')
+    return {'donation_count': sign, 'donation_amount': amount, 'completed_amount': completed}
+
+
+def _payout_deltas(status, amount, sign):
+    paid = _money(amount) * sign if status in PAID_OUT_STATUSES else Decimal('0')
+    return {'paid_out_amount': paid}
+
+
+def _add(target, key, deltas):
+    for column, delta in deltas.items():
+        target[key][column] += delta
+
+
+def _upsert(connection, model, key_column, key, deltas):
+    """Add `deltas` to the stats row for `key` in SQL, creating it if missing."""
+    table = model.__table__
+    deltas = {
+        column: int(delta) if isinstance(table.c[column].type, db.Integer) else delta
+        for column, delta in deltas.items() if delta
+    }
+    if not deltas:
+        return
+    values = {key_column: key, **deltas}
+    if connection.dialect.name == 'mysql':
+        stmt = mysql_insert(table).values(**values)
+        stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in deltas})
+    elif connection.dialect.name == 'sqlite':
+        stmt = sqlite_insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column],
+            set_={c: table.c[c] + stmt.excluded[c] for c in deltas}
+        )
+    else:
+        result = connection.execute(
+            table.update().where(table.c[key_column] == key)
+            .values({c: table.c[c] + delta for c, delta in deltas.items()})
+        )
+        if result.rowcount:
+            return
+        stmt = table.insert().values(**values)
+    connection.execute(stmt)
+
+
+@event.listens_for(Session, 'before_flush')
+def _load_deleted_values(session, flush_context, instances):
+    # Make sure explicitly deleted rows have the values the after_flush hook subtracts
+    for obj in session.deleted:
+        if isinstance(obj, (Donation, Payout)):
+            for attr in ('status', 'amount', 'project_id', 'user_id'):
+                getattr(obj, attr)
+
+
+@event.listens_for(Session, 'after_flush')
+def _apply_stats_deltas(session, flush_context):
+    """
+    Fold the flushed Donation and Payout changes into project_stats and user_stats.
+
+    Runs in the flush's transaction, so the aggregates commit or roll back
+    with the rows they describe. Counters are incremented in SQL rather than
+    read and rewritten, so concurrent flushes cannot lose updates. A
+    donation's project_id and user_id are treated as immutable.
+    """
+    project_deltas = defaultdict(lambda: defaultdict(Decimal))
+    user_deltas = defaultdict(lambda: defaultdict(Decimal))
+    donors_added = defaultdict(int)
+    donors_removed = defaultdict(int)
+
+    for obj in session.new:
+        if isinstance(obj, Donation):
+            deltas = _donation_deltas(obj.status, obj.amount, 1)
+            _add(project_deltas, obj.project_id, deltas)
+            _add(user_deltas, obj.user_id, deltas)
+            donors_added[(obj.project_id, obj.user_id)] += 1
+        elif isinstance(obj, Payout):
+            _add(project_deltas, obj.project_id, _payout_deltas(obj.status, obj.amount, 1))
+
+    for obj in session.dirty:
+        if isinstance(obj, Donation):
+            old = _donation_deltas(_previous(obj, 'status'), _previous(obj, 'amount'), -1)
+            new = _donation_deltas(obj.status, obj.amount, 1)
+            old.pop('donation_count'), new.pop('donation_count')
+            for deltas in (old, new):
+                _add(project_deltas, obj.project_id, deltas)
+                _add(user_deltas, obj.user_id, deltas)
+        elif isinstance(obj, Payout):
+            _add(project_deltas, obj.project_id, _payout_deltas(_previous(obj, 'status'), _previous(obj, 'amount'), -1))
+            _add(project_deltas, obj.project_id, _payout_deltas(obj.status, obj.amount, 1))
+
+    for obj in session.deleted:
+        if isinstance(obj, Donation):
+            deltas = _donation_deltas(_previous(obj, 'status'), _previous(obj, 'amount'), -1)
+            _add(project_deltas, obj.project_id, deltas)
+            _add(user_deltas, obj.user_id, deltas)
+            donors_removed[(obj.project_id, obj.user_id)] += 1
+        elif isinstance(obj, Payout):
+            _add(project_deltas, obj.project_id, _payout_deltas(_previous(obj, 'status'), _previous(obj, 'amount'), -1))
+
+    if not (project_deltas or user_deltas):
+        return
+    # Read after commit to invalidate cached views of these projects (app/utils/cache_tags.py)
+    session.info.setdefault('changed_projects', set()).update(project_deltas)
+
+    connection = session.connection()
+    # backer_count is distinct donors: it changes when a pair's first donation
+    # arrives or its last one goes, which the flushed rows alone cannot tell
+    for (project_id, user_id) in set(donors_added) | set(donors_removed):
+        remaining = connection.execute(
+            select(func.count()).select_from(Donation.__table__)
+            .where(Donation.__table__.c.project_id == project_id, Donation.__table__.c.user_id == user_id)
+        ).scalar()
+        before = remaining - donors_added[(project_id, user_id)] + donors_removed[(project_id, user_id)]
+        project_deltas[project_id]['backer_count'] += int(remaining > 0) - int(before > 0)
+
+    # Stats rows of projects and users deleted in this flush go with them
+    deleted_projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+
+    for project_id, deltas in project_deltas.items():
+        if project_id in deleted_projects:
+            connection.execute(ProjectStats.__table__.delete().where(ProjectStats.__table__.c.project_id == project_id))
+        else:
+            _upsert(connection, ProjectStats, 'project_id', project_id, deltas)
+    for user_id, deltas in user_deltas.items():
+        if user_id in deleted_users:
+            connection.execute(UserStats.__table__.delete().where(UserStats.__table__.c.user_id == user_id))
+        else:
+            _upsert(connection, UserStats, 'user_id', user_id, deltas)
+
+    # Loaded stats objects are stale now; reload them on next access
+    for obj in session.identity_map.values():
+        if isinstance(obj, (ProjectStats, UserStats)):
+            session.expire(obj)
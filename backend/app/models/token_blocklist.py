@@ -7,6 +7,8 @@ class TokenBlocklist(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     jti = db.Column(db.String(36), nullable=False, unique=True)
     created_at = db.Column(db.DateTime, nullable=False)
+    # When the revoked token would have expired anyway; the row can be pruned after this
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
     def __repr__(self):
-        return f'<TokenBlocklist {self.jti}>'
\ No newline at end of file
+        return f'<TokenBlocklist {self.jti}>'
@@ -103,7 +103,8 @@ class User(db.Model):
         db.session.commit()
 
     def get_total_donations(self):
-        return sum(donation.amount for donation in self.donations)
+        # total_donations_amount and the other 'stats' aggregates are defined in app/models/__init__.py
+        return self.total_donations_amount
 
     def update_last_login(self):
         self.last_login = datetime.utcnow()
@@ -202,8 +203,8 @@ class User(db.Model):
             'is_verified': self.is_verified,
             'roles': [role.name for role in self.roles],  # List of role names
             'last_login': self.last_login.isoformat() if self.last_login else None,
-            'projects_created_count': len(self.projects_created),
-            'backed_projects_count': len(self.backed_projects),
+            'projects_created_count': self.projects_created_count,
+            'backed_projects_count': self.backed_projects_count,
             'total_donations': self.get_total_donations(),
             'two_factor_enabled': self.two_factor_enabled,
         }
@@ -6,6 +6,7 @@ from app.services.auth_service import AuthService
 from app.utils.response import api_response
 from flask_limiter.util import get_remote_address
 import logging
+from datetime import datetime
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -136,8 +137,9 @@ def refresh():
 @bp.route('/logout', methods=['DELETE'])
 @jwt_required()
 def logout():
-    jti = get_jwt()["jti"]
-    success, message = AuthService.logout_user(jti)
+    token = get_jwt()
+    jti = token["jti"]
+    success, message = AuthService.logout_user(jti, datetime.utcfromtimestamp(token["exp"]))
     logger.info(f"User logged out and JWT revoked with jti: {jti}")
     return jsonify(msg=message), 200
 
@@ -189,10 +189,12 @@ def list_project_backers(project_id):
     Endpoint for listing backers of a project.
     
     This function retrieves a paginated list of backers for a specific project.
+    Pass ?after=<user_id> (the previous page's next_cursor) for keyset paging.
     """
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
-    result = backer_service.get_project_backers(project_id, page, per_page)
+    after = request.args.get('after', None, type=int)
+    result = backer_service.get_project_backers(project_id, page, per_page, after=after)
     if 'error' in result:
         logger.error(f"Error in list_project_backers: {result['error']}")
         return error_response(message=result['error'], status_code=result.get('status_code', 404))
@@ -326,8 +328,8 @@ def send_project_update(project_id):
         logger.error(f"Error in send_project_update: {result['error']}")
         return error_response(message=result['error'], status_code=result.get('status_code', 404))
     
-    logger.info(f"Project update sent for project {project_id}")
-    return success_response(message=result['message'])
+    logger.info(f"Project update queued for project {project_id}")
+    return success_response(data=result['job'], message=result['message'])
 
 @backer_bp.route('/projects/<int:project_id>/send-milestone', methods=['POST'])
 @jwt_required()
@@ -352,5 +354,17 @@ def send_project_milestone(project_id):
         logger.error(f"Error in send_project_milestone: {result['error']}")
         return error_response(message=result['error'], status_code=result.get('status_code', 404))
     
-    logger.info(f"Project milestone sent for project {project_id}")
-    return success_response(message=result['message'])
\ No newline at end of file
+    logger.info(f"Project milestone queued for project {project_id}")
+    return success_response(data=result['job'], message=result['message'])
+
+@backer_bp.route('/projects/<int:project_id>/email-jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+@permission_required('send_project_update', 'send_project_milestone')
+def get_email_job(project_id, job_id):
+    """
+    Endpoint for checking the progress of a project update or milestone email.
+    """
+    result = backer_service.get_bulk_email_job(project_id, job_id)
+    if 'error' in result:
+        return error_response(message=result['error'], status_code=result.get('status_code', 404))
+    return success_response(data=result)
\ No newline at end of file
@@ -8,6 +8,7 @@ from app.services.project_service import (
     create_project, get_project_by_id, update_project, delete_project, get_all_projects, get_user_drafts, activate_project
 )
 from app.utils.exceptions import ProjectNotFoundError, ValidationError
+from app.utils.pagination import keyset_paginate, cursor_requested, total_requested
 from app.utils.response import api_response
 from app.models.enums import ProjectStatus
 from app.utils.file_utils import handle_file_upload
@@ -22,7 +23,12 @@ from app.utils.decorators import permission_required
 from app.services.notification_service import NotificationService
 from app.services.email_service import send_templated_email
 from app.utils.rate_limit import rate_limit
+from app.services.view_counter_service import view_counter
+from app.services import search_service
+from app.services.search_index import search_index
+from app.services.discovery_service import discovery_feed
 import os
+from math import ceil
 from app.utils.sharing import generate_share_link, validate_share_link
 from sqlalchemy import or_, and_  
 
@@ -417,7 +423,7 @@ def get_project(project_id):
     """Get a single project by ID"""
     try:
         project = get_project_by_id(project_id)
-        return api_response(data=project.to_dict(), status_code=200)
+        return api_response(data=project.to_dict(live_amount=True), status_code=200)
     except ProjectNotFoundError as e:
         return api_response(message=str(e), status_code=404)
     except Exception as e:
@@ -473,12 +479,31 @@ def get_projects():
         
         # Apply additional filters from request
         filters = {k: v for k, v in request.args.items() 
-                  if k not in ['page', 'per_page', 'sort_by', 'sort_order', 'my_projects', 'status']}
+                  if k not in ['page', 'per_page', 'sort_by', 'sort_order', 'my_projects', 'status',
+                               'cursor', 'include_total']}
                   
         for key, value in filters.items():
             if hasattr(Project, key):
                 query = query.filter(getattr(Project, key) == value)
         
+        # Cursor mode: keyset pagination on (sort_by, id)
+        if cursor_requested(request.args):
+            if sort_by not in Project.__table__.columns:
+                return api_response(message=f"Cannot sort by {sort_by}", status_code=400)
+            keyset_page = keyset_paginate(
+                query, getattr(Project, sort_by), Project.id, per_page,
+                cursor=request.args.get('cursor'),
+                descending=sort_order == 'desc',
+                with_total=total_requested(request.args)
+            )
+            return api_response(data={
+                'projects': [project.to_dict() for project in keyset_page.items],
+                **keyset_page.meta(per_page),
+                'sort_by': sort_by,
+                'sort_order': sort_order,
+                'filters': filters
+            }, status_code=200)
+        
         # Apply sorting
         if hasattr(Project, sort_by):
             sort_column = getattr(Project, sort_by)
@@ -498,6 +523,8 @@ def get_projects():
             'sort_order': sort_order,
             'filters': filters
         }, status_code=200)
+    except ValidationError as e:
+        return api_response(message=str(e), status_code=400)
     except Exception as e:
         logger.error(f'Error retrieving projects: {e}')
         return api_response(message="An unexpected error occurred", status_code=500)
@@ -552,6 +579,21 @@ def get_pending_projects():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
+        if cursor_requested(request.args):
+            keyset_page = keyset_paginate(
+                Project.query.filter_by(status=ProjectStatus.PENDING),
+                Project.created_at, Project.id, per_page,
+                cursor=request.args.get('cursor'),
+                with_total=total_requested(request.args)
+            )
+            return api_response(
+                data={
+                    'projects': [project.to_dict() for project in keyset_page.items],
+                    **keyset_page.meta(per_page)
+                },
+                status_code=200
+            )
+        
         pending_projects = Project.query.filter_by(status=ProjectStatus.PENDING)\
             .paginate(page=page, per_page=per_page, error_out=False)
         
@@ -564,6 +606,8 @@ def get_pending_projects():
             },
             status_code=200
         )
+    except ValidationError as e:
+        return api_response(message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"Error fetching pending projects: {str(e)}")
         return api_response(message="Failed to fetch pending projects", status_code=500)
@@ -618,7 +662,7 @@ def view_project(project_id):
                 )
         
         # Prepare the response data
-        project_data = project.to_dict()
+        project_data = project.to_dict(live_amount=True)
         
         # Add additional fields for authenticated users
         if current_user_id:
@@ -646,9 +690,8 @@ def view_project(project_id):
                 )
                 project_data['user_backing'] = user_backing.to_dict() if user_backing else None
         
-        # Increment view count
-        project.view_count = project.view_count + 1 if project.view_count else 1
-        db.session.commit()
+        # Buffer the view; it is written to the database by the periodic flusher
+        view_counter.record_view(project.id)
         
         # Add share URL
         project_data['share_url'] = url_for(
@@ -687,6 +730,20 @@ def get_my_projects():
         if status:
             query = query.filter_by(status=status)
             
+        if cursor_requested(request.args):
+            keyset_page = keyset_paginate(
+                query, Project.created_at, Project.id, per_page,
+                cursor=request.args.get('cursor'),
+                with_total=total_requested(request.args)
+            )
+            return api_response(
+                data={
+                    'projects': [p.to_dict() for p in keyset_page.items],
+                    'meta': keyset_page.meta(per_page)
+                },
+                status_code=200
+            )
+        
         # Order by creation date, newest first
         query = query.order_by(Project.created_at.desc())
         
@@ -707,6 +764,8 @@ def get_my_projects():
             data={'projects': projects, 'meta': meta},
             status_code=200
         )
+    except ValidationError as e:
+        return api_response(message=str(e), status_code=400)
     except Exception as e:
         logger.error(f'Error fetching user projects: {str(e)}', exc_info=True)
         return api_response(message="An unexpected error occurred", status_code=500)
@@ -735,6 +794,20 @@ def get_user_projects(user_id):
                 Project.status == ProjectStatus.COMPLETED
             ))
             
+        if cursor_requested(request.args):
+            keyset_page = keyset_paginate(
+                query, Project.created_at, Project.id, per_page,
+                cursor=request.args.get('cursor'),
+                with_total=total_requested(request.args)
+            )
+            return api_response(
+                data={
+                    'projects': [p.to_dict() for p in keyset_page.items],
+                    'meta': keyset_page.meta(per_page)
+                },
+                status_code=200
+            )
+        
         # Order by creation date, newest first
         query = query.order_by(Project.created_at.desc())
         
@@ -755,6 +828,8 @@ def get_user_projects(user_id):
             data={'projects': projects, 'meta': meta},
             status_code=200
         )
+    except ValidationError as e:
+        return api_response(message=str(e), status_code=400)
     except Exception as e:
         logger.error(f'Error fetching user projects: {str(e)}', exc_info=True)
         return api_response(message="An unexpected error occurred", status_code=500)
@@ -828,6 +903,7 @@ def revoke_project_route(project_id):
         try:
             project.status = ProjectStatus.REVOKED
             db.session.commit()
+            search_index.remove_project(project_id)
             
             logger.info(f"Successfully updated project {project_id} status to REVOKED")
             
@@ -939,6 +1015,18 @@ def admin_pending_projects():
         
         # Use filters to get only pending projects
         filters = {'status': ProjectStatus.PENDING}
+        
+        if cursor_requested(request.args):
+            keyset_page = get_all_projects(
+                per_page=per_page, filters=filters,
+                cursor=request.args.get('cursor'),
+                with_total=total_requested(request.args)
+            )
+            return api_response(data={
+                'projects': [project.to_dict() for project in keyset_page.items],
+                **keyset_page.meta(per_page)
+            }, status_code=200)
+        
         projects_pagination = get_all_projects(page, per_page, 'created_at', 'desc', filters)
         
         return api_response(data={
@@ -947,6 +1035,8 @@ def admin_pending_projects():
             'pages': projects_pagination.pages,
             'current_page': page
         }, status_code=200)
+    except ValidationError as e:
+        return api_response(message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"Error fetching pending projects: {str(e)}")
         return api_response(message="Failed to fetch pending projects", status_code=500)
@@ -1046,13 +1136,24 @@ def get_saved_projects():
         
         # Query saved projects with pagination
         saved_projects_query = SavedProject.query.filter_by(user_id=current_user_id)
-        saved_projects_paginated = saved_projects_query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        keyset_page = None
+        if cursor_requested(request.args):
+            # Most recently saved first; ids follow save order
+            keyset_page = keyset_paginate(
+                saved_projects_query, SavedProject.id, SavedProject.id, per_page,
+                cursor=request.args.get('cursor'),
+                with_total=total_requested(request.args)
+            )
+            saved_items = keyset_page.items
+        else:
+            saved_projects_paginated = saved_projects_query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            saved_items = saved_projects_paginated.items
         
         # Get the actual project data for each saved project
         projects = []
-        for saved_project in saved_projects_paginated.items:
+        for saved_project in saved_items:
             try:
                 project = get_project_by_id(saved_project.project_id)
                 project_dict = project.to_dict()
@@ -1068,6 +1169,12 @@ def get_saved_projects():
             except ProjectNotFoundError:
                 continue
         
+        if keyset_page is not None:
+            return api_response(
+                data={'projects': projects, **keyset_page.meta(per_page)},
+                status_code=200
+            )
+        
         return api_response(
             data={
                 'projects': projects,
@@ -1078,6 +1185,8 @@ def get_saved_projects():
             status_code=200
         )
         
+    except ValidationError as e:
+        return api_response(message=str(e), status_code=400)
     except Exception as e:
         logger.error(f"Error retrieving saved projects: {str(e)}")
         return api_response(
@@ -1094,29 +1203,11 @@ def search_projects():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        # Base query for active projects
-        projects_query = Project.query.filter_by(status=ProjectStatus.ACTIVE)
-        
-        # Add search filter if query is provided
-        if query:
-            search_filter = or_(
-                Project.title.ilike(f'%{query}%'),
-                Project.description.ilike(f'%{query}%')
-            )
-            projects_query = projects_query.filter(search_filter)
-            
-        # Add category filter if provided
-        if category_id:
-            projects_query = projects_query.filter_by(category_id=category_id)
-            
-        # Add order by to ensure consistent results
-        projects_query = projects_query.order_by(Project.created_at.desc())
-            
-        # Execute query with pagination
-        projects = projects_query.paginate(
-            page=page, 
-            per_page=per_page,
-            error_out=False
+        projects, total = search_service.search_projects(
+            query,
+            category_id=category_id,
+            page=page,
+            per_page=per_page
         )
         
         # Transform the results to include necessary fields for the frontend
@@ -1127,13 +1218,13 @@ def search_projects():
             'image_url': p.image_url,
             'category_name': p.category.name if p.category else 'Uncategorized',
             'created_at': p.created_at.isoformat() if p.created_at else None
-        } for p in projects.items]
+        } for p in projects]
         
         return api_response(
             data={
                 'projects': project_list,
-                'total': projects.total,
-                'pages': projects.pages,
+                'total': total,
+                'pages': ceil(total / per_page) if per_page else 0,
                 'current_page': page
             },
             status_code=200
@@ -1153,35 +1244,8 @@ def get_discovery_projects():
         # Number of projects to return for the grid
         grid_count = request.args.get('count', 4, type=int)
         
-        # Base query for active projects
-        base_query = Project.query.filter_by(status=ProjectStatus.ACTIVE)
-        
-        # Get one featured project (prioritize projects marked as featured)
-        featured_query = base_query.filter_by(featured=True)
-        featured_project = featured_query.order_by(Project.current_amount.desc()).first()
-        
-        # If no featured projects exist, get the highest funded active project
-        if not featured_project:
-            featured_project = base_query.order_by(Project.current_amount.desc()).first()
-        
-        # Query for grid projects (avoid including the featured project)
-        grid_query = base_query
-        if featured_project:
-            grid_query = grid_query.filter(Project.id != featured_project.id)
-        
-        # Get trending projects based on recent backers or funding progress
-        grid_projects = grid_query.order_by(
-            # Order by percentage funded (for projects with momentum)
-            (Project.current_amount / Project.goal_amount).desc(),
-            # Then by newest
-            Project.created_at.desc()
-        ).limit(grid_count).all()
-        
-        # Format response
-        response_data = {
-            'featured': featured_project.to_dict() if featured_project else None,
-            'trending': [p.to_dict() for p in grid_projects]
-        }
+        # Served from the precomputed feed, refreshed in the background
+        response_data = discovery_feed.get_feed(grid_count)
         
         return api_response(
             data=response_data,
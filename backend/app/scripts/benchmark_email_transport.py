@@ -0,0 +1,90 @@
+# app/scripts/benchmark_email_transport.py
+"""
+Measure email throughput of the pooled SendGridTransport against a local stand-in.
+
+Starts a keep-alive HTTP server on localhost that answers /v3/mail/send
+with 202 after an optional delay, then sends the same messages two ways:
+a new SendGridAPIClient per message (how send_email used to work) and the
+shared SendGridTransport from several threads. The stand-in speaks plain
+HTTP, so the gain shown covers TCP connection reuse only; against the real
+API each new connection also pays for a TLS handshake.
+
+    python -m app.scripts.benchmark_email_transport --count 2000 --threads 8 --latency-ms 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sendgrid import SendGridAPIClient  # noqa: E402
+from sendgrid.helpers.mail import Mail  # noqa: E402
+from app.services.email_transport import SendGridTransport  # noqa: E402
+
+FROM_EMAIL = 'noreply@example.com'
+
+
+def stand_in_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            if latency:
+                time.sleep(latency)
+            self.send_response(202)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            self.server.connections.add(self.client_address)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.connections = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def per_message_client(url, index):
+    message = Mail(from_email=FROM_EMAIL, to_emails=f'user{index}@example.com', subject='Hello',
+                   plain_text_content='Hello there', html_content='<p>Hello there</p>')
+    SendGridAPIClient('benchmark-key', host=url).send(message)
+
+
+def run(label, server, count, threads, send):
+    server.connections.clear()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(send, range(count)))
+    elapsed = time.perf_counter() - started
+    print(f'{label:<34}{count / elapsed:>12.0f}{len(server.connections):>14}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=2000, help='number of emails')
+    parser.add_argument('--threads', type=int, default=8, help='concurrent senders')
+    parser.add_argument('--latency-ms', type=float, default=5, help='stand-in response delay')
+    args = parser.parse_args()
+
+    server = stand_in_server(args.latency_ms / 1000)
+    url = f'http://127.0.0.1:{server.server_port}'
+    transport = SendGridTransport('benchmark-key', FROM_EMAIL, api_url=url, pool_size=args.threads)
+
+    print(f'{"transport":<34}{"emails/s":>12}{"connections":>14}')
+    run('SendGridAPIClient per message', server, args.count, args.threads,
+        lambda index: per_message_client(url, index))
+    run('pooled SendGridTransport', server, args.count, args.threads,
+        lambda index: transport.send(f'user{index}@example.com', 'Hello', 'Hello there', '<p>Hello there</p>'))
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# app/scripts/benchmark_search.py
+"""
+Compare the in-process search index with the old ILIKE query.
+
+Generates synthetic active projects, loads them into a throwaway SQLite
+database for the ILIKE path and into a ProjectSearchIndex, then times the
+same queries against both.
+
+    python -m app.scripts.benchmark_search --count 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from sqlalchemy import create_engine, insert, select, func, or_  # noqa: E402
+from app.models.project import Project  # noqa: E402
+from app.models.enums import ProjectStatus  # noqa: E402
+from app.services.search_index import ProjectSearchIndex  # noqa: E402
+
+COMMON_WORDS = (
+    'solar garden robot music film bakery school water bike library coffee '
+    'community studio game book farm clinic theatre app festival kiosk craft '
+    'ocean forest city village youth art design energy health food market'
+).split()
+SYLLABLES = 'ba ko ri mu te sa lo ni ve da pu zo gi fe ha'.split()
+QUERIES = ['solar', 'robot kit', 'community garden', 'fest', 'bako', 'zzz']
+
+
+def vocabulary(rng, size=20000):
+    words = set(COMMON_WORDS)
+    while len(words) < size:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = list(words)
+    rng.shuffle(words)
+    # Zipf-like frequencies, as in real text
+    return words, list(accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+
+def synthetic_rows(count, seed=42):
+    rng = random.Random(seed)
+    words, cum_weights = vocabulary(rng)
+    now = datetime.utcnow()
+    for project_id in range(1, count + 1):
+        title = ' '.join(rng.choices(words, cum_weights=cum_weights, k=4))
+        description = ' '.join(rng.choices(words, cum_weights=cum_weights, k=40))
+        yield (project_id, title, description, rng.randint(1, 10),
+               now - timedelta(minutes=project_id), rng.choices(words, cum_weights=cum_weights, k=2))
+
+
+def load_database(engine, count):
+    Project.__table__.create(engine)
+    now = datetime.utcnow()
+    batch = []
+    with engine.begin() as conn:
+        for project_id, title, description, category_id, created_at, _ in synthetic_rows(count):
+            batch.append({
+                'id': project_id, 'title': title, 'description': description,
+                'category_id': category_id, 'created_at': created_at,
+                'start_date': now, 'end_date': now, 'creator_id': 1,
+                'status': ProjectStatus.ACTIVE, 'currency': 'USD', 'is_deleted': False,
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(Project.__table__), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Project.__table__), batch)
+
+
+def ilike_search(conn, query, per_page=10):
+    projects = Project.__table__
+    matches = select(projects.c.id).where(
+        projects.c.status == ProjectStatus.ACTIVE,
+        or_(projects.c.title.ilike(f'%{query}%'), projects.c.description.ilike(f'%{query}%'))
+    )
+    total = conn.execute(select(func.count()).select_from(matches.subquery())).scalar()
+    ids = conn.execute(matches.order_by(projects.c.created_at.desc()).limit(per_page)).scalars().all()
+    return ids, total
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1000000, help='number of synthetic projects')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per query, median is reported')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = ProjectSearchIndex()
+    index.build_from_rows(synthetic_rows(args.count))
+    print(f'Index built for {args.count} projects in {time.perf_counter() - started:.1f}s')
+
+    started = time.perf_counter()
+    engine = create_engine('sqlite://')
+    load_database(engine, args.count)
+    print(f'SQLite loaded in {time.perf_counter() - started:.1f}s')
+
+    print(f'{"query":<20}{"matches":>10}{"index ms":>12}{"ilike ms":>12}')
+    with engine.connect() as conn:
+        for query in QUERIES:
+            _, total = index.search(query)
+            index_ms = timed(lambda: index.search(query), args.repeat)
+            ilike_ms = timed(lambda: ilike_search(conn, query), args.repeat)
+            print(f'{query:<20}{total:>10}{index_ms:>12.3f}{ilike_ms:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,10 @@ from flask import current_app
 from werkzeug.security import generate_password_hash
 from app import db
 from app.models import User, TokenBlocklist, Role
-from app.services.email_service import send_templated_email
+from app.services.email_service import send_templated_email, EmailServiceError
+from app.services.outbox import outbox
+from app.services.revocation_cache import revocation_cache
+from app.services.permission_registry import permission_registry
 from app.utils.validators import validate_password, validate_email
 from flask_jwt_extended import create_access_token
 import logging
@@ -59,21 +62,22 @@ class AuthService:
             # Step 3: Generate the verification token using the now-available new_user.id
             verification_token = new_user.generate_verification_token()
             try:
-                # Attempt to send verification email
-                send_templated_email(
+                # Queue the verification email in the same transaction as the user;
+                # it is sent after the commit (app/services/outbox.py)
+                outbox.add_email(
+                    db.session,
                     new_user.email,
                     'verify_email',
                     user=new_user,
                     token=verification_token
                 )
 
-                # If email sends successfully, commit the transaction
                 db.session.commit()
                 logger.info(f"User {username} registered successfully")
                 return True, "User created successfully. Please check your email to verify your account."
 
             except EmailServiceError as e:
-                # If email fails, roll back and return appropriate error
+                # If the email cannot be rendered, roll back and return appropriate error
                 db.session.rollback()
                 logger.error(f"Registration failed: Email service error for {email} - {str(e)}")
                 return False, "Registration successful but verification email could not be sent. Please contact support."
@@ -145,9 +149,14 @@ class AuthService:
         permissions.update(basic_permissions)
         additional_claims = {
             "roles": roles,
-            "permissions": list(permissions),
+            "perm_bits": permission_registry.encode(permissions),
+            "perm_v": permission_registry.version,
             'last_permission_update': user.last_permission_update.timestamp() if user.last_permission_update else time.time()
         }
+        if current_app.config.get('JWT_PERMISSION_NAMES_CLAIM', False):
+            # Opt-in: the frontend otherwise fetches /role-permissions/<id>/permissions.
+            # Tokens issued with only the names list are still accepted.
+            additional_claims["permissions"] = list(permissions)
 
         print(f"Token claims: {additional_claims}")  # Add this log
 
@@ -182,10 +191,11 @@ class AuthService:
         return False, "User not found"
 
     @staticmethod
-    def logout_user(jti):
+    def logout_user(jti, expires_at):
         now = datetime.utcnow()
-        db.session.add(TokenBlocklist(jti=jti, created_at=now))
+        db.session.add(TokenBlocklist(jti=jti, created_at=now, expires_at=expires_at))
         db.session.commit()
+        revocation_cache.revoke(jti, expires_at)
         logger.info(f"JWT revoked with jti: {jti}")
         return True, "JWT revoked"
 
@@ -216,9 +226,10 @@ class AuthService:
 
     @staticmethod
     def check_if_token_revoked(jti):
-        token = db.session.query(TokenBlocklist.id).filter_by(jti=jti).scalar()
-        logger.info(f"Token with jti: {jti} is revoked")
-        return token is not None
+        revoked = revocation_cache.is_revoked(jti)
+        if revoked:
+            logger.info(f"Token with jti: {jti} is revoked")
+        return revoked
 
     @staticmethod
     def change_user_password(user_id, current_password, new_password):
@@ -244,8 +255,12 @@ class AuthService:
             logger.info(f"Password successfully changed for user {user.username}")
 
             # Revoke all JWT tokens
-            db.session.add(TokenBlocklist(jti=str(uuid.uuid4()), created_at=datetime.utcnow()))
+            revoked_jti = str(uuid.uuid4())
+            now = datetime.utcnow()
+            expires_at = now + current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+            db.session.add(TokenBlocklist(jti=revoked_jti, created_at=now, expires_at=expires_at))
             db.session.commit()
+            revocation_cache.revoke(revoked_jti, expires_at)
             
             return {"message": "Password changed successfully", "status_code": 200}
 
@@ -1,19 +1,23 @@
 # app/services/backer_service.py
 
 from app.models.user import User
-from app.models.project import Project
+from app.models.project import Project, project_backers
 # import asyncio
 from threading import Thread
 from app.models.donation import Donation
 from app.models import Reward
-from app import db, cache
-from sqlalchemy import func,  distinct
+from app import db
+from sqlalchemy import func, distinct, select, update
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from app.services.email_service import send_templated_email
+from app.services.bulk_email_service import bulk_email
 from app.models.enums import DonationStatus, ProjectStatus
 from app.services.donation_service import DonationService
+from app.services.funding_counter_service import funding_counter
+from app.services.stats_service import get_project_stats
+from app.utils.cache_tags import cached_per_project, invalidate_project
 from decimal import Decimal, InvalidOperation
 from app.schemas.backer_schemas import BackProjectSchema, ProjectUpdateSchema, ProjectMilestoneSchema
 from marshmallow import ValidationError
@@ -118,19 +122,19 @@ class BackerService:
                     )
                     session.add(donation)
 
-                    # Update project amounts
-                    if project.current_amount is None:
-                        project.current_amount = Decimal('0')
-                    project.current_amount += amount
-                    
-                    logger.info(f"After update - New current amount: {project.current_amount}")
-
-                    if project.current_amount >= project.goal_amount:
-                        project.status = ProjectStatus.FUNDED
+                    sharded = project.sharded_funding
+                    if sharded:
+                        # Hot project: spread the pledge over funding shards
+                        funded = funding_counter.add_pledge(session, project_id, amount)
+                    else:
+                        if not self._increment_project_amount(session, project_id, amount):
+                            session.rollback()
+                            return {'error': 'Project is not currently accepting donations', 'status_code': 400}
+                        funded = self._mark_funded_if_reached(session, project_id)
 
-                    if user not in project.backers:
-                        project.backers.append(user)
-                        project.backers_count = project.backers_count + 1  # Increment the counter
+                    # The unsharded increment has already locked the project row
+                    self._add_backer(session, project_id, user_id, project_locked=not sharded)
+                    project_status = ProjectStatus.FUNDED if funded else ProjectStatus.ACTIVE
 
                     # Commit the transaction
                     session.commit()
@@ -143,11 +147,11 @@ class BackerService:
                             'currency': donation.currency,
                             'status': donation.status.value
                         },
-                        'user_id': user.id,
-                        'project_id': project.id,
+                        'user_id': user_id,
+                        'project_id': project_id,
                         'created_at': donation.created_at.isoformat() if donation.created_at else None,
                         'donation_status': donation.status.value,
-                        'project_status': project.status.value,
+                        'project_status': project_status.value,
                         'reward_id': donation.reward_id
                     }
 
@@ -155,8 +159,10 @@ class BackerService:
                     # app = current_app._get_current_object()
                     # Thread(target=self._send_confirmation_email_with_context,
                     #     args=(app, user.email, user.username, project.title, donation)).start()
-                    
-                    self.invalidate_backer_stats_cache(project_id)
+
+                    # Cached stats for the project are invalidated by the commit hook
+                    if not sharded:
+                        funding_counter.record_pledge(project_id)
                     return result
 
                 except SQLAlchemyError as e:
@@ -241,6 +247,76 @@ class BackerService:
             'reward_id': donation.reward_id
         }
     @staticmethod
+    def _increment_project_amount(session, project_id, amount):
+        """
+        Atomically add a pledge to Project.current_amount in SQL so concurrent
+        pledges cannot overwrite each other. The status guard rejects projects
+        that stopped accepting donations after they were loaded.
+
+        Returns:
+            bool: False if the project is no longer ACTIVE
+        """
+        new_amount = func.coalesce(Project.current_amount, 0) + amount
+        result = session.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.status == ProjectStatus.ACTIVE)
+            .ordered_values(
+                (Project.funding_ratio, Project.funding_ratio_after(new_amount)),
+                (Project.current_amount, new_amount)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def _mark_funded_if_reached(session, project_id):
+        """
+        Conditional follow-up to the increment: only the pledge that takes the
+        project past its goal flips the status to FUNDED.
+        """
+        result = session.execute(
+            update(Project)
+            .where(
+                Project.id == project_id,
+                Project.status == ProjectStatus.ACTIVE,
+                Project.current_amount >= Project.goal_amount
+            )
+            .values(status=ProjectStatus.FUNDED)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def _add_backer(session, project_id, user_id, project_locked=False):
+        """
+        Record the user as a backer and bump backers_count on their first pledge.
+
+        project_backers has no unique key, so first pledges are serialised on
+        the project row: the membership check is repeated under that lock.
+        Sharded pledges (`project_locked` False) hold no lock on the project
+        row; they take it only when the user is not a backer yet, so repeat
+        backers of a hot project still never touch the row.
+        """
+        membership = select(project_backers.c.user_id).where(
+            project_backers.c.user_id == user_id,
+            project_backers.c.project_id == project_id
+        ).limit(1)
+        if not project_locked:
+            if session.execute(membership).first() is not None:
+                return False
+            session.execute(select(Project.id).where(Project.id == project_id).with_for_update())
+        is_new_backer = session.execute(membership.with_for_update()).first() is None
+        if is_new_backer:
+            session.execute(project_backers.insert().values(user_id=user_id, project_id=project_id))
+            session.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(backers_count=func.coalesce(Project.backers_count, 0) + 1)
+                .execution_options(synchronize_session=False)
+            )
+        return is_new_backer
+
+    @staticmethod
     def _get_user(user_id, session):
         user = session.query(User).get(user_id)
         if user is None:
@@ -254,14 +330,19 @@ class BackerService:
             logger.warning(f"Project with id {project_id} not found in the database")
         return project
 
-    def get_project_backers(self, project_id, page, per_page):
+    def get_project_backers(self, project_id, page, per_page, after=None):
         """
         Get paginated list of project backers with their donation details.
         
+        Totals and first-backed dates for the whole page come from a single
+        grouped query over donations, so the number of statements does not
+        depend on the page size.
+        
         Args:
             project_id: ID of the project
-            page: Current page number (1-based)
+            page: Current page number (1-based), used when no cursor is given
             per_page: Number of items per page
+            after: Optional user_id cursor; returns backers with a greater user_id
         """
         try:
             with Session(db.engine) as session:
@@ -269,42 +350,35 @@ class BackerService:
                 if not project:
                     return {'error': 'Project not found', 'status_code': 404}
 
-                # Calculate offset for pagination
-                offset = (page - 1) * per_page
-
                 # Get total count of backers
-                total = session.query(User).join(User.backed_projects)\
-                    .filter(Project.id == project_id).count()
-
-                # Get paginated backers
-                backers_query = session.query(User).join(User.backed_projects)\
-                    .filter(Project.id == project_id)\
-                    .order_by(User.id)\
-                    .offset(offset)\
-                    .limit(per_page)
-
-                backers = []
-                for backer in backers_query:
-                    # Get total amount donated by this backer
-                    total_amount = session.query(func.sum(Donation.amount))\
-                        .filter(
-                            Donation.user_id == backer.id,
-                            Donation.project_id == project_id
-                        ).scalar() or 0
-
-                    # Get first donation date
-                    first_backed_at = session.query(func.min(Donation.created_at))\
-                        .filter(
-                            Donation.user_id == backer.id,
-                            Donation.project_id == project_id
-                        ).scalar()
-
-                    backers.append({
-                        'user_id': backer.id,
-                        'username': backer.username,
-                        'total_amount': float(total_amount),
-                        'first_backed_at': first_backed_at
-                    })
+                total = session.query(func.count(distinct(Donation.user_id)))\
+                    .filter(Donation.project_id == project_id).scalar() or 0
+
+                # One grouped query for the whole page
+                backers_query = session.query(
+                    Donation.user_id.label('user_id'),
+                    User.username.label('username'),
+                    func.sum(Donation.amount).label('total_amount'),
+                    func.min(Donation.created_at).label('first_backed_at')
+                ).join(User, User.id == Donation.user_id)\
+                    .filter(Donation.project_id == project_id)\
+                    .group_by(Donation.user_id, User.username)\
+                    .order_by(Donation.user_id)
+
+                # Keyset pagination on user_id, falling back to page offsets
+                if after is not None:
+                    backers_query = backers_query.filter(Donation.user_id > after)
+                else:
+                    backers_query = backers_query.offset((page - 1) * per_page)
+
+                rows = backers_query.limit(per_page).all()
+
+                backers = [{
+                    'user_id': row.user_id,
+                    'username': row.username,
+                    'total_amount': float(row.total_amount or 0),
+                    'first_backed_at': row.first_backed_at
+                } for row in rows]
 
                 # Calculate total pages
                 total_pages = (total + per_page - 1) // per_page
@@ -313,7 +387,8 @@ class BackerService:
                     'page': page,
                     'per_page': per_page,
                     'total': total,
-                    'pages': total_pages
+                    'pages': total_pages,
+                    'next_cursor': rows[-1].user_id if len(rows) == per_page else None
                 }
 
                 return {'backers': backers, 'meta': meta}
@@ -325,6 +400,11 @@ class BackerService:
     def get_user_backed_projects(self, user_id, page, per_page, status=None):
         """
         Retrieve a paginated list of projects backed by a specific user.
+
+        The user's total, first-backed date and the project's total pledged
+        amount come from one grouped query over the user's donations. The
+        project-wide total is read from the maintained Project.current_amount
+        aggregate rather than summed live.
         """
         try:
             with Session(db.engine) as session:
@@ -333,43 +413,40 @@ class BackerService:
                     logger.warning(f"User with id {user_id} not found")
                     return {'error': f'User with id {user_id} not found', 'status_code': 404}
                     
-                # Query for backed projects
-                backed_projects_query = session.query(Project).join(Project.backers).filter(User.id == user_id)
+                # One row per backed project with the user's aggregates
+                backed_projects_query = session.query(
+                    Project,
+                    func.sum(Donation.amount).label('total_amount'),
+                    func.min(Donation.created_at).label('first_backed_at')
+                ).join(Donation, Donation.project_id == Project.id)\
+                    .filter(Donation.user_id == user.id)\
+                    .group_by(Project.id)
                 
                 # Apply status filter if provided
                 if status:
                     backed_projects_query = backed_projects_query.filter(Project.status == status.upper())
                     
                 # Count total items
-                total = backed_projects_query.count()
+                total_query = session.query(func.count(distinct(Donation.project_id)))\
+                    .filter(Donation.user_id == user.id)
+                if status:
+                    total_query = total_query.join(Project, Project.id == Donation.project_id)\
+                        .filter(Project.status == status.upper())
+                total = total_query.scalar() or 0
                     
                 # Apply pagination
                 offset = (page - 1) * per_page
-                backed_projects = backed_projects_query.offset(offset).limit(per_page).all()
+                rows = backed_projects_query.order_by(Project.id)\
+                    .offset(offset).limit(per_page).all()
                     
                 projects = []
-                for project in backed_projects:
-                    total_amount = session.query(func.sum(Donation.amount)).filter(
-                        Donation.user_id == user.id,
-                        Donation.project_id == project.id
-                    ).scalar() or 0
-                        
-                    first_backed_at = session.query(func.min(Donation.created_at)).filter(
-                        Donation.user_id == user.id,
-                        Donation.project_id == project.id
-                    ).scalar()
-
-                    total_pledged = session.query(func.sum(Donation.amount)).filter(
-                        Donation.project_id == project.id
-                    ).scalar() or 0
-
-                        
+                for project, total_amount, first_backed_at in rows:
                     projects.append({
                         'project_id': project.id,
                         'id': project.id,
                         'title': project.title,
                         'description': project.description,
-                        'total_amount': float(total_amount),
+                        'total_amount': float(total_amount or 0),
                         'first_backed_at': first_backed_at,
                         'status': project.status.value if project.status else None,
                         'image_url': project.image_url,
@@ -377,7 +454,7 @@ class BackerService:
                         'end_date': project.end_date,
                         'goal_amount': float(project.goal_amount) if project.goal_amount else 0,
                         'category_id': project.category_id,
-                        'total_pledged': float(total_pledged),
+                        'total_pledged': float(project.get_current_amount() or 0),
                         'backers_count': project.backers_count
                     })
                         
@@ -436,12 +513,12 @@ class BackerService:
             logger.error(f"Database error in get_backer_details: {str(e)}")
             return {'error': 'An unexpected error occurred', 'status_code': 500}
 
-    @cache.memoize(timeout=300)  # Cache for 5 minutes
+    @cached_per_project('backer_stats', timeout=300)
     def get_backer_stats(self, project_id):
         """
         Get statistics about backers for a specific project.
 
-        This method is cached to improve performance for frequently accessed data.
+        Cached under the project's tag until its donations or payouts change.
         """
         try:
             with Session(db.engine) as session:
@@ -449,24 +526,21 @@ class BackerService:
                 if not project:
                     return {'error': 'Project not found', 'status_code': 404}
 
-                stats = session.query(
-                    func.count(Donation.id).label('total_donations'),
-                    func.sum(Donation.amount).label('total_amount'),
-                    func.avg(Donation.amount).label('average_amount')
-                ).filter(Donation.project_id == project_id).first()
+                stats = get_project_stats(session, project_id)
 
                 return {
                     'project_id': project_id,
                     'project_status': project.status.value,
-                    'total_backers': len(project.backers),
-                    'total_donations': stats.total_donations or 0,
-                    'total_amount': float(stats.total_amount) if stats.total_amount else 0,
-                    'average_amount': float(stats.average_amount) if stats.average_amount else 0
+                    'total_backers': project.backers_count or 0,
+                    'total_donations': stats.donation_count,
+                    'total_amount': float(stats.donation_amount),
+                    'average_amount': float(stats.average_amount)
                 }
         except SQLAlchemyError as e:
             logger.error(f"Database error in get_backer_stats: {str(e)}")
             return {'error': 'An unexpected error occurred', 'status_code': 500}
     
+    @cached_per_project('public_backer_stats', timeout=300)
     def get_public_backer_stats(self, project_id):
         """
         Get public statistics about backers for a specific project.
@@ -478,17 +552,14 @@ class BackerService:
                 if not project:
                     return {'error': 'Project not found', 'status_code': 404}
 
-                # Query for basic statistics - non-sensitive data only
-                stats = session.query(
-                    func.count(distinct(Donation.user_id)).label('total_backers'),
-                    func.sum(Donation.amount).label('total_amount')
-                ).filter(Donation.project_id == project_id).first()
+                # Basic statistics - non-sensitive data only
+                stats = get_project_stats(session, project_id)
 
                 return {
                     'project_id': project_id,
                     'project_title': project.title,
-                    'total_backers': stats.total_backers or 0,
-                    'total_amount': float(stats.total_amount) if stats.total_amount else 0,
+                    'total_backers': stats.backer_count,
+                    'total_amount': float(stats.donation_amount),
                     # 'funding_percentage': self._calculate_funding_percentage(project, stats.total_amount)
                 }
         except SQLAlchemyError as e:
@@ -505,30 +576,25 @@ class BackerService:
 
     def invalidate_backer_stats_cache(self, project_id):
         """
-        Invalidate the cache for backer stats when there's a new donation.
+        Invalidate cached stats for a project. Donation and payout commits do
+        this automatically; call it after changes made outside the ORM.
         """
-        cache.delete_memoized(self.get_backer_stats, self, project_id)
+        invalidate_project(project_id)
 
     def send_project_update_email(self, project_id, update_title, update_content):
         """
         Send a project update email to all backers of a specific project.
+
+        The emails go out in the background; the returned job can be polled
+        for progress.
         """
         try:
-            with Session(db.engine) as session:
-                project = self._get_project(project_id, session)
-                if not project:
-                    return {'error': 'Project not found', 'status_code': 404}
-
-                for backer in project.backers:
-                    send_templated_email(
-                        to_email=backer.email,
-                        email_type='project_update',
-                        user_name=backer.username,
-                        project_title=project.title,
-                        update_title=update_title,
-                        update_content=update_content
-                    )
-                return {'message': f'Update email sent to {len(project.backers)} backers'}
+            job = bulk_email.start_project_email(
+                project_id, 'project_update', update_title=update_title, update_content=update_content
+            )
+            if job is None:
+                return {'error': 'Project not found', 'status_code': 404}
+            return {'message': f"Update email queued for {job['total_recipients']} backers", 'job': job}
         except SQLAlchemyError as e:
             logger.error(f"Database error in send_project_update_email: {str(e)}")
             return {'error': 'An unexpected error occurred', 'status_code': 500}
@@ -536,51 +602,31 @@ class BackerService:
     def send_project_milestone_email(self, project_id, milestone_title, milestone_description):
         """
         Send a project milestone email to all backers of a specific project.
+
+        The emails go out in the background; the returned job can be polled
+        for progress.
         """
         try:
-            with Session(db.engine) as session:
-                project = self._get_project(project_id, session)
-                if not project:
-                    return {'error': 'Project not found', 'status_code': 404}
-
-                for backer in project.backers:
-                    send_templated_email(
-                        to_email=backer.email,
-                        email_type='project_milestone',
-                        user_name=backer.username,
-                        project_title=project.title,
-                        milestone_title=milestone_title,
-                        milestone_description=milestone_description
-                    )
-                return {'message': f'Milestone email sent to {len(project.backers)} backers'}
+            job = bulk_email.start_project_email(
+                project_id, 'project_milestone',
+                milestone_title=milestone_title, milestone_description=milestone_description
+            )
+            if job is None:
+                return {'error': 'Project not found', 'status_code': 404}
+            return {'message': f"Milestone email queued for {job['total_recipients']} backers", 'job': job}
         except SQLAlchemyError as e:
             logger.error(f"Database error in send_project_milestone_email: {str(e)}")
             return {'error': 'An unexpected error occurred', 'status_code': 500}
 
-    @staticmethod
-    def _update_project_status(project, amount):
+    def get_bulk_email_job(self, project_id, job_id):
         """
-        Update project status based on new donation amount
-        
-        Args:
-            project: Project instance
-            amount: Decimal amount to add
+        Progress of a project update or milestone email job.
         """
         try:
-            logger.info(f"Before update - Current amount: {project.current_amount}, Goal amount: {project.goal_amount}")
-            
-            if project.current_amount is None:
-                project.current_amount = 0
-                
-            # Direct addition without conversion
-            project.current_amount += amount
-            
-            logger.info(f"After update - New current amount: {project.current_amount}")
-            
-            # Check if project is funded
-            if project.current_amount >= project.goal_amount:
-                project.status = ProjectStatus.FUNDED
-                
-        except Exception as e:
-            logger.error(f"Error in _update_project_status: {e}")
-            raise
\ No newline at end of file
+            job = bulk_email.get_job(job_id)
+            if job is None or job['project_id'] != project_id:
+                return {'error': 'Email job not found', 'status_code': 404}
+            return job
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in get_bulk_email_job: {str(e)}")
+            return {'error': 'An unexpected error occurred', 'status_code': 500}
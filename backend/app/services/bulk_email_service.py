@@ -0,0 +1,286 @@
+# app/services/bulk_email_service.py
+
+import math
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from flask import current_app
+from markupsafe import escape
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from app import db, cache
+from app.models.bulk_email_job import BulkEmailJob, BulkEmailJobStatus
+from app.models.project import Project, project_backers
+from app.models.user import User
+from app.services.email_queue import email_queue
+from app.services.email_transport import get_transport, MAX_RECIPIENTS_PER_REQUEST
+from app.utils.background import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+TASK_NAME = 'app.services.bulk_email_service.run_job'
+
+# Rendered into the template in place of the recipient's name, then
+# substituted per recipient by the transport: the raw name in the subject and
+# text part, the HTML-escaped name in the HTML part
+USER_NAME_PLACEHOLDER = '-user_name-'
+USER_NAME_HTML_PLACEHOLDER = '-user_name_html-'
+
+
+class BulkEmailService:
+    """
+    Fans one templated email out to every backer of a project.
+
+    The template is rendered once with a placeholder for the backer's name.
+    A job then pages through the backers in chunks of
+    BULK_EMAIL_BATCH_SIZE (at most 1000, SendGrid's personalization limit),
+    sends each chunk as one transport request, and keeps at most
+    BULK_EMAIL_CONCURRENCY requests in flight. Progress is recorded on the
+    BulkEmailJob row after every chunk.
+
+    Jobs run where the email queue runs deliveries: on Celery, in a
+    background thread, or inline in 'sync' mode. A running job updates its
+    heartbeat after every chunk; a sweep every BULK_EMAIL_SWEEP_INTERVAL
+    seconds marks jobs whose heartbeat is older than BULK_EMAIL_STALE_AFTER
+    as FAILED, since their worker died. They are not resumed, so no backer
+    is emailed twice.
+    """
+
+    def __init__(self):
+        self._task = None
+        self._sweeper = PeriodicWorker('bulk-email-sweep', 600, self.fail_stale_jobs)
+
+    def init_app(self, app):
+        celery = email_queue.celery
+        self._task = celery.task(name=TASK_NAME)(_run_job_task) if celery is not None else None
+
+    def start_project_email(self, project_id, email_type, **kwargs):
+        """
+        Create and dispatch a job sending `email_type` to a project's backers.
+
+        Returns:
+            dict: The new job, or None if the project does not exist
+        """
+        from app.services.email_service import render_templated_email
+
+        batch_size = self._batch_size()
+        with Session(db.engine) as session:
+            project = session.get(Project, project_id)
+            if project is None:
+                return None
+            total = session.execute(
+                select(func.count(func.distinct(project_backers.c.user_id)))
+                .where(project_backers.c.project_id == project_id)
+            ).scalar()
+            subject, text_content, html_content = render_templated_email(
+                email_type, user_name=USER_NAME_PLACEHOLDER, project_title=project.title, **kwargs
+            )
+            html_content = html_content.replace(USER_NAME_PLACEHOLDER, USER_NAME_HTML_PLACEHOLDER)
+            job = BulkEmailJob(
+                project_id=project_id, email_type=email_type, subject=subject,
+                text_content=text_content, html_content=html_content,
+                status=BulkEmailJobStatus.PENDING, total_recipients=total,
+                sent_count=0, failed_count=0, batches_total=math.ceil(total / batch_size), batches_done=0
+            )
+            session.add(job)
+            session.commit()
+            job_id = job.id
+
+        self.dispatch(job_id)
+        logger.info(f"Started bulk {email_type} email job {job_id} for {total} backers of project {project_id}")
+        with Session(db.engine) as session:
+            return session.get(BulkEmailJob, job_id).to_dict()
+
+    def get_job(self, job_id):
+        with Session(db.engine) as session:
+            job = session.get(BulkEmailJob, job_id)
+            return job.to_dict() if job else None
+
+    def start_workers(self, app):
+        """Start this process's stale-job sweep if it is not running."""
+        self._sweeper.interval = app.config.get('BULK_EMAIL_SWEEP_INTERVAL', 600)
+        self._sweeper.ensure_started(app)
+
+    def dispatch(self, job_id):
+        app = current_app._get_current_object()
+        self.start_workers(app)
+        backend = email_queue.backend(app)
+        if backend == 'sync':
+            self.run_job(job_id)
+            return
+        if backend == 'celery' and self._task is not None:
+            try:
+                self._task.apply_async(args=[job_id])
+                return
+            except Exception as e:
+                logger.error(f"Could not publish bulk email job {job_id} to Celery, running locally: {str(e)}")
+        threading.Thread(target=self._run_in_thread, args=(app, job_id),
+                         name=f'bulk-email-{job_id}', daemon=True).start()
+
+    def _run_in_thread(self, app, job_id):
+        with app.app_context():
+            self.run_job(job_id)
+
+    @staticmethod
+    def _batch_size():
+        return max(1, min(current_app.config.get('BULK_EMAIL_BATCH_SIZE', 1000), MAX_RECIPIENTS_PER_REQUEST))
+
+    def run_job(self, job_id):
+        batch_size = self._batch_size()
+        concurrency = current_app.config.get('BULK_EMAIL_CONCURRENCY', 4)
+        retry = (current_app.config.get('EMAIL_MAX_ATTEMPTS', 5), current_app.config.get('EMAIL_RETRY_BACKOFF', 30))
+        transport = get_transport()
+
+        with Session(db.engine) as session:
+            job = session.get(BulkEmailJob, job_id)
+            # Only a pending job starts, so a redelivered task does not send twice
+            if job is None or job.status != BulkEmailJobStatus.PENDING:
+                return
+            job.status = BulkEmailJobStatus.RUNNING
+            job.started_at = job.heartbeat_at = datetime.utcnow()
+            session.commit()
+            project_id, message = job.project_id, (job.subject, job.text_content, job.html_content)
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bulk-email') as pool:
+                in_flight = set()
+                for chunk in _backer_chunks(project_id, batch_size):
+                    recipients = [(email, {USER_NAME_PLACEHOLDER: username,
+                                           USER_NAME_HTML_PLACEHOLDER: str(escape(username))})
+                                  for _, email, username in chunk]
+                    in_flight.add(pool.submit(_send_batch, transport, message, recipients, retry))
+                    if len(in_flight) >= concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._record_progress(job_id, done)
+                done, _ = wait(in_flight)
+                self._record_progress(job_id, done)
+        except Exception as e:
+            logger.error(f"Bulk email job {job_id} failed: {str(e)}")
+            self._finish(job_id, error=str(e))
+            return
+        self._finish(job_id)
+
+    @staticmethod
+    def _record_progress(job_id, futures):
+        sent = failed = 0
+        last_error = None
+        for future in futures:
+            batch_sent, batch_failed, error = future.result()
+            sent += batch_sent
+            failed += batch_failed
+            last_error = error or last_error
+        values = {
+            BulkEmailJob.sent_count: BulkEmailJob.sent_count + sent,
+            BulkEmailJob.failed_count: BulkEmailJob.failed_count + failed,
+            BulkEmailJob.batches_done: BulkEmailJob.batches_done + len(futures),
+            BulkEmailJob.heartbeat_at: datetime.utcnow(),
+        }
+        if last_error:
+            values[BulkEmailJob.last_error] = last_error[:500]
+        with Session(db.engine) as session:
+            session.execute(update(BulkEmailJob).where(BulkEmailJob.id == job_id).values(values))
+            session.commit()
+
+    @staticmethod
+    def _finish(job_id, error=None):
+        with Session(db.engine) as session:
+            job = session.get(BulkEmailJob, job_id)
+            failed = error is not None or (job.failed_count and not job.sent_count)
+            job.status = BulkEmailJobStatus.FAILED if failed else BulkEmailJobStatus.COMPLETED
+            if error:
+                job.last_error = error[:500]
+            else:
+                # Backers who joined or left while the job ran
+                job.total_recipients = job.sent_count + job.failed_count
+                job.batches_total = job.batches_done
+            job.finished_at = datetime.utcnow()
+            session.commit()
+            logger.info(f"Bulk email job {job_id} {job.status.value}: {job.sent_count} sent, {job.failed_count} failed")
+
+    def fail_stale_jobs(self):
+        """
+        Mark running jobs without a heartbeat for BULK_EMAIL_STALE_AFTER seconds as FAILED.
+
+        Returns:
+            int: Number of jobs marked failed
+        """
+        interval = current_app.config.get('BULK_EMAIL_SWEEP_INTERVAL', 600)
+        # One sweep across all workers per interval
+        if not cache.add('bulk_email:sweeping', 1, timeout=max(interval // 2, 1)):
+            return 0
+        stale_after = current_app.config.get('BULK_EMAIL_STALE_AFTER', 3600)
+        now = datetime.utcnow()
+        with Session(db.engine) as session:
+            failed = session.execute(
+                update(BulkEmailJob)
+                .where(
+                    BulkEmailJob.status == BulkEmailJobStatus.RUNNING,
+                    BulkEmailJob.heartbeat_at < now - timedelta(seconds=stale_after)
+                )
+                .values(status=BulkEmailJobStatus.FAILED, finished_at=now,
+                        last_error=f"Interrupted: no progress for {stale_after} seconds")
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+        if failed:
+            logger.warning(f"Marked {failed} interrupted bulk email jobs as failed")
+        return failed
+
+
+def _backer_chunks(project_id, batch_size):
+    """
+    Yield a project's backers as lists of (id, email, username), `batch_size` at a time.
+
+    Pages by user id rather than holding one cursor open for the whole job,
+    so no read transaction spans the sends and progress writes.
+    """
+    last_id = 0
+    while True:
+        with Session(db.engine) as session:
+            chunk = session.execute(
+                select(User.id, User.email, User.username)
+                .join(project_backers, project_backers.c.user_id == User.id)
+                .where(project_backers.c.project_id == project_id, User.id > last_id)
+                .distinct()
+                .order_by(User.id)
+                .limit(batch_size)
+            ).all()
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1][0]
+
+
+def _send_batch(transport, message, recipients, retry):
+    """
+    Send one chunk, retrying retryable failures. A retry goes only to the
+    recipients the transport reports as unsent. Returns (sent, failed, error).
+    """
+    from app.services.email_service import EmailServiceError
+
+    max_attempts, backoff = retry
+    total = len(recipients)
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            transport.send_bulk(*message, recipients)
+            return total, 0, None
+        except EmailServiceError as e:
+            if e.unsent is not None:
+                recipients = e.unsent
+            if not e.retryable or attempt >= max_attempts:
+                return total - len(recipients), len(recipients), str(e)
+            time.sleep(min(backoff * 2 ** (attempt - 1), 300))
+        except Exception as e:
+            logger.error(f"Unexpected error sending a bulk email batch: {str(e)}")
+            return total - len(recipients), len(recipients), str(e)
+
+
+def _run_job_task(job_id):
+    bulk_email.run_job(job_id)
+
+
+bulk_email = BulkEmailService()
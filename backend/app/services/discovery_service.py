@@ -0,0 +1,120 @@
+# app/services/discovery_service.py
+
+import time
+import threading
+import logging
+from flask import current_app
+from app import cache
+from app.models.project import Project
+from app.models.enums import ProjectStatus
+from app.utils.background import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+FEED_KEY = 'discovery_feed'
+REFRESH_LOCK_KEY = 'discovery_feed:refreshing'
+
+
+class DiscoveryFeedService:
+    """
+    Precomputed featured project and trending ranking for /projects/discovery.
+
+    A background job recomputes the feed every DISCOVERY_FEED_INTERVAL
+    seconds and stores it in the cache, so requests never run the ranking
+    queries. A feed older than the interval is still served, and a refresh
+    is started in the background (stale-while-revalidate); a short cache
+    lock keeps workers from refreshing at the same time.
+    """
+
+    def __init__(self):
+        self._refresher = PeriodicWorker('discovery-feed', 60, self.refresh, run_immediately=True)
+        self._revalidating = None
+        self._lock = threading.Lock()
+
+    def get_feed(self, count=4):
+        """
+        Return {'featured': ..., 'trending': [...]} with up to `count` trending projects.
+        """
+        app = current_app._get_current_object()
+        interval = app.config.get('DISCOVERY_FEED_INTERVAL', 60)
+        self._refresher.interval = interval
+        self._refresher.ensure_started(app)
+
+        size = app.config.get('DISCOVERY_FEED_SIZE', 12)
+        if count > size:
+            # Larger grids than we precompute are rare; build them on demand
+            return self._compute(count)
+
+        feed = cache.get(FEED_KEY)
+        if feed is None:
+            feed = self.refresh(force=True)
+        elif time.time() - feed['generated_at'] > interval:
+            self._revalidate(app)
+
+        return {'featured': feed['featured'], 'trending': feed['trending'][:count]}
+
+    def refresh(self, force=False):
+        """
+        Recompute the feed and store it in the cache.
+
+        Returns:
+            dict: The new feed, or None if another worker is already refreshing
+        """
+        interval = current_app.config.get('DISCOVERY_FEED_INTERVAL', 60)
+        if not cache.add(REFRESH_LOCK_KEY, 1, timeout=max(interval // 2, 1)) and not force:
+            return None
+
+        feed = self._build(current_app.config.get('DISCOVERY_FEED_SIZE', 12))
+        # Keep serving the last feed for a while if refreshing starts failing
+        cache.set(FEED_KEY, feed, timeout=interval * 10)
+        return feed
+
+    def _revalidate(self, app):
+        with self._lock:
+            if self._revalidating is not None and self._revalidating.is_alive():
+                return
+            self._revalidating = threading.Thread(
+                target=self._refresh_in_context, args=(app,), name='discovery-feed-revalidate', daemon=True
+            )
+            self._revalidating.start()
+
+    def _refresh_in_context(self, app):
+        try:
+            with app.app_context():
+                self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to refresh discovery feed: {str(e)}")
+
+    def _build(self, size):
+        feed = self._compute(size)
+        feed['generated_at'] = time.time()
+        return feed
+
+    @staticmethod
+    def _compute(count):
+        base_query = Project.query.filter_by(status=ProjectStatus.ACTIVE, is_deleted=False)
+
+        # Get one featured project (prioritize projects marked as featured)
+        featured_project = base_query.filter_by(featured=True).order_by(Project.current_amount.desc()).first()
+
+        # If no featured projects exist, get the highest funded active project
+        if not featured_project:
+            featured_project = base_query.order_by(Project.current_amount.desc()).first()
+
+        grid_query = base_query
+        if featured_project:
+            grid_query = grid_query.filter(Project.id != featured_project.id)
+
+        # Trending: funding progress first, then newest
+        grid_projects = grid_query.order_by(
+            Project.funding_ratio.desc(),
+            Project.created_at.desc()
+        ).limit(count).all()
+
+        return {
+            'featured': featured_project.to_dict() if featured_project else None,
+            'trending': [p.to_dict() for p in grid_projects]
+        }
+
+
+discovery_feed = DiscoveryFeedService()
@@ -10,7 +10,8 @@ from app import db
 from decimal import Decimal
 from datetime import datetime
 import logging
-from app.services.email_service import send_templated_email
+from app.services.email_service import send_templated_email, EmailServiceError
+from app.services.outbox import outbox
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -160,9 +161,11 @@ class DonationService:
 
                 completed_at_formatted = donation.completed_at.strftime('%B %d, %Y at %I:%M %p')
 
-                # Send success email
+                # Queue the success email with the status change; it is sent after the commit.
+                # Only a render failure is tolerated: the payment is complete either way.
                 try:
-                    send_templated_email(
+                    outbox.add_email(
+                        db_session,
                         to_email=user.email,
                         email_type='donation_success',  # Match your template name
                         donor_name=user.username,
@@ -172,9 +175,9 @@ class DonationService:
                         donation_id=donation.id,
                         completed_at=donation.completed_at
                     )
-                except Exception as e:
-                    logger.error(f"Failed to send success email: {str(e)}")
-                    # Continue processing even if email fails
+                except (ValueError, EmailServiceError) as e:
+                    logger.error(f"Could not queue success email for donation {donation_id}, "
+                                 f"completing it without one: {str(e)}")
                 
                 db_session.commit()
                 return True
@@ -0,0 +1,236 @@
+# app/services/email_queue.py
+
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app import db, cache
+from app.models.email_delivery import EmailDelivery, EmailDeliveryStatus
+from app.utils.background import PeriodicWorker
+from app.utils.tasks import make_celery
+
+logger = logging.getLogger(__name__)
+
+TASK_NAME = 'app.services.email_queue.deliver_email'
+
+
+class EmailQueue:
+    """
+    Background delivery for rendered emails.
+
+    `enqueue()` stores an EmailDelivery row and returns at once. Delivery
+    runs on Celery when CELERY_BROKER_URL is set (EMAIL_QUEUE_BACKEND
+    'auto' or 'celery'), otherwise on a per-process thread pool ('local').
+    'sync' sends in the calling thread, for scripts and tests.
+
+    Retryable failures (SendGrid 5xx/429, network errors) are retried with
+    exponential backoff up to EMAIL_MAX_ATTEMPTS; every attempt updates the
+    row's status, attempt count and last error. An attempt first claims the
+    row by moving it to SENDING with a conditional UPDATE, so a delivery
+    dispatched twice (a redelivered Celery task, a sweep racing a retry) is
+    sent once. A sweep every EMAIL_REQUEUE_INTERVAL seconds redispatches
+    deliveries whose retry is overdue, e.g. because the local pool's process
+    restarted, and deliveries left SENDING by a worker that died mid-send.
+    """
+
+    def __init__(self):
+        self.celery = None
+        self._task = None
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._sweeper = PeriodicWorker('email-requeue', 300, self.requeue_overdue)
+
+    def init_app(self, app):
+        if self.backend(app) == 'celery':
+            self.celery = make_celery(app)
+            self._task = self.celery.task(name=TASK_NAME, bind=True)(_deliver_task)
+        else:
+            self.celery = None
+            self._task = None
+        app.extensions['email_queue'] = self
+
+    @staticmethod
+    def backend(app):
+        """The delivery backend in effect for `app`: 'celery', 'local' or 'sync'."""
+        backend = app.config.get('EMAIL_QUEUE_BACKEND', 'auto')
+        if backend == 'auto':
+            return 'celery' if app.config.get('CELERY_BROKER_URL') else 'local'
+        return backend
+
+    def enqueue(self, to_email, email_type, subject, text_content, html_content):
+        """
+        Returns:
+            int: The id of the new EmailDelivery
+        """
+        # Own session: never commit the caller's pending changes along with the row
+        with Session(db.engine) as session:
+            delivery = self.add(session, to_email, email_type, subject, text_content, html_content)
+            session.commit()
+            delivery_id = delivery.id
+
+        self.dispatch(delivery_id)
+        logger.info(f"Queued {email_type} email to {to_email} as delivery {delivery_id}")
+        return delivery_id
+
+    @staticmethod
+    def add(session, to_email, email_type, subject, text_content, html_content):
+        """
+        Add a queued delivery to `session` without committing or dispatching it.
+
+        For callers that write deliveries in their own transaction (the outbox
+        relay); they call `dispatch()` with the id once it has committed.
+        """
+        delivery = EmailDelivery(
+            to_email=to_email, email_type=email_type, subject=subject,
+            text_content=text_content, html_content=html_content,
+            status=EmailDeliveryStatus.QUEUED, attempts=0, next_attempt_at=datetime.utcnow()
+        )
+        session.add(delivery)
+        return delivery
+
+    def start_workers(self, app):
+        """Start this process's requeue sweep if it is not running."""
+        self._sweeper.interval = app.config.get('EMAIL_REQUEUE_INTERVAL', 300)
+        self._sweeper.ensure_started(app)
+
+    def dispatch(self, delivery_id, countdown=0):
+        app = current_app._get_current_object()
+        self.start_workers(app)
+        backend = self.backend(app)
+        if backend == 'sync':
+            delay = self.deliver(delivery_id)
+            if delay is not None:
+                logger.info(f"Delivery {delivery_id} will be retried by the requeue sweep")
+            return
+        if backend == 'celery' and self._task is not None:
+            try:
+                self._task.apply_async(args=[delivery_id], countdown=countdown)
+                return
+            except Exception as e:
+                logger.error(f"Could not publish delivery {delivery_id} to Celery, sending locally: {str(e)}")
+        self._submit_local(app, delivery_id, countdown)
+
+    def _submit_local(self, app, delivery_id, countdown=0):
+        if countdown > 0:
+            timer = threading.Timer(countdown, self._submit_local, args=(app, delivery_id))
+            timer.daemon = True
+            timer.start()
+            return
+        self._local_executor(app).submit(self._run_local, app, delivery_id)
+
+    def _local_executor(self, app):
+        if self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=app.config.get('EMAIL_WORKER_THREADS', 4), thread_name_prefix='email'
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _run_local(self, app, delivery_id):
+        try:
+            with app.app_context():
+                delay = self.deliver(delivery_id)
+            if delay is not None:
+                self._submit_local(app, delivery_id, delay)
+        except Exception as e:
+            logger.error(f"Local email worker failed on delivery {delivery_id}: {str(e)}")
+
+    def deliver(self, delivery_id):
+        """
+        Make one attempt at sending a delivery and record the outcome.
+
+        Returns:
+            float: Seconds to wait before the next attempt, or None when finished
+        """
+        from app.services.email_service import send_email, EmailServiceError
+
+        max_attempts = current_app.config.get('EMAIL_MAX_ATTEMPTS', 5)
+        backoff = current_app.config.get('EMAIL_RETRY_BACKOFF', 30)
+        with Session(db.engine) as session:
+            claimed = session.execute(
+                update(EmailDelivery)
+                .where(
+                    EmailDelivery.id == delivery_id,
+                    EmailDelivery.status.in_([EmailDeliveryStatus.QUEUED, EmailDeliveryStatus.RETRYING])
+                )
+                .values(status=EmailDeliveryStatus.SENDING, attempts=EmailDelivery.attempts + 1,
+                        next_attempt_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            if not claimed:
+                # Finished, missing, or being sent by another worker
+                return None
+
+            delivery = session.get(EmailDelivery, delivery_id)
+            delay = None
+            try:
+                send_email(delivery.to_email, delivery.subject, delivery.text_content, delivery.html_content)
+            except EmailServiceError as e:
+                delivery.last_error = str(e)[:500]
+                if e.retryable and delivery.attempts < max_attempts:
+                    delay = min(backoff * 2 ** (delivery.attempts - 1), 3600)
+                    delivery.status = EmailDeliveryStatus.RETRYING
+                    delivery.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                else:
+                    delivery.status = EmailDeliveryStatus.FAILED
+                    delivery.next_attempt_at = None
+                    logger.error(f"Giving up on delivery {delivery_id} after {delivery.attempts} attempts: {str(e)}")
+            else:
+                delivery.status = EmailDeliveryStatus.SENT
+                delivery.sent_at = datetime.utcnow()
+                delivery.next_attempt_at = None
+                delivery.last_error = None
+            session.commit()
+        return delay
+
+    def requeue_overdue(self):
+        """
+        Redispatch deliveries whose next attempt is well overdue, including
+        ones claimed for sending that long ago whose worker never finished.
+        """
+        grace = current_app.config.get('EMAIL_REQUEUE_INTERVAL', 300)
+        # One sweep across all workers per interval
+        if not cache.add('email_queue:requeueing', 1, timeout=grace):
+            return
+        cutoff = datetime.utcnow() - timedelta(seconds=grace)
+        overdue_filter = (
+            EmailDelivery.status.in_([
+                EmailDeliveryStatus.QUEUED, EmailDeliveryStatus.RETRYING, EmailDeliveryStatus.SENDING
+            ]),
+            EmailDelivery.next_attempt_at < cutoff,
+        )
+        with Session(db.engine) as session:
+            overdue = [delivery_id for (delivery_id,) in session.query(EmailDelivery.id).filter(
+                *overdue_filter
+            ).limit(500)]
+            if overdue:
+                # Release stale claims so the redispatch can claim them again, and push
+                # the deadline forward so the next sweep does not dispatch them twice.
+                # Rows claimed since the SELECT no longer match the filter.
+                stale = session.query(EmailDelivery).filter(EmailDelivery.id.in_(overdue), *overdue_filter)
+                stale.filter(EmailDelivery.status == EmailDeliveryStatus.SENDING).update(
+                    {EmailDelivery.status: EmailDeliveryStatus.RETRYING}, synchronize_session=False
+                )
+                stale.update({EmailDelivery.next_attempt_at: datetime.utcnow()}, synchronize_session=False)
+                session.commit()
+        for delivery_id in overdue:
+            self.dispatch(delivery_id)
+        if overdue:
+            logger.info(f"Requeued {len(overdue)} overdue email deliveries")
+
+
+def _deliver_task(task, delivery_id):
+    delay = email_queue.deliver(delivery_id)
+    if delay is not None:
+        raise task.retry(countdown=delay, max_retries=None)
+
+
+email_queue = EmailQueue()
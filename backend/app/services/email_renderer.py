@@ -0,0 +1,139 @@
+# app/services/email_renderer.py
+
+import logging
+from datetime import datetime
+from flask import current_app
+from jinja2 import TemplateNotFound
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledEmail:
+    """The compiled text and HTML templates, subject and required kwargs of one email type."""
+    __slots__ = ('email_type', 'subject', 'text_template', 'html_template', 'required')
+
+    def __init__(self, email_type, subject, text_template, html_template, required):
+        self.email_type = email_type
+        self.subject = subject
+        self.text_template = text_template
+        self.html_template = html_template
+        self.required = required
+
+
+class EmailRenderer:
+    """
+    Renders templated emails from templates compiled once at startup.
+
+    `init_app()` compiles the .txt and .html template of every
+    EMAIL_TEMPLATE_TYPES entry (with base_email.html inheritance resolved)
+    and works out each type's required kwargs, so a render is a dict lookup
+    and two Template.render calls. `render_many()` renders one type for many
+    recipients, building the shared template context and validating the
+    shared kwargs only once.
+
+    When Jinja auto-reload is on (debug mode) templates are fetched from the
+    environment on each render, so edits still show up.
+    """
+
+    def init_app(self, app):
+        from app.services.email_service import (
+            EMAIL_TEMPLATE_TYPES, get_email_subject, get_required_template_kwargs
+        )
+
+        compiled = {}
+        for email_type in EMAIL_TEMPLATE_TYPES:
+            try:
+                text_template = app.jinja_env.get_template(f'email/{email_type}.txt')
+                html_template = app.jinja_env.get_template(f'email/{email_type}.html')
+            except TemplateNotFound as e:
+                logger.error(f"Email template missing for {email_type}: {e.name}")
+                continue
+            compiled[email_type] = CompiledEmail(
+                email_type, get_email_subject(email_type), text_template, html_template,
+                frozenset(get_required_template_kwargs(email_type))
+            )
+        app.extensions['email_templates'] = compiled
+        logger.info(f"Compiled {len(compiled)} email templates")
+
+    def get(self, email_type):
+        """
+        The compiled email for `email_type`.
+
+        Raises:
+            ValueError: If the type is unknown
+            EmailServiceError: If its templates are missing
+        """
+        from app.services.email_service import EMAIL_TEMPLATE_TYPES, EmailServiceError
+
+        if email_type not in EMAIL_TEMPLATE_TYPES:
+            raise ValueError(f"Unknown email type: {email_type}")
+        compiled = current_app.extensions.get('email_templates', {}).get(email_type)
+        if compiled is None:
+            raise EmailServiceError(f"Email template not found: email/{email_type}.html")
+        if current_app.jinja_env.auto_reload:
+            return CompiledEmail(
+                email_type, compiled.subject,
+                current_app.jinja_env.get_template(f'email/{email_type}.txt'),
+                current_app.jinja_env.get_template(f'email/{email_type}.html'),
+                compiled.required
+            )
+        return compiled
+
+    def validate(self, email_type, kwargs):
+        """Raise ValueError for an unknown type or missing required kwargs."""
+        _check_required(self.get(email_type).required, kwargs)
+
+    def render(self, email_type, **kwargs):
+        """
+        Returns:
+            tuple: (subject, text_content, html_content)
+        """
+        compiled = self.get(email_type)
+        _check_required(compiled.required, kwargs)
+        context = self._base_context()
+        context.update(kwargs)
+        return compiled.subject, compiled.text_template.render(context), compiled.html_template.render(context)
+
+    def render_many(self, email_type, recipients, **common):
+        """
+        Render one email type for many recipients.
+
+        Args:
+            recipients: Iterable of dicts with each recipient's own kwargs
+            common: Kwargs shared by every recipient
+
+        Yields:
+            tuple: (subject, text_content, html_content) per recipient, in order
+        """
+        compiled = self.get(email_type)
+        per_recipient_required = compiled.required.difference(common)
+        base = self._base_context()
+        base.update(common)
+        text_render = compiled.text_template.render
+        html_render = compiled.html_template.render
+        subject = compiled.subject
+
+        for recipient in recipients:
+            if per_recipient_required:
+                _check_required(per_recipient_required, recipient)
+            context = dict(base)
+            context.update(recipient)
+            yield subject, text_render(context), html_render(context)
+
+    @staticmethod
+    def _base_context():
+        # What render_template would add: context processors (config, g, and
+        # request/session inside a request), plus the year for the footer
+        context = {}
+        current_app.update_template_context(context)
+        context['current_year'] = datetime.now().year
+        return context
+
+
+def _check_required(required, kwargs):
+    missing = required.difference(kwargs)
+    if missing:
+        raise ValueError(f"Missing required template variables: {sorted(missing)}")
+
+
+email_renderer = EmailRenderer()
@@ -1,19 +1,25 @@
 # app/utils/email_service.py
 
 import os
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
-from flask import current_app, render_template
 import logging
 from python_http_client.exceptions import HTTPError
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from datetime import datetime
+from app.services.email_queue import email_queue
+from app.services.email_renderer import email_renderer
+from app.services.email_transport import get_transport
 
 logger = logging.getLogger(__name__)
 
 class EmailServiceError(Exception):
-    """Custom exception for email service errors"""
-    pass
+    """
+    Custom exception for email service errors.
+
+    `unsent` lists the recipients of a bulk send that were not sent to when
+    the transport knows it; None means the whole batch may be retried.
+    """
+    def __init__(self, message, retryable=False, unsent=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.unsent = unsent
 
 def should_retry_exception(exception):
     """Determine if the exception should trigger a retry"""
@@ -22,41 +28,21 @@ def should_retry_exception(exception):
         status_code = exception.status_code
         return status_code >= 500 or status_code == 429
     return True
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    retry=retry_if_exception_type((HTTPError, ConnectionError)),
-    reraise=True
-)
 def send_email(to_email: str, subject: str, text_content: str, html_content: str) -> bool:
-    """Send an email using SendGrid with retry logic."""
-
-    if not current_app.config.get('SENDGRID_API_KEY'):
-        raise EmailServiceError("SendGrid API key not configured")
-
-    message = Mail(
-        from_email=current_app.config['SENDGRID_DEFAULT_FROM'],
-        to_emails=to_email,
-        subject=subject,
-        plain_text_content=text_content,
-        html_content=html_content)
-    
+    """
+    Send one email through the configured transport (app/services/email_transport.py).
+
+    Retrying is left to the email queue (app/services/email_queue.py); the
+    raised EmailServiceError says whether a retry could succeed.
+    """
     try:
-        sg = SendGridAPIClient(current_app.config['SENDGRID_API_KEY'])
-        response = sg.send(message)
-
-        if response.status_code not in (200, 201, 202):
-            raise EmailServiceError(f"Unexpected status code: {response.status_code}")
-            
-        logger.info(f"Email sent successfully to {to_email}. Status: {response.status_code}")
-        return True
-    except HTTPError as e:
-        error_details = e.to_dict.get('errors', [{}])[0].get('message', str(e))
-        logger.error(f"SendGrid HTTP error: {error_details}")
-        raise EmailServiceError(f"Failed to send email: {error_details}")
+        get_transport().send(to_email, subject, text_content, html_content)
+    except EmailServiceError:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error sending email: {str(e)}")
-        raise EmailServiceError(f"Failed to send email: {str(e)}")
+        raise EmailServiceError(f"Failed to send email: {str(e)}", retryable=should_retry_exception(e))
+    return True
 
 EMAIL_TEMPLATE_TYPES = [
     'verify_email', 'reset_password', '2fa_enabled', '2fa_disabled', 
@@ -68,37 +54,40 @@ EMAIL_TEMPLATE_TYPES = [
 ]
 
 def send_templated_email(to_email, email_type, **kwargs):
-    """Send a templated email with enhanced error handling"""
+    """
+    Render a templated email and queue it for background delivery.
+
+    Rendering happens here, in the caller's context, so templates can use
+    the ORM objects passed in; sending, retries and the recorded delivery
+    status are handled by the email queue.
+
+    Returns:
+        int: The id of the queued EmailDelivery
+    """
     if not to_email:
         raise ValueError("No recipient email provided")
         
-    if email_type not in EMAIL_TEMPLATE_TYPES:
-        raise ValueError(f"Unknown email type: {email_type}")
-    
-    required_kwargs = get_required_template_kwargs(email_type)
-    missing_kwargs = [k for k in required_kwargs if k not in kwargs]
-
-    if missing_kwargs:
-        raise ValueError(f"Missing required template variables: {missing_kwargs}")
-        
+    email_renderer.validate(email_type, kwargs)
+
     try:
-        kwargs['current_year'] = datetime.now().year
-        subject = get_email_subject(email_type)
-
-        # Verify template existence before rendering
-        template_path = f'email/{email_type}'
-        if not current_app.jinja_env.get_template(f'{template_path}.html'):
-            raise EmailServiceError(f"Email template not found: {template_path}.html")
-            
-        text_content = render_template(f'{template_path}.txt', **kwargs)
-        html_content = render_template(f'{template_path}.html', **kwargs)
-        
-        return send_email(to_email, subject, text_content, html_content)
+        subject, text_content, html_content = render_templated_email(email_type, **kwargs)
+        return email_queue.enqueue(to_email, email_type, subject, text_content, html_content)
 
     except Exception as e:
         logger.error(f"Failed to send templated email: {str(e)}")
         raise EmailServiceError(f"Failed to send templated email: {str(e)}")
 
+def render_templated_email(email_type, **kwargs):
+    """
+    Render the subject, text and HTML bodies of a templated email.
+
+    Uses the templates precompiled at startup (app/services/email_renderer.py).
+
+    Returns:
+        tuple: (subject, text_content, html_content)
+    """
+    return email_renderer.render(email_type, **kwargs)
+
 def get_required_template_kwargs(email_type):
     """Return required kwargs for each template type"""
     template_requirements = {
@@ -139,4 +128,4 @@ def get_email_subject(email_type):
         'payout_completed': 'Your Payout Has Been Completed',
         'payout_failed': 'Your Payout Has Failed'
     }
-    return subjects.get(email_type, 'Notification from PayForMe')
\ No newline at end of file
+    return subjects.get(email_type, 'Notification from PayForMe')
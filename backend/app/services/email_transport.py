@@ -0,0 +1,279 @@
+# app/services/email_transport.py
+
+import os
+import abc
+import queue
+import smtplib
+import threading
+import uuid
+import logging
+from datetime import datetime
+from email.message import EmailMessage
+from flask import current_app
+import requests
+from requests.adapters import HTTPAdapter
+from sendgrid.helpers.mail import Mail, Personalization, Substitution, To
+
+logger = logging.getLogger(__name__)
+
+# SendGrid accepts at most this many personalizations per request
+MAX_RECIPIENTS_PER_REQUEST = 1000
+
+
+def _personalize(subject, text_content, html_content, substitutions):
+    for key, value in substitutions.items():
+        subject = subject.replace(key, value)
+        text_content = text_content.replace(key, value)
+        html_content = html_content.replace(key, value)
+    return subject, text_content, html_content
+
+
+def _mime_message(from_email, to_email, subject, text_content, html_content):
+    message = EmailMessage()
+    message['From'] = from_email
+    message['To'] = to_email
+    message['Subject'] = subject
+    message.set_content(text_content)
+    message.add_alternative(html_content, subtype='html')
+    return message
+
+
+class EmailTransport(abc.ABC):
+    """
+    Sends one message body to a batch of recipients.
+
+    `recipients` is a list of (email, substitutions) pairs; each recipient
+    gets the subject and bodies with their substitutions applied. Failures
+    raise EmailServiceError, flagged retryable when another attempt may work
+    and carrying the recipients not sent to when a batch fails part-way.
+    Transports are shared by all threads of a process and must be thread-safe.
+    """
+
+    def send(self, to_email, subject, text_content, html_content):
+        self.send_bulk(subject, text_content, html_content, [(to_email, {})])
+
+    @abc.abstractmethod
+    def send_bulk(self, subject, text_content, html_content, recipients):
+        """Send to every recipient, or raise EmailServiceError."""
+
+    def close(self):
+        pass
+
+
+class SendGridTransport(EmailTransport):
+    """
+    SendGrid v3 mail/send over one long-lived HTTP session.
+
+    Connections are kept alive and reused, so only the first request on each
+    pays for the TCP and TLS handshakes. At most `pool_size` requests are in
+    flight at once; further senders wait for a free connection. A batch is one
+    request with one personalization per recipient.
+    """
+
+    def __init__(self, api_key, from_email, api_url='https://api.sendgrid.com', pool_size=10, timeout=10):
+        self.api_key = api_key
+        self.from_email = from_email
+        self.url = f"{api_url.rstrip('/')}/v3/mail/send"
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+        })
+
+    def send_bulk(self, subject, text_content, html_content, recipients):
+        from app.services.email_service import EmailServiceError
+
+        if not self.api_key:
+            raise EmailServiceError("SendGrid API key not configured")
+        if len(recipients) > MAX_RECIPIENTS_PER_REQUEST:
+            raise ValueError(f"At most {MAX_RECIPIENTS_PER_REQUEST} recipients per request")
+
+        message = Mail(from_email=self.from_email, subject=subject,
+                       plain_text_content=text_content, html_content=html_content)
+        for position, (email, substitutions) in enumerate(recipients):
+            personalization = Personalization()
+            personalization.add_to(To(email))
+            for key, value in substitutions.items():
+                personalization.add_substitution(Substitution(key, value))
+            # add_personalization inserts at the front by default
+            message.add_personalization(personalization, index=position)
+
+        try:
+            response = self.session.post(self.url, json=message.get(), timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error(f"SendGrid request failed for {len(recipients)} recipients: {str(e)}")
+            raise EmailServiceError(f"Failed to send email: {str(e)}", retryable=True)
+
+        if response.status_code not in (200, 201, 202):
+            try:
+                error_details = response.json().get('errors', [{}])[0].get('message', response.text)
+            except ValueError:
+                error_details = response.text or response.reason
+            logger.error(f"SendGrid HTTP error {response.status_code}: {error_details}")
+            retryable = response.status_code >= 500 or response.status_code == 429
+            raise EmailServiceError(f"Failed to send email: {error_details}", retryable=retryable)
+        logger.info(f"Sent email to {len(recipients)} recipients. Status: {response.status_code}")
+
+    def close(self):
+        self.session.close()
+
+
+class SMTPTransport(EmailTransport):
+    """
+    SMTP with a pool of up to `pool_size` authenticated connections.
+
+    Idle connections are reused; one that the server has dropped is replaced
+    and the message retried once. SMTP has no personalizations, so a batch
+    is one message per recipient over a single pooled connection. When a
+    batch fails part-way the error lists the recipients not sent to yet, so
+    a retry does not email the others again.
+    """
+
+    def __init__(self, host, port, from_email, username=None, password=None, use_tls=True,
+                 pool_size=10, timeout=10):
+        self.host = host
+        self.port = port
+        self.from_email = from_email
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.quit()
+        except Exception:
+            pass
+
+    def send_bulk(self, subject, text_content, html_content, recipients):
+        from app.services.email_service import EmailServiceError
+
+        with self._slots:
+            connection = None
+            sent = 0
+            try:
+                connection = self._checkout()
+                for email, substitutions in recipients:
+                    message = _mime_message(self.from_email, email,
+                                            *_personalize(subject, text_content, html_content, substitutions))
+                    try:
+                        connection.send_message(message)
+                    except smtplib.SMTPServerDisconnected:
+                        connection = self._connect()
+                        connection.send_message(message)
+                    sent += 1
+            except smtplib.SMTPResponseException as e:
+                if connection is not None:
+                    self._discard(connection)
+                logger.error(f"SMTP error {e.smtp_code} after {sent} of {len(recipients)} recipients: {e.smtp_error}")
+                # 4xx replies are temporary, 5xx permanent
+                raise EmailServiceError(f"Failed to send email: {e.smtp_code} {e.smtp_error}",
+                                        retryable=400 <= e.smtp_code < 500, unsent=recipients[sent:])
+            except (smtplib.SMTPException, OSError) as e:
+                if connection is not None:
+                    self._discard(connection)
+                logger.error(f"SMTP delivery failed after {sent} of {len(recipients)} recipients: {str(e)}")
+                raise EmailServiceError(f"Failed to send email: {str(e)}", retryable=True,
+                                        unsent=recipients[sent:])
+            self._idle.put(connection)
+        logger.info(f"Sent email to {len(recipients)} recipients over SMTP")
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class MemoryTransport(EmailTransport):
+    """Keeps every message in `outbox` instead of sending it; for tests and local development."""
+
+    def __init__(self):
+        self.outbox = []
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def send_bulk(self, subject, text_content, html_content, recipients):
+        messages = []
+        for email, substitutions in recipients:
+            message_subject, text, html = _personalize(subject, text_content, html_content, substitutions)
+            messages.append({'to': email, 'subject': message_subject, 'text': text, 'html': html})
+        with self._lock:
+            self.requests += 1
+            self.outbox.extend(messages)
+
+
+class FileTransport(EmailTransport):
+    """Writes each message as an .eml file in `directory`, for inspecting emails locally."""
+
+    def __init__(self, directory, from_email):
+        self.directory = directory
+        self.from_email = from_email
+        os.makedirs(directory, exist_ok=True)
+
+    def send_bulk(self, subject, text_content, html_content, recipients):
+        for email, substitutions in recipients:
+            message = _mime_message(self.from_email, email,
+                                    *_personalize(subject, text_content, html_content, substitutions))
+            name = f"{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.eml"
+            with open(os.path.join(self.directory, name), 'wb') as f:
+                f.write(message.as_bytes())
+
+
+def create_transport(config):
+    """Build the transport named by EMAIL_TRANSPORT: 'sendgrid', 'smtp', 'memory' or 'file'."""
+    name = config.get('EMAIL_TRANSPORT', 'sendgrid')
+    from_email = config['SENDGRID_DEFAULT_FROM']
+    pool_size = config.get('EMAIL_TRANSPORT_POOL_SIZE', 10)
+    timeout = config.get('EMAIL_TRANSPORT_TIMEOUT', 10)
+    if name == 'sendgrid':
+        return SendGridTransport(config.get('SENDGRID_API_KEY'), from_email,
+                                 api_url=config.get('SENDGRID_API_URL', 'https://api.sendgrid.com'),
+                                 pool_size=pool_size, timeout=timeout)
+    if name == 'smtp':
+        return SMTPTransport(config.get('SMTP_HOST', 'localhost'), config.get('SMTP_PORT', 587), from_email,
+                             username=config.get('SMTP_USERNAME'), password=config.get('SMTP_PASSWORD'),
+                             use_tls=config.get('SMTP_USE_TLS', True), pool_size=pool_size, timeout=timeout)
+    if name == 'memory':
+        return MemoryTransport()
+    if name == 'file':
+        return FileTransport(config.get('EMAIL_FILE_DIR', '/tmp/emails'), from_email)
+    raise ValueError(f"Unknown EMAIL_TRANSPORT: {name}")
+
+
+_transport_lock = threading.Lock()
+
+
+def get_transport(app=None):
+    """The app's transport, built on first use and then shared by every thread."""
+    app = app or current_app._get_current_object()
+    transport = app.extensions.get('email_transport')
+    if transport is None:
+        with _transport_lock:
+            transport = app.extensions.get('email_transport')
+            if transport is None:
+                transport = create_transport(app.config)
+                app.extensions['email_transport'] = transport
+    return transport
@@ -0,0 +1,275 @@
+# app/services/funding_counter_service.py
+
+import random
+import threading
+import time
+import logging
+from collections import Counter
+from decimal import Decimal
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, update, func
+from sqlalchemy.orm import Session
+from redis.exceptions import RedisError
+from app import db, cache
+from app.models.project import Project
+from app.models.project_funding_shard import ProjectFundingShard
+from app.models.enums import ProjectStatus
+from app.utils.background import PeriodicWorker
+from app.utils.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+class FundingCounterService:
+    """
+    Sharded funding counters for projects with a very high pledge rate.
+
+    A sharded project spreads pledges over FUNDING_SHARD_COUNT rows in
+    project_funding_shards so concurrent pledges do not all serialise on the
+    projects row. Reads add the shards to Project.current_amount and cache the
+    result briefly, and a background job folds the shards back into
+    Project.current_amount.
+    """
+
+    def __init__(self):
+        self._local_rates = Counter()
+        self._lock = threading.Lock()
+        self._folder = PeriodicWorker('funding-shard-folder', 60, self.fold_all)
+
+    def _ensure_folder(self):
+        app = current_app._get_current_object()
+        self._folder.interval = app.config.get('FUNDING_SHARD_FOLD_INTERVAL', 60)
+        self._folder.ensure_started(app)
+
+    def enable_sharding(self, project_id, session=None):
+        """Create the shard rows for a project and route its pledges to them."""
+        own_session = session is None
+        session = session or Session(db.engine)
+        try:
+            shard_count = current_app.config.get('FUNDING_SHARD_COUNT', 16)
+            existing = set(session.scalars(
+                select(ProjectFundingShard.shard_id).where(ProjectFundingShard.project_id == project_id)
+            ))
+            session.add_all([
+                ProjectFundingShard(project_id=project_id, shard_id=shard_id, amount=Decimal('0'), pledge_count=0)
+                for shard_id in range(shard_count) if shard_id not in existing
+            ])
+            session.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(sharded_funding=True)
+                .execution_options(synchronize_session=False)
+            )
+            if own_session:
+                session.commit()
+            logger.info(f"Enabled sharded funding for project {project_id} with {shard_count} shards")
+        finally:
+            if own_session:
+                session.close()
+
+    def add_pledge(self, session, project_id, amount):
+        """
+        Add a pledge to a random shard of a sharded project.
+
+        Runs inside the caller's transaction and never writes the projects
+        row unless this pledge takes the project past its goal.
+
+        Returns:
+            bool: True if this pledge moved the project to FUNDED
+        """
+        self._ensure_folder()
+        shard_count = current_app.config.get('FUNDING_SHARD_COUNT', 16)
+        shard_id = random.randrange(shard_count)
+
+        result = session.execute(
+            update(ProjectFundingShard)
+            .where(ProjectFundingShard.project_id == project_id, ProjectFundingShard.shard_id == shard_id)
+            .values(
+                amount=ProjectFundingShard.amount + amount,
+                pledge_count=ProjectFundingShard.pledge_count + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            session.add(ProjectFundingShard(
+                project_id=project_id, shard_id=shard_id, amount=amount, pledge_count=1
+            ))
+            session.flush()
+
+        # Drop the cached total once this pledge is visible to other readers
+        session.info.setdefault('changed_funding_totals', set()).add(project_id)
+
+        # Only touch the projects row when the summed total reaches the goal
+        total, goal_amount = self._read_total(session, project_id)
+        if goal_amount is None or total < goal_amount:
+            return False
+        return session.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.status == ProjectStatus.ACTIVE)
+            .values(status=ProjectStatus.FUNDED)
+            .execution_options(synchronize_session=False)
+        ).rowcount > 0
+
+    def record_pledge(self, project_id):
+        """
+        Track the pledge rate of a project and switch it to sharded counters
+        once it exceeds FUNDING_SHARD_RATE_THRESHOLD pledges per minute.
+        """
+        threshold = current_app.config.get('FUNDING_SHARD_RATE_THRESHOLD', 120)
+        if not threshold:
+            return False
+
+        minute = int(time.time() // 60)
+        rate = self._increment_rate(project_id, minute)
+        if rate < threshold:
+            return False
+
+        try:
+            self.enable_sharding(project_id)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to enable sharded funding for project {project_id}: {str(e)}")
+            return False
+
+    def _increment_rate(self, project_id, minute):
+        redis_client = redis_manager.client()
+        if redis_client is not None:
+            key = f"funding_rate:{project_id}:{minute}"
+            try:
+                pipe = redis_client.pipeline()
+                pipe.incr(key)
+                pipe.expire(key, 120)
+                return pipe.execute()[0]
+            except RedisError as e:
+                redis_manager.report_error(e)
+                logger.warning(f"Redis unavailable for pledge rate tracking: {str(e)}")
+
+        with self._lock:
+            for stale in [k for k in self._local_rates if k[1] < minute]:
+                del self._local_rates[stale]
+            self._local_rates[(project_id, minute)] += 1
+            return self._local_rates[(project_id, minute)]
+
+    def get_current_amount(self, project_id):
+        """Return Project.current_amount plus all unfolded shard amounts, cached briefly."""
+        cache_key = self._cache_key(project_id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Decimal(cached)
+
+        with Session(db.engine) as session:
+            total, _ = self._read_total(session, project_id)
+
+        cache.set(cache_key, str(total), timeout=current_app.config.get('FUNDING_TOTAL_CACHE_TIMEOUT', 5))
+        return total
+
+    @staticmethod
+    def _read_total(session, project_id):
+        shard_total = select(func.coalesce(func.sum(ProjectFundingShard.amount), 0))\
+            .where(ProjectFundingShard.project_id == project_id)\
+            .scalar_subquery()
+        row = session.execute(
+            select(func.coalesce(Project.current_amount, 0) + shard_total, Project.goal_amount)
+            .where(Project.id == project_id)
+        ).first()
+        if row is None:
+            return Decimal('0'), None
+        return Decimal(str(row[0])).quantize(Decimal('0.01')), row[1]
+
+    def fold(self, project_id):
+        """
+        Move everything held in a project's shards into Project.current_amount.
+
+        Each shard is decremented by the amount that was read rather than
+        reset to zero, so pledges landing during the fold are not lost. The
+        fold also moves the project to FUNDED once the folded total reaches
+        the goal: concurrent pledges each read the total without the others'
+        uncommitted shard writes, so all of them can miss the transition.
+
+        Returns:
+            Decimal: Amount folded
+        """
+        with Session(db.engine) as session:
+            shards = session.execute(
+                select(ProjectFundingShard.shard_id, ProjectFundingShard.amount)
+                .where(ProjectFundingShard.project_id == project_id, ProjectFundingShard.amount != 0)
+                .with_for_update()
+            ).all()
+            folded = sum((amount for _, amount in shards), Decimal('0'))
+            if not folded:
+                return Decimal('0')
+
+            for shard_id, amount in shards:
+                session.execute(
+                    update(ProjectFundingShard)
+                    .where(ProjectFundingShard.project_id == project_id, ProjectFundingShard.shard_id == shard_id)
+                    .values(amount=ProjectFundingShard.amount - amount)
+                    .execution_options(synchronize_session=False)
+                )
+            new_amount = func.coalesce(Project.current_amount, 0) + folded
+            session.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .ordered_values(
+                    (Project.funding_ratio, Project.funding_ratio_after(new_amount)),
+                    (Project.current_amount, new_amount)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            funded = session.execute(
+                update(Project)
+                .where(
+                    Project.id == project_id,
+                    Project.status == ProjectStatus.ACTIVE,
+                    Project.current_amount >= Project.goal_amount
+                )
+                .values(status=ProjectStatus.FUNDED)
+                .execution_options(synchronize_session=False)
+            ).rowcount > 0
+            session.commit()
+
+        cache.delete(self._cache_key(project_id))
+        logger.info(f"Folded {folded} from funding shards into project {project_id}")
+        if funded:
+            logger.info(f"Project {project_id} reached its goal and is now FUNDED")
+        return folded
+
+    def fold_all(self):
+        """Fold the shards of every sharded project."""
+        with Session(db.engine) as session:
+            project_ids = session.scalars(
+                select(Project.id).where(Project.sharded_funding.is_(True))
+            ).all()
+
+        for project_id in project_ids:
+            try:
+                self.fold(project_id)
+            except Exception as e:
+                logger.error(f"Failed to fold funding shards for project {project_id}: {str(e)}")
+
+    @staticmethod
+    def _cache_key(project_id):
+        return f"funding_total:{project_id}"
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_funding_totals(session):
+    project_ids = session.info.pop('changed_funding_totals', None)
+    if not project_ids or not has_app_context():
+        return
+    for project_id in project_ids:
+        try:
+            cache.delete(FundingCounterService._cache_key(project_id))
+        except Exception as e:
+            logger.error(f"Could not invalidate the funding total of project {project_id}: {str(e)}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_funding_totals(session, previous_transaction):
+    if previous_transaction.nested:
+        # A savepoint rolled back; the outer transaction may still commit
+        return
+    session.info.pop('changed_funding_totals', None)
+
+
+funding_counter = FundingCounterService()
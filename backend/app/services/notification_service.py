@@ -1,7 +1,12 @@
 # app/services/notification_service.py
 
 from app.models import Notification, User, Role
+from app.models.association_tables import user_roles
+from app.models.project import project_backers
+from app.models.saved_project import SavedProject
 from app import db
+from sqlalchemy import insert, literal, select
+from sqlalchemy.sql import Select
 from typing import List
 from enum import Enum
 from datetime import datetime
@@ -33,34 +38,69 @@ class NotificationService:
             raise
 
     @staticmethod
-    def create_admin_notification(message: str, project_id: int = None) -> List[Notification]:
-        try:
-            admin_role = Role.query.filter_by(name='Admin').first()
-            if not admin_role:
-                logger.warning("Admin role not found when creating notification")
-                return []
+    def create_admin_notification(message: str, project_id: int = None) -> int:
+        """Notify every admin; returns the number of notifications created."""
+        count = NotificationService.notify_audience(
+            NotificationService.admin_audience(), message, NotificationType.ADMIN_REVIEW, project_id
+        )
+        if not count:
+            logger.warning("No admins found when creating notification")
+        return count
 
-            admin_users = User.query.filter(User.roles.contains(admin_role)).all()
-            notifications = []
+    @staticmethod
+    def admin_audience() -> Select:
+        return (
+            select(user_roles.c.user_id)
+            .join(Role, Role.id == user_roles.c.role_id)
+            .where(Role.name == 'Admin')
+        )
 
-            for admin in admin_users:
-                notification = Notification(
-                    message=message,
-                    user_id=admin.id,
-                    type=NotificationType.ADMIN_REVIEW,  # Add the type
-                    created_at=datetime.utcnow(),  # Add creation timestamp
-                    project_id=project_id  # Add project_id reference
-                )
-                db.session.add(notification)
-                notifications.append(notification)
+    @staticmethod
+    def project_backer_audience(project_id: int) -> Select:
+        return select(project_backers.c.user_id).where(project_backers.c.project_id == project_id)
 
-            db.session.commit()
-            logger.info(f"Created {len(notifications)} admin notifications")
-            return notifications
+    @staticmethod
+    def project_follower_audience(project_id: int) -> Select:
+        """Users who saved the project."""
+        return select(SavedProject.user_id).where(SavedProject.project_id == project_id)
+
+    @staticmethod
+    def notify_audience(audience: Select, message: str, notification_type: NotificationType,
+                        project_id: int = None, commit: bool = True) -> int:
+        """
+        Create the same notification for every user id selected by `audience`.
+
+        One INSERT ... SELECT, whatever the audience size: no User or
+        Notification objects are loaded, and the message is bound once.
+        Duplicate ids in the audience get a single notification. With
+        commit=False the rows join the caller's transaction.
+
+        Returns:
+            int: Number of notifications created
+        """
+        table = Notification.__table__
+        recipients = audience.subquery()
+        try:
+            result = db.session.execute(
+                insert(table).from_select(
+                    ['user_id', 'type', 'message', 'project_id', 'created_at'],
+                    select(
+                        recipients.c.user_id,
+                        literal(notification_type, table.c.type.type),
+                        literal(message, table.c.message.type),
+                        literal(project_id, table.c.project_id.type),
+                        literal(datetime.utcnow(), table.c.created_at.type),
+                    ).distinct()
+                )
+            )
+            if commit:
+                db.session.commit()
+            logger.info(f"Created {result.rowcount} {notification_type.name} notifications")
+            return result.rowcount
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error creating admin notifications: {e}")
-            raise  # Re-raise the exception to handle it in the calling function
+            logger.error(f"Error creating {notification_type.name} notifications: {e}")
+            raise
 
     @staticmethod
     def get_user_notifications(user_id: int, unread_only: bool = False) -> List[Notification]:
@@ -0,0 +1,182 @@
+# app/services/outbox.py
+
+import logging
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, delete
+from sqlalchemy.orm import Session
+from app import db
+from app.models.outbox import OutboxMessage, OutboxStatus
+from app.services.email_queue import email_queue
+from app.utils.background import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Transactional outbox for side effects of database changes.
+
+    `add_email()` writes an outbox row in the caller's session, so the email
+    exists if and only if the business change commits, and nothing slow
+    happens while the caller's transaction holds its locks. After the commit
+    the relay claims pending rows in batches of OUTBOX_BATCH_SIZE (SELECT ...
+    FOR UPDATE SKIP LOCKED, so workers never claim the same row), turns each
+    into an email_deliveries row in the same transaction that marks it
+    dispatched, and hands the deliveries to the email queue once that commits.
+
+    The relay is woken by every commit that wrote to the outbox and also runs
+    every OUTBOX_RELAY_INTERVAL seconds from app start, so rows whose wake-up
+    was lost or whose relay is backing off are still sent; in 'sync' email
+    mode commits drain inline. Dispatched rows are deleted after
+    OUTBOX_RETENTION_HOURS.
+    """
+
+    def __init__(self):
+        self._handlers = {'email': self._relay_email}
+        self._worker = PeriodicWorker('outbox-relay', 5, self.run)
+
+    def add(self, session, kind, payload):
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown outbox message kind: {kind}")
+        message = OutboxMessage(kind=kind, payload=payload, status=OutboxStatus.PENDING,
+                                attempts=0, available_at=datetime.utcnow())
+        session.add(message)
+        session.info['outbox_written'] = True
+        return message
+
+    def add_email(self, session, to_email, email_type, **kwargs):
+        """
+        Render a templated email now and queue it to be sent once `session` commits.
+
+        Raises:
+            ValueError: For an unknown type or missing template variables
+        """
+        from app.services.email_service import render_templated_email
+
+        if not to_email:
+            raise ValueError("No recipient email provided")
+        subject, text_content, html_content = render_templated_email(email_type, **kwargs)
+        return self.add(session, 'email', {
+            'to_email': to_email, 'email_type': email_type, 'subject': subject,
+            'text_content': text_content, 'html_content': html_content,
+        })
+
+    def notify(self):
+        """Called after a commit that wrote to the outbox."""
+        app = current_app._get_current_object()
+        if email_queue.backend(app) == 'sync':
+            self.drain()
+            return
+        self.start(app)
+        self._worker.wake()
+
+    def start(self, app):
+        """Start this process's periodic relay if it is not running."""
+        self._worker.interval = app.config.get('OUTBOX_RELAY_INTERVAL', 5)
+        self._worker.ensure_started(app)
+
+    def run(self):
+        self.drain()
+        self.prune()
+
+    def drain(self, batch_size=None, max_batches=None):
+        """
+        Relay pending messages until none are due.
+
+        Returns:
+            int: Number of messages relayed
+        """
+        batch_size = batch_size or current_app.config.get('OUTBOX_BATCH_SIZE', 100)
+        relayed = batches = 0
+        while max_batches is None or batches < max_batches:
+            claimed, count = self._relay_batch(batch_size)
+            relayed += count
+            batches += 1
+            if claimed < batch_size:
+                break
+        return relayed
+
+    def _relay_batch(self, batch_size):
+        max_attempts = current_app.config.get('OUTBOX_MAX_ATTEMPTS', 10)
+        now = datetime.utcnow()
+        after_commit = []
+        relayed = 0
+        with Session(db.engine) as session:
+            messages = session.scalars(
+                select(OutboxMessage)
+                .where(OutboxMessage.status == OutboxStatus.PENDING, OutboxMessage.available_at <= now)
+                .order_by(OutboxMessage.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            for message in messages:
+                try:
+                    after_commit.append(self._handlers[message.kind](session, message.payload))
+                except Exception as e:
+                    message.attempts += 1
+                    message.last_error = str(e)[:500]
+                    if message.attempts >= max_attempts:
+                        message.status = OutboxStatus.FAILED
+                        logger.error(f"Giving up on outbox message {message.id}: {str(e)}")
+                    else:
+                        message.available_at = now + timedelta(seconds=min(30 * 2 ** message.attempts, 3600))
+                    continue
+                message.status = OutboxStatus.DISPATCHED
+                message.dispatched_at = now
+                relayed += 1
+            session.commit()
+
+        for action in after_commit:
+            try:
+                action()
+            except Exception as e:
+                # The delivery row exists; the email queue's requeue sweep picks it up
+                logger.error(f"Could not dispatch relayed outbox message: {str(e)}")
+        if messages:
+            logger.info(f"Relayed {relayed} of {len(messages)} outbox messages")
+        return len(messages), relayed
+
+    @staticmethod
+    def _relay_email(session, payload):
+        delivery = email_queue.add(session, payload['to_email'], payload['email_type'], payload['subject'],
+                                   payload['text_content'], payload['html_content'])
+        session.flush()
+        delivery_id = delivery.id
+        return lambda: email_queue.dispatch(delivery_id)
+
+    def prune(self, batch_size=1000):
+        """Delete dispatched messages older than OUTBOX_RETENTION_HOURS."""
+        cutoff = datetime.utcnow() - timedelta(hours=current_app.config.get('OUTBOX_RETENTION_HOURS', 168))
+        with Session(db.engine) as session:
+            ids = session.scalars(
+                select(OutboxMessage.id)
+                .where(OutboxMessage.status == OutboxStatus.DISPATCHED, OutboxMessage.dispatched_at < cutoff)
+                .limit(batch_size)
+            ).all()
+            if ids:
+                session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(ids)))
+                session.commit()
+        return len(ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_outbox_relay(session):
+    if not session.info.pop('outbox_written', None) or not has_app_context():
+        return
+    try:
+        outbox.notify()
+    except Exception as e:
+        # The messages are committed; the relay's next scheduled run sends them
+        logger.error(f"Could not wake the outbox relay: {str(e)}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_outbox_writes(session, previous_transaction):
+    if previous_transaction.nested:
+        # A savepoint rolled back; the outer transaction may still commit
+        return
+    session.info.pop('outbox_written', None)
+
+
+outbox = OutboxRelay()
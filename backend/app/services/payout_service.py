@@ -4,15 +4,14 @@ from flask import current_app
 from app.models.payout import Payout, PayoutStatus
 from app.models.project import Project
 from app.models.user import User
-from app.models.donation import Donation
-from app.models.enums import ProjectStatus, DonationStatus
+from app.models.enums import ProjectStatus
 from app import db
 from decimal import Decimal
 from datetime import datetime
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.services.email_service import send_templated_email
+from app.services.stats_service import get_project_stats
 
 logger = logging.getLogger(__name__)
 
@@ -31,17 +30,10 @@ class PayoutService:
         """Calculate available funds for a project after platform fees."""
         try:
             with Session(db.engine) as session:
-                # Get total successful donations
-                total_donations = session.query(func.sum(Donation.amount)) \
-                    .filter(Donation.project_id == project_id) \
-                    .filter(Donation.status == DonationStatus.COMPLETED) \
-                    .scalar() or Decimal('0')
-                
-                # Get total already paid out
-                total_paid_out = session.query(func.sum(Payout.amount)) \
-                    .filter(Payout.project_id == project_id) \
-                    .filter(Payout.status.in_([PayoutStatus.COMPLETED, PayoutStatus.PROCESSING])) \
-                    .scalar() or Decimal('0')
+                # Completed donations and payouts already made (COMPLETED or PROCESSING)
+                stats = get_project_stats(session, project_id)
+                total_donations = stats.completed_amount
+                total_paid_out = stats.paid_out_amount
                 
                 # Calculate platform fee (e.g., 5%)
                 platform_fee_percentage = Decimal(current_app.config.get('PLATFORM_FEE_PERCENTAGE', '5'))
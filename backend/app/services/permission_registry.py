@@ -0,0 +1,122 @@
+# app/services/permission_registry.py
+
+import base64
+import hashlib
+import time
+import threading
+import logging
+from functools import lru_cache
+from app import db
+from app.models import Permission
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _decode_bits(encoded):
+    padded = encoded + '=' * (-len(encoded) % 4)
+    return int.from_bytes(base64.urlsafe_b64decode(padded), 'little')
+
+
+class PermissionRegistry:
+    """
+    Maps permission names to bit positions for the `perm_bits` JWT claim.
+
+    A permission's bit is its row id in the permissions table. `version` is
+    a digest of the id/name mapping, and a bitset is only decoded against
+    the mapping it was encoded with: ids can be reused after a delete
+    (SQLite rowids, MySQL < 8 resetting AUTO_INCREMENT on restart), so an
+    old bit may now stand for another permission. A token carrying a
+    version this process has not seen makes it reload the mapping once;
+    tokens from an older mapping fall back to their names claim, or are
+    stale and must be reissued.
+
+    The mapping is loaded on first use in each process rather than in
+    create_app, which also runs for CLI commands before the tables exist.
+    """
+
+    def __init__(self, reload_interval=10):
+        self._bits = None
+        self._stale_versions = set()
+        self.version = None
+        self._loaded_at = 0
+        self._reload_interval = reload_interval
+        self._lock = threading.Lock()
+
+    def load(self):
+        rows = db.session.query(Permission.id, Permission.name).order_by(Permission.id).all()
+        bits = {name: permission_id for permission_id, name in rows}
+        digest = hashlib.sha1(','.join(f'{i}:{n}' for i, n in rows).encode()).hexdigest()[:8]
+        with self._lock:
+            if self.version is not None and self.version != digest:
+                self._stale_versions.add(self.version)
+            self._stale_versions.discard(digest)
+            self._bits = bits
+            self.version = digest
+            self._loaded_at = time.monotonic()
+        logger.info(f"Loaded permission registry version {digest} with {len(bits)} permissions")
+
+    def _ensure_loaded(self):
+        if self._bits is None:
+            self.load()
+
+    def _is_current(self, version):
+        """Whether a bitset encoded under `version` can be decoded with the current mapping."""
+        self._ensure_loaded()
+        if version == self.version:
+            return True
+        if version in self._stale_versions:
+            return False
+        # Issued by a process that reloaded since; reload once to find out
+        self.load()
+        if version == self.version:
+            return True
+        with self._lock:
+            self._stale_versions.add(version)
+        return False
+
+    def _reload_if_due(self):
+        if time.monotonic() - self._loaded_at >= self._reload_interval:
+            self.load()
+
+    def encode(self, names):
+        """
+        Returns:
+            str: Unpadded urlsafe base64 of the little-endian bitset of `names`
+        """
+        self._ensure_loaded()
+        if any(name not in self._bits for name in names):
+            self._reload_if_due()
+        mask = 0
+        for name in names:
+            bit = self._bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        raw = mask.to_bytes(max((mask.bit_length() + 7) // 8, 1), 'little')
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def token_is_current(self, claims):
+        """False for tokens whose only permission claim is a bitset from an older mapping."""
+        if claims.get('perm_bits') is None or 'permissions' in claims:
+            return True
+        return self._is_current(claims.get('perm_v'))
+
+    def token_has_permission(self, claims, name):
+        """
+        Check `name` against the bitset in `claims`, or the names list in
+        tokens issued without a bitset or against an older mapping.
+        """
+        encoded = claims.get('perm_bits')
+        if encoded is None or not self._is_current(claims.get('perm_v')):
+            return name in claims.get('permissions', ())
+        bit = self._bits.get(name)
+        if bit is None:
+            # Not in the permissions table, so it can only have been granted by name
+            return name in claims.get('permissions', ())
+        try:
+            return bool(_decode_bits(encoded) >> bit & 1)
+        except (ValueError, TypeError):
+            return False
+
+
+permission_registry = PermissionRegistry()
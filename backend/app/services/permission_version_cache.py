@@ -0,0 +1,114 @@
+# app/services/permission_version_cache.py
+
+import time
+import threading
+import logging
+from flask import current_app
+from redis.exceptions import RedisError
+from app import db
+from app.models.user import User
+from app.utils.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'permission_version:'
+
+
+class PermissionVersionCache:
+    """
+    user_id -> last_permission_update epoch, for checking JWT permission claims.
+
+    Lookups go through an in-process map whose entries live for
+    PERMISSION_VERSION_LOCAL_TTL seconds, then per-user Redis keys that
+    expire after PERMISSION_VERSION_REDIS_TTL, and only then the users
+    table. `bump()` writes through both tiers, so the worker that changed a
+    user's roles sees it at once and other workers within the local TTL.
+    Redis keys expire rather than living in one hash so that a bump made
+    while Redis was unreachable cannot leave a stale version behind for
+    longer than that TTL.
+    """
+
+    def __init__(self, max_entries=50000):
+        self._local = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get(self, user_id):
+        """
+        Returns:
+            float: The user's permission version (0 if never set), or None if the user does not exist
+        """
+        key = str(user_id)
+        now = time.monotonic()
+        entry = self._local.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        version = self._get_from_redis(key)
+        if version is None:
+            version = self._load(user_id)
+            if version is not None:
+                # nx: never overwrite a concurrent bump with the value read before it
+                self._set_in_redis(key, version, nx=True)
+        self._remember(key, version, now)
+        return version
+
+    def bump(self, user_id, last_permission_update):
+        version = last_permission_update.timestamp() if last_permission_update else 0.0
+        key = str(user_id)
+        self._remember(key, version, time.monotonic())
+        self._set_in_redis(key, version)
+
+    def clear(self):
+        """Forget every cached version, e.g. after updating all users at once."""
+        with self._lock:
+            self._local.clear()
+        redis_client = redis_manager.client()
+        if redis_client is None:
+            return
+        try:
+            keys = list(redis_client.scan_iter(f'{KEY_PREFIX}*', count=1000))
+            for start in range(0, len(keys), 1000):
+                redis_client.delete(*keys[start:start + 1000])
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.error(f"Could not clear permission versions in Redis: {str(e)}")
+
+    def _load(self, user_id):
+        row = db.session.query(User.last_permission_update).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        return row[0].timestamp() if row[0] else 0.0
+
+    def _remember(self, key, version, now):
+        ttl = current_app.config.get('PERMISSION_VERSION_LOCAL_TTL', 5)
+        with self._lock:
+            self._local[key] = (version, now + ttl)
+            if len(self._local) > self._max_entries:
+                self._local = {k: v for k, v in self._local.items() if v[1] > now}
+
+    def _get_from_redis(self, key):
+        redis_client = redis_manager.client()
+        if redis_client is None:
+            return None
+        try:
+            value = redis_client.get(f'{KEY_PREFIX}{key}')
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.error(f"Could not read permission version for user {key}: {str(e)}")
+            return None
+        return float(value) if value is not None else None
+
+    def _set_in_redis(self, key, version, nx=False):
+        redis_client = redis_manager.client()
+        if redis_client is None:
+            return
+        try:
+            ttl = current_app.config.get('PERMISSION_VERSION_REDIS_TTL', 300)
+            redis_client.set(f'{KEY_PREFIX}{key}', repr(version), ex=ttl, nx=nx)
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.error(f"Could not store permission version for user {key}: {str(e)}")
+
+
+permission_versions = PermissionVersionCache()
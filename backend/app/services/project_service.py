@@ -9,8 +9,10 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.utils.project_utils import validate_project_data
 from app.services.role_permission_service import RolePermissionService
 from app.utils.exceptions import ValidationError, ProjectNotFoundError
+from app.utils.pagination import keyset_paginate
 from app.services.notification_service import NotificationService
 from app.services.project_role_service import ProjectRoleService
+from app.services.search_index import search_index
 import logging
 from sqlalchemy import desc
 
@@ -74,6 +76,7 @@ def create_project(data: Dict[str, Any]) -> Project:
         db.session.commit()
         logger.info(f"Project status after commit: {new_project.status}")
         logger.info(f"Created new project: {new_project.id} with status {new_project.status}")
+        search_index.index_project(new_project)
 
         # Assign project creator role to the user
         # Assign project-specific creator role
@@ -128,6 +131,7 @@ def update_project(project_id: int, data: Dict[str, Any]) -> Project:
                     setattr(project, key, value)
         
         db.session.commit()
+        search_index.index_project(project)
         logger.info(f"Updated project: {project_id}")
         return project
     except (ValidationError, ProjectNotFoundError) as e:
@@ -157,6 +161,7 @@ def delete_project(project_id: int) -> bool:
         project.is_deleted = True
         project.deleted_at = datetime.utcnow()
         db.session.commit()
+        search_index.remove_project(project_id)
         logger.info(f"Soft deleted project: {project_id}")
         return True
     except ProjectNotFoundError as e:
@@ -167,8 +172,14 @@ def delete_project(project_id: int) -> bool:
         logger.error(f"Error deleting project {project_id}: {e}")
         raise Exception(f"Error deleting project: {e}")
 
-def get_all_projects(page: int = 1, per_page: int = 10, sort_by: str = 'created_at', sort_order: str = 'desc', filters: Dict[str, Any] = None) -> Any:
-    """Retrieve all non-deleted projects with pagination, sorting, and filtering."""
+def get_all_projects(page: int = 1, per_page: int = 10, sort_by: str = 'created_at', sort_order: str = 'desc', filters: Dict[str, Any] = None,
+                     cursor: Optional[str] = None, with_total: bool = False) -> Any:
+    """
+    Retrieve all non-deleted projects with pagination, sorting, and filtering.
+
+    With a `cursor` (empty for the first page) this returns a KeysetPage on
+    (sort_by, id) instead of an OFFSET pagination.
+    """
     query = Project.query.filter_by(is_deleted=False)
 
     # Apply filters
@@ -177,6 +188,14 @@ def get_all_projects(page: int = 1, per_page: int = 10, sort_by: str = 'created_
             if hasattr(Project, key):
                 query = query.filter(getattr(Project, key) == value)
 
+    if cursor is not None:
+        if sort_by not in Project.__table__.columns:
+            raise ValidationError(f"Cannot sort by {sort_by}")
+        return keyset_paginate(
+            query, getattr(Project, sort_by), Project.id, per_page,
+            cursor=cursor, descending=sort_order == 'desc', with_total=with_total
+        )
+
     # Apply sorting
     if hasattr(Project, sort_by):
         order = desc(getattr(Project, sort_by)) if sort_order == 'desc' else getattr(Project, sort_by)
@@ -192,6 +211,7 @@ def activate_project(project_id: int) -> Project:
         
         project.status = ProjectStatus.ACTIVE
         db.session.commit()
+        search_index.index_project(project)
         logger.info(f"Activated project: {project_id}")
         return project
     except (ValidationError, ProjectNotFoundError) as e:
@@ -0,0 +1,241 @@
+# app/services/revocation_cache.py
+
+import os
+import threading
+from datetime import datetime, timezone
+import logging
+from flask import current_app
+from redis.exceptions import RedisError
+from app import db, cache
+from app.models import TokenBlocklist
+from app.utils.background import PeriodicWorker
+from app.utils.bloom_filter import BloomFilter
+from app.utils.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = 'jwt:revoked:by_exp'  # zset of JTI -> token exp (unix seconds)
+REVOCATION_CHANNEL = 'jwt:revocations'
+PRUNE_LOCK_KEY = 'token_blocklist:pruning'
+
+
+def _timestamp(value):
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationCache:
+    """
+    Two-tier lookup for revoked JWTs.
+
+    Tier one is an in-process Bloom filter of revoked JTIs loaded from a
+    Redis sorted set scored by each token's expiry. A JTI the filter has
+    never seen is accepted without touching the database; only filter
+    positives go to the token_blocklist table (tier two). Revocations are
+    added to the sorted set and published on a channel that every worker's
+    listener thread applies to its filter. The filter is rebuilt
+    every JWT_REVOCATION_RESYNC_INTERVAL seconds from the entries that have
+    not expired yet, after reconciling the sorted set against
+    token_blocklist so a failed publish is repaired. Expired token_blocklist
+    rows are deleted in batches every TOKEN_BLOCKLIST_PRUNE_INTERVAL seconds.
+
+    The filter is only trusted while the listener is subscribed; without
+    Redis every lookup goes to the database, unless
+    JWT_REVOCATION_LOCAL_ONLY is set for single-process deployments.
+    """
+
+    def __init__(self):
+        self._filter = BloomFilter(1000)
+        self._lock = threading.Lock()
+        self._trusted = False
+        self._listener = None
+        self._listener_pid = None
+        self._stop = threading.Event()
+        self._resync = PeriodicWorker('jwt-revocation-resync', 300, self.resync)
+        self._prune = PeriodicWorker('token-blocklist-prune', 3600, self._scheduled_prune)
+
+    def ensure_started(self):
+        app = current_app._get_current_object()
+        self._prune.interval = app.config.get('TOKEN_BLOCKLIST_PRUNE_INTERVAL', 3600)
+        self._prune.ensure_started(app)
+        if app.config.get('JWT_REVOCATION_LOCAL_ONLY', False):
+            if not self._trusted:
+                self._rebuild(self._database_jtis())
+                self._trusted = True
+            return
+
+        self._resync.interval = app.config.get('JWT_REVOCATION_RESYNC_INTERVAL', 300)
+        self._resync.ensure_started(app)
+        if self._listener_pid == os.getpid() and self._listener and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid() and self._listener and self._listener.is_alive():
+                return
+            self._trusted = False
+            self._stop = threading.Event()
+            self._listener_pid = os.getpid()
+            self._listener = threading.Thread(
+                target=self._listen, args=(app, self._stop), name='jwt-revocation-listener', daemon=True
+            )
+            self._listener.start()
+
+    def is_revoked(self, jti):
+        self.ensure_started()
+        if self._trusted and jti not in self._filter:
+            return False
+        return db.session.query(TokenBlocklist.id).filter_by(jti=jti).scalar() is not None
+
+    def revoke(self, jti, expires_at):
+        """Add a JTI stored in token_blocklist to every worker's filter until `expires_at`."""
+        with self._lock:
+            self._filter.add(jti)
+        redis_client = redis_manager.client()
+        if redis_client is None:
+            return
+        try:
+            pipe = redis_client.pipeline()
+            pipe.zadd(REVOKED_KEY, {jti: _timestamp(expires_at)})
+            pipe.publish(REVOCATION_CHANNEL, jti)
+            pipe.execute()
+        except RedisError as e:
+            # The token_blocklist row is committed; the next resync of any
+            # worker restores it in Redis and every filter picks it up
+            redis_manager.report_error(e)
+            logger.error(f"Could not publish revocation of {jti}: {str(e)}")
+
+    def resync(self):
+        """Rebuild the filter without expired tokens, dropping false-positive drift."""
+        if current_app.config.get('JWT_REVOCATION_LOCAL_ONLY', False):
+            self._rebuild(self._database_jtis())
+            return
+        redis_client = redis_manager.client()
+        if redis_client is None:
+            return
+        try:
+            self._rebuild(self._redis_jtis(redis_client))
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.error(f"Could not resync the revocation filter: {str(e)}")
+
+    def prune_expired(self, batch_size=None, max_batches=None):
+        """
+        Delete token_blocklist rows and Redis entries for tokens that have expired.
+
+        Rows are deleted `batch_size` at a time, each batch in its own
+        transaction, so the table is never locked for long.
+
+        Returns:
+            int: The number of rows deleted
+        """
+        batch_size = batch_size or current_app.config.get('TOKEN_BLOCKLIST_PRUNE_BATCH_SIZE', 1000)
+        now = datetime.utcnow()
+        pruned = batches = 0
+        while max_batches is None or batches < max_batches:
+            ids = [row_id for (row_id,) in db.session.query(TokenBlocklist.id)
+                   .filter(TokenBlocklist.expires_at <= now)
+                   .order_by(TokenBlocklist.expires_at)
+                   .limit(batch_size)]
+            if not ids:
+                break
+            db.session.query(TokenBlocklist).filter(TokenBlocklist.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            pruned += len(ids)
+            batches += 1
+            if len(ids) < batch_size:
+                break
+
+        redis_client = redis_manager.client()
+        if redis_client is not None:
+            try:
+                redis_client.zremrangebyscore(REVOKED_KEY, '-inf', _timestamp(now))
+            except RedisError as e:
+                redis_manager.report_error(e)
+                logger.error(f"Could not prune expired revocations from Redis: {str(e)}")
+        return pruned
+
+    def _scheduled_prune(self):
+        # One worker prunes per interval; the others skip
+        interval = current_app.config.get('TOKEN_BLOCKLIST_PRUNE_INTERVAL', 3600)
+        if not cache.add(PRUNE_LOCK_KEY, 1, timeout=max(interval // 2, 1)):
+            return
+        pruned = self.prune_expired()
+        if pruned:
+            logger.info(f"Pruned {pruned} expired token_blocklist rows")
+
+    def _rebuild(self, jtis):
+        jtis = list(jtis)
+        capacity = max(current_app.config.get('JWT_REVOCATION_BLOOM_CAPACITY', 100000), 2 * len(jtis))
+        # Hold the lock so a revocation arriving mid-rebuild lands in the new filter
+        with self._lock:
+            new_filter = BloomFilter(capacity)
+            for jti in jtis:
+                new_filter.add(jti)
+            self._filter = new_filter
+        logger.info(f"Loaded {len(jtis)} revoked JWTs into the revocation filter")
+
+    def _unexpired_rows(self):
+        return db.session.query(TokenBlocklist.jti, TokenBlocklist.expires_at).filter(
+            TokenBlocklist.expires_at > datetime.utcnow()
+        )
+
+    def _database_jtis(self):
+        return [jti for jti, _ in self._unexpired_rows()]
+
+    def _redis_jtis(self, redis_client):
+        """
+        The unexpired revoked JTIs, with the sorted set reconciled against token_blocklist.
+
+        token_blocklist is the source of truth: rows missing from Redis (a fresh
+        Redis, or a revocation whose ZADD/PUBLISH failed) are added back, so
+        every worker picks them up on its next resync.
+        """
+        now = _timestamp(datetime.utcnow())
+        redis_client.zremrangebyscore(REVOKED_KEY, '-inf', now)
+        in_redis = {jti for jti, _ in redis_client.zscan_iter(REVOKED_KEY, count=1000)}
+        missing = [(jti, _timestamp(expires_at)) for jti, expires_at in self._unexpired_rows()
+                   if jti not in in_redis]
+        if missing:
+            pipe = redis_client.pipeline()
+            for start in range(0, len(missing), 1000):
+                pipe.zadd(REVOKED_KEY, dict(missing[start:start + 1000]))
+            pipe.execute()
+            logger.warning(f"Restored {len(missing)} revocations missing from Redis")
+        return in_redis.union(jti for jti, _ in missing)
+
+    def _listen(self, app, stop):
+        retry_interval = app.config.get('REDIS_RETRY_INTERVAL', 5)
+        while not stop.is_set():
+            redis_client = redis_manager.client()
+            if redis_client is None:
+                self._trusted = False
+                stop.wait(retry_interval)
+                continue
+
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribe before loading so nothing published in between is missed
+                pubsub.subscribe(REVOCATION_CHANNEL)
+                with app.app_context():
+                    self._rebuild(self._redis_jtis(redis_client))
+                self._trusted = True
+                while not stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message['type'] == 'message':
+                        with self._lock:
+                            self._filter.add(message['data'])
+            except Exception as e:
+                self._trusted = False
+                if isinstance(e, RedisError):
+                    redis_manager.report_error(e)
+                logger.warning(f"Revocation listener disconnected, using the database: {str(e)}")
+                stop.wait(retry_interval)
+            finally:
+                self._trusted = False
+                pubsub.close()
+
+    def stop(self):
+        self._stop.set()
+        self._resync.stop()
+        self._prune.stop()
+
+
+revocation_cache = RevocationCache()
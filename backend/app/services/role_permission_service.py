@@ -1,11 +1,27 @@
 # app/services/role_permission_service.py
 
+from datetime import datetime, timedelta
 from app.models import User, Role, Permission
 from app import db
+from app.services.permission_version_cache import permission_versions
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _next_permission_version(previous):
+    """
+    A whole-second last_permission_update later than `previous`.
+
+    MySQL DATETIME drops microseconds, and the cached version must equal
+    the value later logins read back into their tokens. Moving at least one
+    second past `previous` still invalidates tokens issued earlier in the
+    same second.
+    """
+    version = datetime.utcnow().replace(microsecond=0)
+    if previous is not None and version <= previous:
+        version = previous.replace(microsecond=0) + timedelta(seconds=1)
+    return version
+
 class RolePermissionService:
     @staticmethod
     def assign_roles_to_user(user_id, role_names):
@@ -22,7 +38,9 @@ class RolePermissionService:
                 if role not in user.roles:
                     user.roles.append(role)
 
+            user.last_permission_update = _next_permission_version(user.last_permission_update)
             db.session.commit()
+            permission_versions.bump(user.id, user.last_permission_update)
             logger.info(f"Assigned roles {role_names} to user {user.username}")
             return {"success": True, "message": "Roles assigned successfully"}
 
@@ -51,7 +69,9 @@ class RolePermissionService:
             if not roles_removed:
                 raise ValueError("None of the specified roles were assigned to the user")
 
+            user.last_permission_update = _next_permission_version(user.last_permission_update)
             db.session.commit()
+            permission_versions.bump(user.id, user.last_permission_update)
             logger.info(f"Revoked roles {role_names} from user {user.username}")
             return {"success": True, "message": "Roles revoked successfully"}
 
@@ -0,0 +1,350 @@
+# app/services/search_index.py
+
+import re
+import heapq
+import time
+import threading
+import logging
+from bisect import bisect_left, insort
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import select
+from redis.exceptions import RedisError
+from app import db
+from app.models.project import Project
+from app.models.tag import Tag, project_tags
+from app.models.enums import ProjectStatus
+from app.utils.background import PeriodicWorker
+from app.utils.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Relevance weights per field
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+CHANGES_KEY = 'search_index:changes'
+GENERATION_KEY = 'search_index:generation'
+# Changes older than this are trimmed; a worker that falls further behind rebuilds
+CHANGES_RETENTION = 3600
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return TOKEN_RE.findall((text or '').lower())
+
+
+class ProjectSearchIndex:
+    """
+    In-process inverted index over active projects.
+
+    Maps each token of a project's title, description and tags to the ids of
+    the projects containing it and a per-field relevance weight; each project
+    only keeps its token list, category and creation date. A sorted
+    vocabulary lets a query term match every token it prefixes, like the
+    ILIKE search did.
+
+    Each process keeps its own copy. Changes made through `index_project` and
+    `remove_project` apply locally at once and are published to Redis, and
+    the other processes pick them up on their next sync. A full rebuild
+    happens on start, every SEARCH_INDEX_REBUILD_INTERVAL seconds, and when
+    the generation in Redis is bumped by `flask rebuild-search-index`.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._vocabulary = []
+        self._documents = {}
+        self._ready = False
+        self._pending = None
+        self._built_at = 0
+        self._generation = None
+        self._synced_at = 0
+        self._worker = PeriodicWorker('search-index-sync', 5, self.sync, run_immediately=True)
+
+    @property
+    def ready(self):
+        return self._ready
+
+    def enabled(self):
+        return current_app.config.get('SEARCH_INDEX_ENABLED', False)
+
+    def ensure_started(self):
+        """Start the background build and sync in this process if enabled."""
+        if not self.enabled():
+            return False
+        app = current_app._get_current_object()
+        self._worker.interval = app.config.get('SEARCH_INDEX_SYNC_INTERVAL', 5)
+        self._worker.ensure_started(app)
+        return True
+
+    def __len__(self):
+        return len(self._documents)
+
+    # Building
+
+    def rebuild(self):
+        """
+        Rebuild the whole index from the database.
+
+        Returns:
+            int: Number of indexed projects
+        """
+        started = time.time()
+        generation = self._read_generation()
+        with self._lock:
+            self._pending = {}
+
+        try:
+            postings, vocabulary, documents = self._build(self._load_rows())
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._postings, self._vocabulary, self._documents = postings, vocabulary, documents
+            # Replay changes that landed while the rows were being read
+            for project_id, document in pending.items():
+                self._remove(project_id)
+                if document is not None:
+                    self._add(project_id, document)
+            self._ready = True
+            self._built_at = time.time()
+            self._synced_at = started
+            self._generation = generation
+
+        logger.info(
+            f"Built search index: {len(documents)} projects, {len(vocabulary)} tokens "
+            f"in {time.time() - started:.2f}s"
+        )
+        return len(documents)
+
+    def build_from_rows(self, rows):
+        """Replace the index with one built from (id, title, description, category_id, created_at, tags) rows."""
+        postings, vocabulary, documents = self._build(rows)
+        with self._lock:
+            self._postings, self._vocabulary, self._documents = postings, vocabulary, documents
+            self._ready = True
+            self._built_at = time.time()
+        return len(documents)
+
+    def _build(self, rows):
+        postings = defaultdict(dict)
+        documents = {}
+        for project_id, title, description, category_id, created_at, tags in rows:
+            weights, category_id, created_at = self._document(title, description, tags, category_id, created_at)
+            documents[project_id] = (tuple(weights), category_id, created_at)
+            for token, weight in weights.items():
+                postings[token][project_id] = weight
+        return dict(postings), sorted(postings), documents
+
+    def _load_rows(self):
+        """Stream the searchable columns of all active projects, with their tag names."""
+        tags_by_project = defaultdict(list)
+        tag_rows = db.session.execute(
+            select(project_tags.c.project_id, Tag.name)
+            .join(Tag, Tag.id == project_tags.c.tag_id)
+            .join(Project, Project.id == project_tags.c.project_id)
+            .where(Project.status == ProjectStatus.ACTIVE, Project.is_deleted.is_(False))
+        )
+        for project_id, name in tag_rows:
+            tags_by_project[project_id].append(name)
+
+        result = db.session.execute(
+            select(Project.id, Project.title, Project.description, Project.category_id, Project.created_at)
+            .where(Project.status == ProjectStatus.ACTIVE, Project.is_deleted.is_(False))
+            .execution_options(yield_per=5000)
+        )
+        for project_id, title, description, category_id, created_at in result:
+            yield project_id, title, description, category_id, created_at, tags_by_project.get(project_id, ())
+
+    @staticmethod
+    def _document(title, description, tags, category_id, created_at):
+        """Return (token weights, category_id, created_at) for one project."""
+        weights = defaultdict(int)
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for tag in tags:
+            for token in tokenize(tag):
+                weights[token] += TAG_WEIGHT
+        for token in tokenize(description):
+            weights[token] += DESCRIPTION_WEIGHT
+        return dict(weights), category_id, created_at
+
+    @classmethod
+    def _project_document(cls, project):
+        return cls._document(
+            project.title, project.description, [tag.name for tag in project.tags],
+            project.category_id, project.created_at
+        )
+
+    # Incremental updates
+
+    def index_project(self, project):
+        """Add, update or drop a project depending on whether it is searchable."""
+        if not self.enabled():
+            return
+        if project.status != ProjectStatus.ACTIVE or project.is_deleted:
+            self.remove_project(project.id)
+            return
+
+        document = self._project_document(project)
+        with self._lock:
+            self._remove(project.id)
+            self._add(project.id, document)
+            if self._pending is not None:
+                self._pending[project.id] = document
+        self._publish(project.id)
+
+    def remove_project(self, project_id):
+        if not self.enabled():
+            return
+        with self._lock:
+            self._remove(project_id)
+            if self._pending is not None:
+                self._pending[project_id] = None
+        self._publish(project_id)
+
+    def _add(self, project_id, document):
+        weights, category_id, created_at = document
+        self._documents[project_id] = (tuple(weights), category_id, created_at)
+        for token, weight in weights.items():
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            ids[project_id] = weight
+
+    def _remove(self, project_id):
+        document = self._documents.pop(project_id, None)
+        if document is None:
+            return
+        for token in document[0]:
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.pop(project_id, None)
+            if not ids:
+                del self._postings[token]
+                i = bisect_left(self._vocabulary, token)
+                if i < len(self._vocabulary) and self._vocabulary[i] == token:
+                    del self._vocabulary[i]
+
+    # Cross-process sync
+
+    def _redis(self):
+        return redis_manager.client()
+
+    def _publish(self, project_id):
+        redis_client = self._redis()
+        if redis_client is None:
+            return
+        try:
+            now = time.time()
+            pipe = redis_client.pipeline()
+            pipe.zadd(CHANGES_KEY, {project_id: now})
+            pipe.zremrangebyscore(CHANGES_KEY, 0, now - CHANGES_RETENTION)
+            pipe.execute()
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.warning(f"Could not publish search index change for project {project_id}: {str(e)}")
+
+    def _read_generation(self):
+        redis_client = self._redis()
+        if redis_client is None:
+            return None
+        try:
+            return redis_client.get(GENERATION_KEY)
+        except RedisError as e:
+            redis_manager.report_error(e)
+            return None
+
+    def bump_generation(self):
+        """Ask every process to rebuild its index on its next sync."""
+        redis_client = self._redis()
+        if redis_client is None:
+            return False
+        try:
+            redis_client.incr(GENERATION_KEY)
+            return True
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.warning(f"Could not bump search index generation: {str(e)}")
+            return False
+
+    def sync(self):
+        """Rebuild when due, otherwise re-index projects changed by other processes."""
+        rebuild_interval = current_app.config.get('SEARCH_INDEX_REBUILD_INTERVAL', 3600)
+        if (not self._ready
+                or time.time() - self._built_at > rebuild_interval
+                or time.time() - self._synced_at > CHANGES_RETENTION
+                or self._read_generation() != self._generation):
+            self.rebuild()
+            return
+
+        redis_client = self._redis()
+        if redis_client is None:
+            return
+        started = time.time()
+        try:
+            changed = redis_client.zrangebyscore(CHANGES_KEY, self._synced_at, '+inf')
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.warning(f"Could not read search index changes: {str(e)}")
+            return
+
+        project_ids = [int(project_id) for project_id in changed]
+        if project_ids:
+            projects = {
+                project.id: project
+                for project in Project.query.filter(Project.id.in_(project_ids)).all()
+            }
+            with self._lock:
+                for project_id in project_ids:
+                    project = projects.get(project_id)
+                    self._remove(project_id)
+                    if project is not None and project.status == ProjectStatus.ACTIVE and not project.is_deleted:
+                        self._add(project_id, self._project_document(project))
+        self._synced_at = started
+
+    # Queries
+
+    def search(self, query, category_id=None, page=1, per_page=10):
+        """
+        Rank indexed projects against a query.
+
+        Returns:
+            tuple: (project ids on the requested page, total number of matches)
+        """
+        category_id = int(category_id) if category_id else None
+        scores = defaultdict(int)
+        with self._lock:
+            for term in tokenize(query):
+                i = bisect_left(self._vocabulary, term)
+                while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+                    for project_id, weight in self._postings[self._vocabulary[i]].items():
+                        scores[project_id] += weight
+                    i += 1
+
+            documents = self._documents
+            if category_id is not None:
+                scores = {
+                    project_id: score for project_id, score in scores.items()
+                    if documents[project_id][1] == category_id
+                }
+            # Only the requested page and the ones before it need ordering
+            top = heapq.nlargest(
+                page * per_page, scores.items(),
+                key=lambda item: (item[1], documents[item[0]][2])
+            )
+
+        return [project_id for project_id, _ in top[(page - 1) * per_page:]], len(scores)
+
+
+search_index = ProjectSearchIndex()
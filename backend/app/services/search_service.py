@@ -0,0 +1,93 @@
+# app/services/search_service.py
+
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import match
+from app import db
+from app.models.project import Project
+from app.models.enums import ProjectStatus
+from app.services.search_index import search_index, tokenize, TITLE_WEIGHT, DESCRIPTION_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+
+def search_projects(query: str, category_id: Optional[int] = None,
+                    page: int = 1, per_page: int = 10) -> Tuple[List[Project], int]:
+    """
+    Search active projects by title and description, most relevant first.
+
+    When SEARCH_INDEX_ENABLED is set and the in-process index has been
+    built, it answers the query and only the page of projects is loaded.
+    Otherwise MySQL uses the FULLTEXT index on (title, description), and
+    other databases (SQLite in tests and local development) use a ranked
+    fallback in Python over the rows that contain at least one query term.
+
+    Returns:
+        tuple: (projects on the requested page, total number of matches)
+    """
+    base = Project.query.filter(Project.status == ProjectStatus.ACTIVE, Project.is_deleted.is_(False))
+    if category_id:
+        base = base.filter(Project.category_id == category_id)
+
+    terms = tokenize(query)
+    if terms and search_index.ensure_started() and search_index.ready:
+        project_ids, total = search_index.search(query, category_id=category_id, page=page, per_page=per_page)
+        # The index lags commits: re-check status and deletion on the rows themselves
+        return _load_in_order(base, project_ids), total
+
+    if not terms:
+        page_obj = base.order_by(Project.created_at.desc()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        return page_obj.items, page_obj.total
+
+    if db.engine.dialect.name == 'mysql':
+        return _search_fulltext(base, query, page, per_page)
+    return _search_fallback(base, terms, page, per_page)
+
+
+def _search_fulltext(base, query, page, per_page):
+    score = match(Project.title, Project.description, against=query)
+    matches = base.filter(score > 0)
+
+    total = matches.order_by(None).count()
+    projects = matches.order_by(score.desc(), Project.created_at.desc())\
+        .offset((page - 1) * per_page)\
+        .limit(per_page)\
+        .all()
+    return projects, total
+
+
+def _search_fallback(base, terms, page, per_page):
+    candidates = base.filter(or_(*[
+        or_(Project.title.ilike(f'%{term}%'), Project.description.ilike(f'%{term}%'))
+        for term in terms
+    ])).with_entities(Project.id, Project.title, Project.description, Project.created_at)
+
+    ranked = []
+    for project_id, title, description, created_at in candidates:
+        score = _score(terms, tokenize(title), tokenize(description))
+        if score:
+            ranked.append((score, created_at, project_id))
+    ranked.sort(key=lambda r: (r[0], r[1]), reverse=True)
+
+    page_ids = [project_id for _, _, project_id in ranked[(page - 1) * per_page:page * per_page]]
+    return _load_in_order(base, page_ids), len(ranked)
+
+
+def _score(terms, title_tokens, description_tokens):
+    """Weighted count of tokens starting with a query term."""
+    score = 0
+    for term in terms:
+        score += TITLE_WEIGHT * sum(1 for token in title_tokens if token.startswith(term))
+        score += DESCRIPTION_WEIGHT * sum(1 for token in description_tokens if token.startswith(term))
+    return score
+
+
+def _load_in_order(base, project_ids):
+    if not project_ids:
+        return []
+    projects = base.filter(Project.id.in_(project_ids)).all()
+    by_id = {project.id: project for project in projects}
+    return [by_id[project_id] for project_id in project_ids if project_id in by_id]
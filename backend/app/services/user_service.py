@@ -1,6 +1,7 @@
 import logging
 from typing import Tuple, Optional, Dict, Any
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import undefer_group
 from app.models import User
 from app import db
 from werkzeug.datastructures import FileStorage
@@ -126,7 +127,7 @@ class UserService:
             Dictionary of public profile data if found, None otherwise
         """
         try:
-            user = User.query.filter_by(id=user_id).first()
+            user = User.query.options(undefer_group('stats')).filter_by(id=user_id).first()
             if not user:
                 logger.warning(f"Public profile not found for user ID {user_id}")
                 return None
@@ -147,7 +148,7 @@ class UserService:
             Dictionary of private profile data if found, None otherwise
         """
         try:
-            user = User.query.filter_by(id=user_id).first()
+            user = User.query.options(undefer_group('stats')).filter_by(id=user_id).first()
             if not user:
                 logger.warning(f"Private profile not found for user ID {user_id}")
                 return None
@@ -0,0 +1,201 @@
+# app/services/view_counter_service.py
+
+import threading
+import time
+import uuid
+import logging
+from collections import Counter
+from flask import current_app
+from sqlalchemy import update, case, func
+from redis.exceptions import RedisError, ResponseError
+from app import db
+from app.models.project import Project
+from app.utils.background import PeriodicWorker
+from app.utils.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+PENDING_VIEWS_KEY = 'project_views:pending'
+FLUSHING_KEY_PREFIX = 'project_views:flushing:'
+
+
+class ViewCounterService:
+    """
+    Buffers project view increments outside the request path.
+
+    Views are counted in a Redis hash when Redis is available, or in an
+    in-process counter otherwise, and written to the projects table in bulk
+    by a periodic flusher.
+
+    A flush renames the pending hash to a `project_views:flushing:<time>:<id>`
+    key and deletes that key once the counts are written. A flushing key left
+    behind by a flusher that failed or died is claimed by the next flush once
+    it is older than VIEW_COUNT_ORPHAN_AGE seconds. Counts whose write
+    succeeded but whose key could not be deleted may be counted twice if the
+    process dies before it retries the delete; they are never dropped.
+    """
+
+    def __init__(self):
+        self._local_counts = Counter()
+        self._applied_keys = []
+        self._lock = threading.Lock()
+        self._flusher = PeriodicWorker('view-count-flusher', 30, self.flush)
+
+    def record_view(self, project_id):
+        """Count one view of a project without touching the database."""
+        app = current_app._get_current_object()
+        self._flusher.interval = app.config.get('VIEW_COUNT_FLUSH_INTERVAL', 30)
+        self._flusher.ensure_started(app)
+
+        redis_client = redis_manager.client()
+        if redis_client is not None:
+            try:
+                redis_client.hincrby(PENDING_VIEWS_KEY, project_id, 1)
+                return
+            except RedisError as e:
+                redis_manager.report_error(e)
+                logger.warning(f"Redis unavailable for view counting, buffering locally: {str(e)}")
+
+        with self._lock:
+            self._local_counts[project_id] += 1
+
+    def flush(self):
+        """
+        Write all buffered view counts to the projects table.
+
+        Returns:
+            int: Number of views written
+        """
+        counts = self._drain_local()
+        redis_counts, flushing_keys = self._drain_redis()
+        counts.update(redis_counts)
+
+        if not counts:
+            return 0
+
+        try:
+            self._apply(counts)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to flush view counts, re-buffering: {str(e)}")
+            with self._lock:
+                self._local_counts.update(counts)
+            self._discard(flushing_keys)
+            return 0
+
+        self._discard(flushing_keys)
+
+        total = sum(counts.values())
+        logger.info(f"Flushed {total} views for {len(counts)} projects")
+        return total
+
+    def _drain_local(self):
+        with self._lock:
+            counts, self._local_counts = self._local_counts, Counter()
+        return counts
+
+    def _discard(self, flushing_keys):
+        if not flushing_keys:
+            return
+        redis_client = self._redis()
+        try:
+            if redis_client is None:
+                raise RedisError("Redis is unavailable")
+            redis_client.delete(*flushing_keys)
+        except RedisError as e:
+            # Retried before the next drain, so the keys are not claimed as orphans
+            logger.warning(f"Could not delete drained view counts {flushing_keys}: {str(e)}")
+            with self._lock:
+                self._applied_keys.extend(flushing_keys)
+
+    def _redis(self):
+        return redis_manager.client()
+
+    def _drain_redis(self):
+        """
+        Atomically take the pending Redis hash so new views go to a fresh one,
+        together with any orphaned flushing keys.
+
+        Returns:
+            tuple: (counts, flushing keys to delete once the counts are written)
+        """
+        redis_client = self._redis()
+        if redis_client is None:
+            return Counter(), []
+
+        keys = []
+        try:
+            self._delete_applied(redis_client)
+            keys.extend(self._claim_orphans(redis_client))
+            flushing_key = self._flushing_key()
+            try:
+                redis_client.rename(PENDING_VIEWS_KEY, flushing_key)
+                keys.append(flushing_key)
+            except ResponseError:
+                # Nothing buffered since the last flush
+                pass
+            counts = Counter()
+            for key in keys:
+                counts.update({int(project_id): int(count)
+                               for project_id, count in redis_client.hgetall(key).items()})
+        except RedisError as e:
+            # Keys renamed so far stay in Redis and are claimed once they are stale
+            redis_manager.report_error(e)
+            logger.warning(f"Could not drain Redis view counts: {str(e)}")
+            return Counter(), []
+        return counts, keys
+
+    def _delete_applied(self, redis_client):
+        with self._lock:
+            applied, self._applied_keys = self._applied_keys, []
+        if not applied:
+            return
+        try:
+            redis_client.delete(*applied)
+        except RedisError:
+            with self._lock:
+                self._applied_keys.extend(applied)
+            raise
+
+    def _claim_orphans(self, redis_client):
+        """Rename flushing keys older than VIEW_COUNT_ORPHAN_AGE to keys of this flush."""
+        cutoff = time.time() - current_app.config.get('VIEW_COUNT_ORPHAN_AGE', 600)
+        claimed = []
+        for key in redis_client.scan_iter(match=f'{FLUSHING_KEY_PREFIX}*', count=100):
+            try:
+                created = int(key[len(FLUSHING_KEY_PREFIX):].split(':', 1)[0])
+            except ValueError:
+                created = 0
+            if created > cutoff:
+                continue
+            new_key = self._flushing_key()
+            try:
+                redis_client.rename(key, new_key)
+            except ResponseError:
+                # Claimed by another flusher first
+                continue
+            claimed.append(new_key)
+        if claimed:
+            logger.warning(f"Recovered {len(claimed)} orphaned view count buffers")
+        return claimed
+
+    @staticmethod
+    def _flushing_key():
+        return f"{FLUSHING_KEY_PREFIX}{int(time.time())}:{uuid.uuid4().hex}"
+
+    def _apply(self, counts):
+        batch_size = current_app.config.get('VIEW_COUNT_FLUSH_BATCH_SIZE', 500)
+        items = list(counts.items())
+
+        for start in range(0, len(items), batch_size):
+            batch = dict(items[start:start + batch_size])
+            db.session.execute(
+                update(Project)
+                .where(Project.id.in_(batch.keys()))
+                .values(view_count=func.coalesce(Project.view_count, 0) + case(batch, value=Project.id, else_=0))
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+
+
+view_counter = ViewCounterService()
@@ -0,0 +1,71 @@
+# app/utils/background.py
+
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """
+    Runs a function every `interval` seconds in a daemon thread inside an
+    application context.
+
+    The thread is started lazily from `ensure_started()`, and restarted when
+    the process id changes, so workers forked by gunicorn after the app was
+    created each get their own thread. With `run_immediately` the first run
+    happens as soon as the thread starts instead of after one interval.
+    `wake()` triggers a run now instead of at the end of the interval.
+    """
+
+    def __init__(self, name, interval, func, run_immediately=False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_immediately = run_immediately
+        self._app = None
+        self._pid = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure_started(self, app):
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._app = app
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            self._wake = threading.Event()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            logger.info(f"Started background worker {self.name} (every {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        stop = self._stop
+        if self.run_immediately:
+            self._run_once()
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if stop.is_set():
+                return
+            self._run_once()
+
+    def _run_once(self):
+        try:
+            with self._app.app_context():
+                self.func()
+        except Exception as e:
+            logger.error(f"Background worker {self.name} failed: {str(e)}")
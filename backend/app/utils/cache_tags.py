@@ -0,0 +1,82 @@
+# app/utils/cache_tags.py
+
+import uuid
+import logging
+from functools import wraps
+from flask import has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import cache
+
+logger = logging.getLogger(__name__)
+
+
+def project_tag(project_id):
+    return f'project:{project_id}'
+
+
+def tag_version(tag):
+    """
+    Current version of a cache tag.
+
+    Tagged entries embed the version in their key, so bumping it orphans
+    every entry under the tag at once; they then expire on their own. The
+    version lives in the shared cache, so all workers see the bump.
+    """
+    key = f'cache_tag:{tag}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex[:12], timeout=0)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_tag(tag):
+    cache.set(f'cache_tag:{tag}', uuid.uuid4().hex[:12], timeout=0)
+
+
+def invalidate_project(project_id):
+    """Drop every cached view derived from a project's donations and payouts."""
+    invalidate_tag(project_tag(project_id))
+    logger.debug(f"Invalidated cached views for project {project_id}")
+
+
+def cached_per_project(key_prefix, timeout=300):
+    """
+    Cache a method taking (self, project_id) under the project's tag.
+
+    Results carrying an 'error' key are not cached.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(self, project_id):
+            key = f'{key_prefix}:{project_id}:{tag_version(project_tag(project_id))}'
+            result = cache.get(key)
+            if result is None:
+                result = f(self, project_id)
+                if not (isinstance(result, dict) and 'error' in result):
+                    cache.set(key, result, timeout=timeout)
+            return result
+        return decorated_function
+    return decorator
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_projects(session):
+    # Filled by the project_stats flush hook for every Donation/Payout change
+    project_ids = session.info.pop('changed_projects', None)
+    if not project_ids or not has_app_context():
+        return
+    for project_id in project_ids:
+        try:
+            invalidate_project(project_id)
+        except Exception as e:
+            logger.error(f"Could not invalidate cached views for project {project_id}: {str(e)}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_changed_projects(session, previous_transaction):
+    if previous_transaction.nested:
+        # A savepoint rolled back; the outer transaction may still commit
+        return
+    session.info.pop('changed_projects', None)
@@ -3,8 +3,9 @@
 from functools import wraps
 from flask_jwt_extended import get_jwt_identity
 from app.services.role_permission_service import RolePermissionService
+from app.services.permission_version_cache import permission_versions
+from app.services.permission_registry import permission_registry
 from app.utils.response import api_response, error_response, success_response
-from app.models.user import User
 from app import db
 from flask_jwt_extended import get_jwt
 import time
@@ -14,7 +15,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def permission_required(permission):
+def permission_required(*permissions):
+    """Allow the request if the token grants any of `permissions`."""
+    permission = ' or '.join(permissions)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -25,23 +29,27 @@ def permission_required(permission):
             user_permissions = jwt_claims.get("permissions", [])
             last_permission_update = jwt_claims.get("last_permission_update")
 
-            user = User.query.get(current_user_id)
-            if not user:
+            permission_version = permission_versions.get(current_user_id)
+            if permission_version is None:
                 logger.error(f"User {current_user_id} not found.")
                 return error_response(message="User not found", status_code=404)
 
             # Check if permissions are outdated
-            if user.last_permission_update and last_permission_update:
-                if user.last_permission_update.timestamp() > last_permission_update:
+            if permission_version and last_permission_update:
+                if permission_version > last_permission_update:
                     logger.warning(f"User {current_user_id}'s permissions are outdated. Requesting re-login.")
                     return error_response(message="Your permissions have been updated. Please log in again.", status_code=401)
-            elif user.last_permission_update and not last_permission_update:
+            elif permission_version and not last_permission_update:
                 logger.warning(f"Missing last_permission_update in JWT for user {current_user_id}. Requesting re-login.")
                 return error_response(message="Your session is invalid. Please log in again.", status_code=401)
 
+            if not permission_registry.token_is_current(jwt_claims):
+                logger.warning(f"User {current_user_id}'s permission bits predate a permissions change. Requesting re-login.")
+                return error_response(message="Your permissions have been updated. Please log in again.", status_code=401)
+
             logger.debug(f"User {current_user_id} permissions from JWT: {user_permissions}")
             
-            if permission not in user_permissions:
+            if not any(permission_registry.token_has_permission(jwt_claims, p) for p in permissions):
                 logger.warning(f"User {current_user_id} attempted to access {permission} without the required permission.")
                 return error_response(message="You don't have permission to perform this action", status_code=403)
     
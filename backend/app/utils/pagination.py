@@ -0,0 +1,121 @@
+# app/utils/pagination.py
+
+import base64
+import json
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, List, Optional
+from sqlalchemy import and_, or_
+from app.utils.exceptions import ValidationError
+
+
+class KeysetPage:
+    """One page of a keyset-paginated query."""
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str], total: Optional[int] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.has_more = next_cursor is not None
+        self.total = total
+
+    def meta(self, per_page: int) -> dict:
+        return {
+            'per_page': per_page,
+            'next_cursor': self.next_cursor,
+            'has_more': self.has_more,
+            'total': self.total
+        }
+
+
+def cursor_requested(args) -> bool:
+    """Cursor mode is opted into with ?cursor= (empty for the first page)."""
+    return 'cursor' in args
+
+
+def total_requested(args) -> bool:
+    """Counting every match is optional in cursor mode; ask with ?include_total=true."""
+    return args.get('include_total', 'false').lower() == 'true'
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+    return value
+
+
+def encode_cursor(sort_key: str, sort_value: Any, last_id: int) -> str:
+    payload = json.dumps({'k': sort_key, 'v': _encode_value(sort_value), 'id': last_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_key: str):
+    """
+    Returns:
+        tuple: (sort value, id) of the last row of the previous page
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = _decode_value(payload['v']), int(payload['id'])
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
+    if payload.get('k') != sort_key:
+        raise ValidationError("Pagination cursor does not match the requested sort order")
+    return value, last_id
+
+
+def keyset_paginate(query, sort_column, id_column, per_page: int, cursor: Optional[str] = None,
+                    descending: bool = True, with_total: bool = False) -> KeysetPage:
+    """
+    Paginate `query` by (sort_column, id_column) instead of OFFSET.
+
+    Each page starts strictly after the last row of the previous one, so the
+    cost does not grow with page depth. The cursor is opaque to clients and
+    tied to the sort column it was issued for. The total is only counted
+    when `with_total` is set.
+    """
+    sort_key = sort_column.key
+    if sort_column is not id_column and getattr(sort_column.expression, 'nullable', False):
+        raise ValidationError(f"Cursor pagination is not supported when sorting by {sort_key}")
+
+    total = query.order_by(None).count() if with_total else None
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_key)
+        if sort_column is id_column:
+            query = query.filter(id_column < last_id if descending else id_column > last_id)
+        elif descending:
+            query = query.filter(or_(sort_column < value, and_(sort_column == value, id_column < last_id)))
+        else:
+            query = query.filter(or_(sort_column > value, and_(sort_column == value, id_column > last_id)))
+
+    if sort_column is id_column:
+        order = [id_column.desc() if descending else id_column.asc()]
+    elif descending:
+        order = [sort_column.desc(), id_column.desc()]
+    else:
+        order = [sort_column.asc(), id_column.asc()]
+
+    rows = query.order_by(None).order_by(*order).limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_key, getattr(last, sort_key), getattr(last, id_column.key))
+    return KeysetPage(items, next_cursor, total)
@@ -1,67 +1,147 @@
+import math
 import time
+import threading
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from flask import request, current_app
+from flask import request
 from app.utils.response import error_response
-from app.utils.redis_client import get_redis_client
+from app.utils.redis_client import redis_manager
 import logging
 from functools import wraps
 from redis.exceptions import RedisError
-from typing import Callable
+from typing import Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
+# GCRA (generic cell rate algorithm): one key per client holds the
+# theoretical arrival time (TAT) in ms. A request is allowed while
+# TAT - burst <= now, and each allowed request pushes TAT forward by one
+# emission interval. Checking and updating happen in one atomic call.
+GCRA_SCRIPT = """
+-- Needed before Redis 5 to write after reading TIME; a no-op later
+if redis.replicate_commands then redis.replicate_commands() end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+
+class RedisRateLimiter:
+    """GCRA rate limiter evaluated in Redis in a single round trip."""
+
+    def __init__(self):
+        self._scripts = {}
+
+    def _script(self, redis_client):
+        script = self._scripts.get(id(redis_client))
+        if script is None:
+            script = self._scripts[id(redis_client)] = redis_client.register_script(GCRA_SCRIPT)
+        return script
+
+    def hit(self, redis_client, key: str, limit: int, per: int) -> Tuple[bool, float]:
+        """
+        Returns:
+            tuple: (allowed, seconds until the next request would be allowed)
+        """
+        interval_ms = per * 1000 / limit
+        allowed, retry_after_ms = self._script(redis_client)(
+            keys=[key], args=[interval_ms, per * 1000]
+        )
+        return bool(allowed), float(retry_after_ms) / 1000
+
+
+class LocalRateLimiter:
+    """
+    In-process token bucket used while Redis is unavailable.
+
+    Limits are per worker process rather than global, which is looser than
+    the Redis limiter but keeps endpoints available.
+    """
+
+    def __init__(self, max_keys=10000):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def hit(self, key: str, limit: int, per: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        rate = limit / per
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (1 - tokens) / rate
+            if len(self._buckets) > self._max_keys:
+                self._evict(now)
+        return allowed, retry_after
+
+    def _evict(self, now):
+        # Drop the buckets idle the longest; they have refilled anyway
+        by_age = sorted(self._buckets.items(), key=lambda item: item[1][1])
+        for key, _ in by_age[:len(by_age) // 2]:
+            del self._buckets[key]
+
+
+redis_limiter = RedisRateLimiter()
+local_limiter = LocalRateLimiter()
+
+
+def check_rate_limit(key: str, limit: int, per: int) -> Tuple[bool, float]:
+    """Apply the limit in Redis, or locally while Redis is unavailable."""
+    redis_client = redis_manager.client()
+    if redis_client is not None:
+        try:
+            return redis_limiter.hit(redis_client, key, limit, per)
+        except RedisError as e:
+            redis_manager.report_error(e)
+            logger.error(f"Redis error in rate limiting, using local limiter: {str(e)}")
+    return local_limiter.hit(key, limit, per)
+
+
 def rate_limit(limit: int, per: int) -> Callable:
     """Rate limit decorator to control request frequency."""
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            with current_app.app_context():
+            try:
+                # Verify JWT, fall back to IP if JWT is unavailable
                 try:
-                    now = time.time()
-                    redis_client = get_redis_client()
-
-                    # Verify JWT, fall back to IP if JWT is unavailable
-                    try:
-                        verify_jwt_in_request(optional=True)
-                        identity = get_jwt_identity() or request.headers.get('X-Forwarded-For', request.remote_addr)
-                    except Exception:
-                        identity = request.headers.get('X-Forwarded-For', request.remote_addr)
-
-                    key = f"rate_limit:{identity}:{f.__name__}"
-                    reset_key = f"rl_reset:{key}"
-                    count_key = f"rl_count:{key}"
-
-                    last_reset = redis_client.get(reset_key)
-                    count = redis_client.get(count_key)
-
-                    if not last_reset or now - float(last_reset) > per:
-                        redis_client.set(reset_key, now, ex=per)
-                        redis_client.set(count_key, 1, ex=per)
-                        count = 1
-                    else:
-                        count = int(count or 0) + 1
-                        redis_client.set(count_key, count, ex=per)
-
-                    if count > limit:
-                        retry_after = round(per - (now - float(last_reset)), 2)
-                        return error_response(
-                            message="Rate limit exceeded. Please try again later.",
-                            status_code=429,
-                            meta={"retry_after": retry_after}
-                        )
-                except RedisError as e:
-                    logger.error(f"Redis error in rate limiting: {str(e)}")
-                    return error_response(
-                        message="Service is currently unavailable. Please try again later.",
-                        status_code=503
-                    )
-                except Exception as e:
-                    logger.error(f"Unexpected error in rate limiting: {str(e)}")
+                    verify_jwt_in_request(optional=True)
+                    identity = get_jwt_identity() or request.headers.get('X-Forwarded-For', request.remote_addr)
+                except Exception:
+                    identity = request.headers.get('X-Forwarded-For', request.remote_addr)
+
+                key = f"rate_limit:{identity}:{f.__name__}"
+                allowed, retry_after = check_rate_limit(key, limit, per)
+
+                if not allowed:
                     return error_response(
-                        message="An unexpected error occurred. Please try again later.",
-                        status_code=500
+                        message="Rate limit exceeded. Please try again later.",
+                        status_code=429,
+                        meta={"retry_after": round(math.ceil(retry_after * 100) / 100, 2)}
                     )
-            
+            except Exception as e:
+                logger.error(f"Unexpected error in rate limiting: {str(e)}")
+                return error_response(
+                    message="An unexpected error occurred. Please try again later.",
+                    status_code=500
+                )
+
             return f(*args, **kwargs)
         return decorated_function
     return decorator
@@ -1,28 +1,144 @@
-from redis import Redis
-from flask import current_app
-from app.utils.some_module import ConfigurationError
+import os
+import time
+import threading
+from redis import Redis, ConnectionPool
+from redis.exceptions import RedisError, ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Recommended
+
+class RedisManager:
+    """
+    Process-wide Redis connection pool, initialised once in create_app.
+
+    `client()` returns a client sharing one ConnectionPool per process, or
+    None while Redis is unavailable so callers can fall back. The pool is
+    rebuilt when the process id changes, so gunicorn workers forked after
+    create_app never share sockets with the master. Idle connections are
+    health-checked by redis-py before reuse, and after a connection failure
+    the manager waits REDIS_RETRY_INTERVAL seconds before trying again.
+
+    `binary_client()` is a second pool with the same settings but without
+    decode_responses, for libraries that store bytes (Flask-Caching pickles
+    its values). redis-py resets a pool's connections in a forked child on
+    its own, so that client can be handed out once and kept.
+    """
+
+    def __init__(self, app=None):
+        self._url = None
+        self._options = {}
+        self._retry_interval = 5
+        self._pool = None
+        self._client = None
+        self._binary_client = None
+        self._pid = None
+        self._available = False
+        self._retry_at = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._url = app.config.get('REDIS_URL')
+        self._options = {
+            'decode_responses': True,
+            'socket_timeout': app.config.get('REDIS_SOCKET_TIMEOUT', 5),
+            'socket_connect_timeout': app.config.get('REDIS_SOCKET_TIMEOUT', 5),
+            'retry_on_timeout': True,
+            'health_check_interval': app.config.get('REDIS_HEALTH_CHECK_INTERVAL', 30),
+            'max_connections': app.config.get('REDIS_MAX_CONNECTIONS', 50),
+        }
+        self._retry_interval = app.config.get('REDIS_RETRY_INTERVAL', 5)
+        with self._lock:
+            self._reset()
+            if self._binary_client is not None:
+                self._binary_client.connection_pool.disconnect()
+            self._binary_client = None
+        app.extensions['redis_manager'] = self
+
+        if not self._url:
+            logger.warning("REDIS_URL is not configured; Redis-backed features will use local fallbacks")
+        elif self.client() is None:
+            logger.warning("Redis is not reachable yet; will retry lazily")
+
+    def _reset(self):
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.disconnect()
+        self._pool = None
+        self._client = None
+        self._pid = None
+        self._available = False
+        self._retry_at = 0
+
+    def _ensure_pool(self):
+        if self._pid != os.getpid():
+            # Forked since the pool was made: drop the parent's sockets without closing them
+            self._pool = ConnectionPool.from_url(self._url, **self._options)
+            self._client = Redis(connection_pool=self._pool)
+            self._pid = os.getpid()
+            self._available = False
+            self._retry_at = 0
+
+    def client(self):
+        """Return the shared client, or None while Redis is unavailable."""
+        if not self._url:
+            return None
+        if self._available and self._pid == os.getpid():
+            return self._client
+
+        with self._lock:
+            self._ensure_pool()
+            if self._available:
+                return self._client
+            if time.monotonic() < self._retry_at:
+                return None
+            try:
+                self._client.ping()
+            except RedisError as e:
+                self._retry_at = time.monotonic() + self._retry_interval
+                logger.warning(f"Redis unavailable, retrying in {self._retry_interval}s: {str(e)}")
+                return None
+            self._available = True
+            logger.info("Connected to Redis")
+            return self._client
+
+    def binary_client(self):
+        """A client returning bytes over its own managed pool, or None without REDIS_URL."""
+        if not self._url:
+            return None
+        with self._lock:
+            if self._binary_client is None:
+                options = dict(self._options, decode_responses=False)
+                self._binary_client = Redis(connection_pool=ConnectionPool.from_url(self._url, **options))
+            return self._binary_client
+
+    def report_error(self, error):
+        """Called by users of the client; connection failures pause Redis use until the next retry."""
+        if not isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+            return
+        with self._lock:
+            if self._available:
+                logger.warning(f"Lost Redis connection: {str(error)}")
+            self._available = False
+            self._retry_at = time.monotonic() + self._retry_interval
+
+    def is_available(self):
+        return self.client() is not None
+
+
+redis_manager = RedisManager()
+
+
 def get_redis_client():
-    redis_url = current_app.config.get('REDIS_URL')
-    if not redis_url:
-        raise ConfigurationError("REDIS_URL configuration is missing")
-        
-    redis_options = {
-        'decode_responses': True,
-        'socket_timeout': 5,
-        'socket_connect_timeout': 5,
-        'retry_on_timeout': True
-    }
-    
-    try:
-        redis_client = Redis.from_url(redis_url, **redis_options)
-        redis_client.ping()  # Verify connection
-        return redis_client
-    except Exception as e:
-        current_app.logger.error(f"Redis connection error: {e}")
-        raise ConnectionError(f"Failed to connect to Redis: {e}")
\ No newline at end of file
+    """
+    Return the pooled Redis client.
+
+    Raises:
+        redis.exceptions.ConnectionError: if Redis is unavailable
+    """
+    client = redis_manager.client()
+    if client is None:
+        raise RedisConnectionError("Redis is unavailable")
+    return client
@@ -11,6 +11,7 @@ from app import create_app, db
 from flask import current_app
 from app.models.permission import Permission
 from app.models import Permission, Role, User
+from app.services.permission_version_cache import permission_versions
 
 def setup_permissions_and_roles():
     app = create_app()
@@ -142,10 +143,11 @@ def setup_permissions_and_roles():
                 current_app.logger.info("Updated existing users with new permissions")
 
             # Update last_permission_update for all users
-            User.query.update({User.last_permission_update: datetime.utcnow()})
+            User.query.update({User.last_permission_update: datetime.utcnow().replace(microsecond=0)})
             current_app.logger.info("Updated last_permission_update for all users")
 
             db.session.commit()
+            permission_versions.clear()
             current_app.logger.info("Permissions and roles setup completed.")
         except Exception as e:
             db.session.rollback()
@@ -1,10 +1,23 @@
 from celery import Celery
 
 def make_celery(app):
+    """Create a Celery app whose tasks run inside an application context of `app`."""
     celery = Celery(
         app.import_name,
-        backend=app.config['REDIS_URL'],
-        broker=app.config['REDIS_URL']
+        broker=app.config.get('CELERY_BROKER_URL') or app.config['REDIS_URL'],
+        backend=app.config.get('CELERY_RESULT_BACKEND') or None
     )
-    celery.conf.update(app.config)
+    celery.conf.update(
+        task_ignore_result=not app.config.get('CELERY_RESULT_BACKEND'),
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        broker_connection_retry_on_startup=True,
+    )
+
+    class ContextTask(celery.Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery.Task = ContextTask
     return celery
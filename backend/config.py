@@ -13,6 +13,40 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
     SENDGRID_DEFAULT_FROM = os.environ.get('SENDGRID_DEFAULT_FROM', 'noreply@yourdomain.com')
+    # Templated emails are sent in the background: 'auto' uses Celery when a broker is set,
+    # otherwise a per-process thread pool ('local'); 'sync' sends inline
+    EMAIL_QUEUE_BACKEND = os.getenv('EMAIL_QUEUE_BACKEND', 'auto')
+    CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+    CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+    EMAIL_RETRY_BACKOFF = int(os.getenv('EMAIL_RETRY_BACKOFF', 30))  # seconds, doubled per attempt
+    EMAIL_WORKER_THREADS = int(os.getenv('EMAIL_WORKER_THREADS', 4))
+    EMAIL_REQUEUE_INTERVAL = int(os.getenv('EMAIL_REQUEUE_INTERVAL', 300))
+    # How emails leave the app: 'sendgrid', 'smtp', 'memory' (kept in-process) or 'file' (.eml files)
+    EMAIL_TRANSPORT = os.getenv('EMAIL_TRANSPORT', 'sendgrid')
+    EMAIL_TRANSPORT_POOL_SIZE = int(os.getenv('EMAIL_TRANSPORT_POOL_SIZE', 10))  # kept-alive connections per process
+    EMAIL_TRANSPORT_TIMEOUT = int(os.getenv('EMAIL_TRANSPORT_TIMEOUT', 10))
+    SENDGRID_API_URL = os.getenv('SENDGRID_API_URL', 'https://api.sendgrid.com')
+    SMTP_HOST = os.getenv('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+    SMTP_USERNAME = os.getenv('SMTP_USERNAME')
+    SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
+    SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'True').lower() == 'true'
+    EMAIL_FILE_DIR = os.getenv('EMAIL_FILE_DIR', '/tmp/emails')
+    # Transactional outbox: relay batch size and schedule, retries, how long dispatched rows are kept
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 100))
+    OUTBOX_RELAY_INTERVAL = int(os.getenv('OUTBOX_RELAY_INTERVAL', 5))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 10))
+    OUTBOX_RETENTION_HOURS = int(os.getenv('OUTBOX_RETENTION_HOURS', 168))
+    # Run the outbox relay and the email requeue/stale-job sweeps in every web process. They start
+    # on the first request a process serves; `flask` commands, app/celery_worker.py and the scripts
+    # in app/scripts never start them. Commits that write to the outbox still wake the relay.
+    BACKGROUND_WORKERS_ENABLED = os.getenv('BACKGROUND_WORKERS_ENABLED', 'True').lower() == 'true'
+    # Project update/milestone emails: backers per SendGrid request (max 1000) and requests in flight
+    BULK_EMAIL_BATCH_SIZE = int(os.getenv('BULK_EMAIL_BATCH_SIZE', 1000))
+    BULK_EMAIL_CONCURRENCY = int(os.getenv('BULK_EMAIL_CONCURRENCY', 4))
+    BULK_EMAIL_SWEEP_INTERVAL = int(os.getenv('BULK_EMAIL_SWEEP_INTERVAL', 600))
+    BULK_EMAIL_STALE_AFTER = int(os.getenv('BULK_EMAIL_STALE_AFTER', 3600))  # seconds without progress
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
     FRONTEND_URL = os.environ.get('FRONTEND_URL')
@@ -41,9 +75,48 @@ class Config:
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(
         seconds=int(os.environ.get('JWT_REFRESH_TOKEN_EXPIRES', 2592000))
     )
+
+    # Revoked JTIs are cached per worker in a Bloom filter kept current over Redis pub/sub
+    JWT_REVOCATION_BLOOM_CAPACITY = int(os.getenv('JWT_REVOCATION_BLOOM_CAPACITY', 100000))
+    JWT_REVOCATION_RESYNC_INTERVAL = int(os.getenv('JWT_REVOCATION_RESYNC_INTERVAL', 300))
+    JWT_REVOCATION_LOCAL_ONLY = os.getenv('JWT_REVOCATION_LOCAL_ONLY', 'False').lower() == 'true'  # single-process deployments without Redis
+    # Permissions travel in JWTs as a bitset (perm_bits). The frontend fetches the names from
+    # /role-permissions/<id>/permissions; set this to also embed them, at the cost of larger tokens
+    JWT_PERMISSION_NAMES_CLAIM = os.getenv('JWT_PERMISSION_NAMES_CLAIM', 'False').lower() == 'true'
+    
+    # permission_required checks JWT claims against cached permission versions
+    PERMISSION_VERSION_LOCAL_TTL = int(os.getenv('PERMISSION_VERSION_LOCAL_TTL', 5))
+    PERMISSION_VERSION_REDIS_TTL = int(os.getenv('PERMISSION_VERSION_REDIS_TTL', 300))
+    # Expired token_blocklist rows are deleted in batches this often
+    TOKEN_BLOCKLIST_PRUNE_INTERVAL = int(os.getenv('TOKEN_BLOCKLIST_PRUNE_INTERVAL', 3600))
+    TOKEN_BLOCKLIST_PRUNE_BATCH_SIZE = int(os.getenv('TOKEN_BLOCKLIST_PRUNE_BATCH_SIZE', 1000))
     
     # Redis configuration - Railway format
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+    REDIS_SOCKET_TIMEOUT = int(os.getenv('REDIS_SOCKET_TIMEOUT', 5))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))  # ping idle connections before reuse
+    REDIS_RETRY_INTERVAL = int(os.getenv('REDIS_RETRY_INTERVAL', 5))  # wait after a failure before reconnecting
+    
+    # Buffered project view counts are written to the database this often
+    VIEW_COUNT_FLUSH_INTERVAL = int(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', 30))
+    VIEW_COUNT_FLUSH_BATCH_SIZE = int(os.getenv('VIEW_COUNT_FLUSH_BATCH_SIZE', 500))
+    VIEW_COUNT_ORPHAN_AGE = int(os.getenv('VIEW_COUNT_ORPHAN_AGE', 600))
+    
+    # Sharded funding counters for projects with a very high pledge rate
+    FUNDING_SHARD_COUNT = int(os.getenv('FUNDING_SHARD_COUNT', 16))
+    FUNDING_SHARD_RATE_THRESHOLD = int(os.getenv('FUNDING_SHARD_RATE_THRESHOLD', 120))  # pledges per minute, 0 disables
+    FUNDING_SHARD_FOLD_INTERVAL = int(os.getenv('FUNDING_SHARD_FOLD_INTERVAL', 60))
+    FUNDING_TOTAL_CACHE_TIMEOUT = int(os.getenv('FUNDING_TOTAL_CACHE_TIMEOUT', 5))
+    
+    # In-process inverted index for /projects/search (per worker, synced through Redis)
+    SEARCH_INDEX_ENABLED = os.getenv('SEARCH_INDEX_ENABLED', 'False').lower() == 'true'
+    SEARCH_INDEX_SYNC_INTERVAL = int(os.getenv('SEARCH_INDEX_SYNC_INTERVAL', 5))
+    SEARCH_INDEX_REBUILD_INTERVAL = int(os.getenv('SEARCH_INDEX_REBUILD_INTERVAL', 3600))
+    
+    # Precomputed /projects/discovery feed
+    DISCOVERY_FEED_INTERVAL = int(os.getenv('DISCOVERY_FEED_INTERVAL', 60))
+    DISCOVERY_FEED_SIZE = int(os.getenv('DISCOVERY_FEED_SIZE', 12))
     
     # Configure Flask-Caching with Redis
     CACHE_TYPE = 'redis'
@@ -0,0 +1,44 @@
+"""Add email_deliveries for the background email queue
+
+Revision ID: a6c2e9f4b8d1
+Revises: f2b6d8a4c1e7
+Create Date: 2026-10-18 18:05:33.271904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2e9f4b8d1'
+down_revision = 'f2b6d8a4c1e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_deliveries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('to_email', sa.String(length=120), nullable=False),
+        sa.Column('email_type', sa.String(length=50), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('text_content', sa.Text(), nullable=False),
+        sa.Column('html_content', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('QUEUED', 'RETRYING', 'SENT', 'FAILED', name='emaildeliverystatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('email_deliveries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_email_deliveries_to_email'), ['to_email'], unique=False)
+        batch_op.create_index('ix_email_deliveries_status_next_attempt', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('email_deliveries', schema=None) as batch_op:
+        batch_op.drop_index('ix_email_deliveries_status_next_attempt')
+        batch_op.drop_index(batch_op.f('ix_email_deliveries_to_email'))
+    op.drop_table('email_deliveries')
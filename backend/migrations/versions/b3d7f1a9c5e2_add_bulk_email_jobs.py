@@ -0,0 +1,47 @@
+"""Add bulk_email_jobs for batched backer emails
+
+Revision ID: b3d7f1a9c5e2
+Revises: a6c2e9f4b8d1
+Create Date: 2026-10-18 19:12:07.518340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d7f1a9c5e2'
+down_revision = 'a6c2e9f4b8d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('bulk_email_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('email_type', sa.String(length=50), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('text_content', sa.Text(), nullable=False),
+        sa.Column('html_content', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='bulkemailjobstatus'), nullable=False),
+        sa.Column('total_recipients', sa.Integer(), nullable=False),
+        sa.Column('sent_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('batches_total', sa.Integer(), nullable=False),
+        sa.Column('batches_done', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('bulk_email_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_bulk_email_jobs_project_id'), ['project_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bulk_email_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bulk_email_jobs_project_id'))
+    op.drop_table('bulk_email_jobs')
@@ -0,0 +1,36 @@
+"""Add sharded funding counters
+
+Revision ID: b7d2f4a9c6e1
+Revises: a3c5e8f1d2b4
+Create Date: 2026-10-18 10:03:17.551932
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4a9c6e1'
+down_revision = 'a3c5e8f1d2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_funding_shards',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('shard_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('pledge_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'shard_id')
+    )
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sharded_funding', sa.Boolean(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('sharded_funding')
+
+    op.drop_table('project_funding_shards')
@@ -0,0 +1,28 @@
+"""Add FULLTEXT index on project title and description
+
+Revision ID: c4e9a1b7d3f2
+Revises: b7d2f4a9c6e1
+Create Date: 2026-10-18 11:02:17.530114
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e9a1b7d3f2'
+down_revision = 'b7d2f4a9c6e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FULLTEXT only exists on MySQL; other databases search without an index
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.create_index('ix_projects_fulltext', 'projects', ['title', 'description'], mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.drop_index('ix_projects_fulltext', table_name='projects')
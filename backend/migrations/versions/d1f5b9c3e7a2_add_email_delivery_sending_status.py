@@ -0,0 +1,31 @@
+"""Add the SENDING status that marks a claimed email delivery
+
+Revision ID: d1f5b9c3e7a2
+Revises: c8e4a2f6d0b3
+Create Date: 2026-10-18 23:12:06.418532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1f5b9c3e7a2'
+down_revision = 'c8e4a2f6d0b3'
+branch_labels = None
+depends_on = None
+
+OLD_STATUS = sa.Enum('QUEUED', 'RETRYING', 'SENT', 'FAILED', name='emaildeliverystatus')
+NEW_STATUS = sa.Enum('QUEUED', 'SENDING', 'RETRYING', 'SENT', 'FAILED', name='emaildeliverystatus')
+
+
+def upgrade():
+    with op.batch_alter_table('email_deliveries', schema=None) as batch_op:
+        batch_op.alter_column('status', existing_type=OLD_STATUS, type_=NEW_STATUS, existing_nullable=False)
+
+
+def downgrade():
+    # Deliveries claimed mid-send go back to the queue
+    op.execute("UPDATE email_deliveries SET status = 'RETRYING' WHERE status = 'SENDING'")
+    with op.batch_alter_table('email_deliveries', schema=None) as batch_op:
+        batch_op.alter_column('status', existing_type=NEW_STATUS, type_=OLD_STATUS, existing_nullable=False)
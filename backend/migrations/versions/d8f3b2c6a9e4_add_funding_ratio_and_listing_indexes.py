@@ -0,0 +1,39 @@
+"""Add projects.funding_ratio and composite indexes for listing sorts
+
+Revision ID: d8f3b2c6a9e4
+Revises: c4e9a1b7d3f2
+Create Date: 2026-10-18 13:27:05.118342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f3b2c6a9e4'
+down_revision = 'c4e9a1b7d3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('funding_ratio', sa.Float(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE projects SET funding_ratio = CASE WHEN goal_amount > 0 "
+        "THEN COALESCE(current_amount, 0) / goal_amount ELSE 0 END"
+    )
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_status_deleted_ratio', ['status', 'is_deleted', 'funding_ratio'], unique=False)
+        batch_op.create_index('ix_projects_status_created', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_projects_creator_status_created', ['creator_id', 'status', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_creator_status_created')
+        batch_op.drop_index('ix_projects_status_created')
+        batch_op.drop_index('ix_projects_status_deleted_ratio')
+        batch_op.drop_column('funding_ratio')
@@ -0,0 +1,28 @@
+"""Add bulk_email_jobs.heartbeat_at so interrupted jobs can be detected
+
+Revision ID: e3a8c6f2d4b9
+Revises: d1f5b9c3e7a2
+Create Date: 2026-10-18 23:31:47.805216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a8c6f2d4b9'
+down_revision = 'd1f5b9c3e7a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bulk_email_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_bulk_email_jobs_status_heartbeat', ['status', 'heartbeat_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bulk_email_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_bulk_email_jobs_status_heartbeat')
+        batch_op.drop_column('heartbeat_at')
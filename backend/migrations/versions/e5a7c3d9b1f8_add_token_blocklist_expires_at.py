@@ -0,0 +1,41 @@
+"""Add token_blocklist.expires_at so expired revocations can be pruned
+
+Revision ID: e5a7c3d9b1f8
+Revises: d8f3b2c6a9e4
+Create Date: 2026-10-18 15:02:41.530217
+
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c3d9b1f8'
+down_revision = 'd8f3b2c6a9e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('token_blocklist', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+
+    # Existing rows do not record which token type they revoked, so assume the
+    # longest lifetime (a refresh token) counted from the revocation time
+    lifetime = int(os.environ.get('JWT_REFRESH_TOKEN_EXPIRES', 2592000))
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute(f"UPDATE token_blocklist SET expires_at = DATE_ADD(created_at, INTERVAL {lifetime} SECOND)")
+    else:
+        op.execute(f"UPDATE token_blocklist SET expires_at = datetime(created_at, '+{lifetime} seconds')")
+
+    with op.batch_alter_table('token_blocklist', schema=None) as batch_op:
+        batch_op.alter_column('expires_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_token_blocklist_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('token_blocklist', schema=None) as batch_op:
+        batch_op.drop_index('ix_token_blocklist_expires_at')
+        batch_op.drop_column('expires_at')
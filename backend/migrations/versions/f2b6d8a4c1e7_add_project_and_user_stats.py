@@ -0,0 +1,61 @@
+"""Add project_stats and user_stats aggregate tables
+
+Revision ID: f2b6d8a4c1e7
+Revises: e5a7c3d9b1f8
+Create Date: 2026-10-18 16:40:12.904551
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d8a4c1e7'
+down_revision = 'e5a7c3d9b1f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('donation_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('donation_amount', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.Column('completed_amount', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.Column('backer_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('paid_out_amount', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_table('user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('donation_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('donation_amount', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.Column('completed_amount', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill; `flask rebuild-stats` recomputes the same aggregates later if needed
+    op.execute("""
+        INSERT INTO project_stats (project_id, donation_count, donation_amount, completed_amount, backer_count, paid_out_amount)
+        SELECT p.id,
+               (SELECT COUNT(*) FROM donations d WHERE d.project_id = p.id),
+               (SELECT COALESCE(SUM(d.amount), 0) FROM donations d WHERE d.project_id = p.id),
+               (SELECT COALESCE(SUM(d.amount), 0) FROM donations d WHERE d.project_id = p.id AND d.status = 'COMPLETED'),
+               (SELECT COUNT(DISTINCT d.user_id) FROM donations d WHERE d.project_id = p.id),
+               (SELECT COALESCE(SUM(po.amount), 0) FROM payouts po
+                 WHERE po.project_id = p.id AND po.status IN ('COMPLETED', 'PROCESSING'))
+        FROM projects p
+    """)
+    op.execute("""
+        INSERT INTO user_stats (user_id, donation_count, donation_amount, completed_amount)
+        SELECT d.user_id, COUNT(*), SUM(d.amount), SUM(CASE WHEN d.status = 'COMPLETED' THEN d.amount ELSE 0 END)
+        FROM donations d JOIN users u ON u.id = d.user_id
+        GROUP BY d.user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('user_stats')
+    op.drop_table('project_stats')
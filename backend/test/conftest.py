@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app reads its configuration at import time, so point it at a throwaway
+# SQLite database before anything from the app package is imported.
+_db_dir = tempfile.mkdtemp(prefix='payforme-test-')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(_db_dir, 'test.db')}")
+os.environ.setdefault('SECRET_KEY', 'test-secret')
+os.environ.setdefault('JWT_SECRET_KEY', 'test-jwt-secret')
+# No Redis in tests: Redis-backed features use their local fallbacks
+os.environ['REDIS_URL'] = ''
+# Send emails inline unless a test opts into a background backend
+os.environ.setdefault('EMAIL_QUEUE_BACKEND', 'sync')
+# Tests run the outbox relay and sweeps explicitly
+os.environ.setdefault('BACKGROUND_WORKERS_ENABLED', 'false')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, cache  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.payout import Payout  # noqa: E402,F401
+from app.models.saved_project import SavedProject  # noqa: E402,F401
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['CACHE_TYPE'] = 'SimpleCache'
+    cache.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,64 @@
+"""Model factories and query counting shared by the test modules."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app import db
+from app.models import User, Category, Project, Donation
+from app.models.enums import ProjectStatus, DonationStatus
+
+
+def make_user(username):
+    user = User(username=username, email=f'{username}@example.com', password_hash='not-a-real-hash')
+    db.session.add(user)
+    return user
+
+
+def make_project(creator, goal_amount='1000.00', status=ProjectStatus.ACTIVE):
+    category = Category.query.first()
+    if category is None:
+        category = Category(name='General')
+        db.session.add(category)
+        db.session.flush()
+    project = Project(
+        title='Test project',
+        description='A project used in tests',
+        goal_amount=Decimal(goal_amount),
+        current_amount=Decimal('0'),
+        start_date=datetime.utcnow(),
+        end_date=datetime.utcnow() + timedelta(days=30),
+        creator_id=creator.id,
+        category_id=category.id,
+        status=status
+    )
+    db.session.add(project)
+    db.session.flush()
+    return project
+
+
+def back(project, user, amount):
+    db.session.add(Donation(
+        user_id=user.id,
+        project_id=project.id,
+        amount=Decimal(amount),
+        status=DonationStatus.COMPLETED
+    ))
+    if user not in project.backers:
+        project.backers.append(user)
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self)
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models import Project
+from app.models.enums import ProjectStatus
+from app.services.backer_service import BackerService
+
+from helpers import make_user, make_project, back, StatementCounter
+
+
+@pytest.fixture
+def backed_project(app):
+    creator = make_user('creator')
+    db.session.flush()
+    project = make_project(creator)
+    for i in range(60):
+        backer = make_user(f'backer{i}')
+        db.session.flush()
+        back(project, backer, '10.00')
+        back(project, backer, '5.50')
+    db.session.commit()
+    return project.id
+
+
+def test_get_project_backers_aggregates_per_backer(backed_project):
+    result = BackerService().get_project_backers(backed_project, page=1, per_page=10)
+
+    assert result['meta']['total'] == 60
+    assert len(result['backers']) == 10
+    assert all(b['total_amount'] == 15.5 for b in result['backers'])
+    assert all(b['first_backed_at'] is not None for b in result['backers'])
+
+
+def test_get_project_backers_keyset_pagination(backed_project):
+    service = BackerService()
+    first = service.get_project_backers(backed_project, page=1, per_page=25)
+    second = service.get_project_backers(
+        backed_project, page=2, per_page=25, after=first['meta']['next_cursor']
+    )
+    offset_second = service.get_project_backers(backed_project, page=2, per_page=25)
+
+    first_ids = [b['user_id'] for b in first['backers']]
+    second_ids = [b['user_id'] for b in second['backers']]
+    assert first_ids == sorted(first_ids)
+    assert min(second_ids) > max(first_ids)
+    assert second_ids == [b['user_id'] for b in offset_second['backers']]
+
+
+def test_get_project_backers_query_count_independent_of_page_size(backed_project):
+    service = BackerService()
+
+    with StatementCounter(db.engine) as small:
+        service.get_project_backers(backed_project, page=1, per_page=5)
+    with StatementCounter(db.engine) as large:
+        service.get_project_backers(backed_project, page=1, per_page=50)
+
+    assert small.count == large.count
+
+
+def test_get_user_backed_projects_uses_grouped_query(app):
+    creator = make_user('creator')
+    user = make_user('heavy_backer')
+    other = make_user('other_backer')
+    db.session.flush()
+
+    project_ids = []
+    for _ in range(12):
+        project = make_project(creator)
+        back(project, user, '20.00')
+        back(project, user, '5.00')
+        back(project, other, '100.00')
+        project.current_amount = Decimal('125.00')
+        project_ids.append(project.id)
+    db.session.commit()
+
+    service = BackerService()
+    result = service.get_user_backed_projects(user.id, page=1, per_page=3)
+    with StatementCounter(db.engine) as small:
+        service.get_user_backed_projects(user.id, page=1, per_page=3)
+    with StatementCounter(db.engine) as large:
+        service.get_user_backed_projects(user.id, page=1, per_page=12)
+
+    assert small.count == large.count
+    assert result['meta']['total'] == 12
+    assert [p['id'] for p in result['projects']] == project_ids[:3]
+    assert all(p['total_amount'] == 25.0 for p in result['projects'])
+    assert all(p['total_pledged'] == 125.0 for p in result['projects'])
+
+
+def test_back_project_concurrent_pledges_are_not_lost(app):
+    # Exercise the single-row atomic path, not the sharded counters
+    app.config['FUNDING_SHARD_RATE_THRESHOLD'] = 0
+    creator = make_user('creator')
+    backers = [make_user(f'pledger{i}') for i in range(20)]
+    db.session.flush()
+    project = make_project(creator, goal_amount='2000.00')
+    db.session.commit()
+    project_id = project.id
+    backer_ids = [b.id for b in backers]
+
+    def pledge(i):
+        with app.app_context():
+            return BackerService().back_project(
+                project_id, backer_ids[i % len(backer_ids)], {'amount': '10.00'}
+            )
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(pledge, range(200)))
+
+    assert [r for r in results if 'error' in r] == []
+
+    db.session.expire_all()
+    project = db.session.get(Project, project_id)
+    assert project.current_amount == Decimal('2000.00')
+    assert project.backers_count == len(backer_ids)
+    assert project.status == ProjectStatus.FUNDED
+    assert sum(r['project_status'] == 'FUNDED' for r in results) == 1
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import User, BulkEmailJob, BulkEmailJobStatus, Permission, Role
+from app.services.auth_service import AuthService
+from app.services.backer_service import BackerService
+from app.services.bulk_email_service import bulk_email
+from app.services.email_service import EmailServiceError
+from app.services.email_transport import get_transport
+from helpers import make_user, make_project
+
+
+def make_backed_project(count):
+    creator = make_user('creator')
+    db.session.flush()
+    project = make_project(creator)
+    for i in range(count):
+        project.backers.append(make_user(f'backer{i}'))
+    db.session.commit()
+    return project.id
+
+
+def use_memory_transport(app, batch_size):
+    app.config.update(EMAIL_TRANSPORT='memory', BULK_EMAIL_BATCH_SIZE=batch_size,
+                      BULK_EMAIL_CONCURRENCY=2, EMAIL_RETRY_BACKOFF=0)
+    app.extensions.pop('email_transport', None)
+    return get_transport(app)
+
+
+def test_update_is_sent_in_personalized_batches(app):
+    transport = use_memory_transport(app, batch_size=10)
+    project_id = make_backed_project(25)
+
+    service = BackerService()
+    result = service.send_project_update_email(project_id, 'Shipping soon', 'Boxes are packed')
+    job = service.get_bulk_email_job(project_id, result['job']['id'])
+
+    assert job['status'] == 'COMPLETED'
+    assert (job['sent_count'], job['failed_count'], job['batches_done']) == (25, 0, 3)
+    assert transport.requests == 3
+    by_recipient = {message['to']: message for message in transport.outbox}
+    assert len(by_recipient) == 25
+    assert 'Dear backer7,' in by_recipient['backer7@example.com']['text']
+    assert 'Boxes are packed' in by_recipient['backer7@example.com']['html']
+
+
+def test_failed_batches_are_retried_then_counted(app, monkeypatch):
+    transport = use_memory_transport(app, batch_size=10)
+    project_id = make_backed_project(15)
+    send_bulk = transport.send_bulk
+    calls = []
+
+    def flaky_send_bulk(subject, text_content, html_content, recipients):
+        calls.append(len(recipients))
+        if len(recipients) == 5:
+            raise EmailServiceError('rejected', retryable=False)
+        if len(calls) == 1:
+            raise EmailServiceError('try later', retryable=True)
+        send_bulk(subject, text_content, html_content, recipients)
+
+    monkeypatch.setattr(transport, 'send_bulk', flaky_send_bulk)
+    result = BackerService().send_project_milestone_email(project_id, 'Prototype done', 'It works')
+    job = BackerService().get_bulk_email_job(project_id, result['job']['id'])
+
+    assert job['status'] == 'COMPLETED'
+    assert (job['sent_count'], job['failed_count']) == (10, 5)
+    assert job['last_error'] == 'rejected'
+    assert sorted(calls) == [5, 10, 10]
+    assert BackerService().get_bulk_email_job(project_id + 1, job['id'])['status_code'] == 404
+
+
+def test_names_are_escaped_in_the_html_part_only(app):
+    transport = use_memory_transport(app, batch_size=10)
+    project_id = make_backed_project(1)
+    backer = User.query.filter_by(username='backer0').one()
+    backer.username = 'Tom & <Jerry>'
+    db.session.commit()
+
+    BackerService().send_project_update_email(project_id, 'Shipping soon', 'Boxes are packed')
+
+    (message,) = transport.outbox
+    assert 'Dear Tom & <Jerry>,' in message['text']
+    assert 'Tom &amp; &lt;Jerry&gt;' in message['html']
+    assert '<Jerry>' not in message['html']
+
+
+def test_sweep_fails_jobs_that_stopped_making_progress(app):
+    project_id = make_backed_project(1)
+    long_ago = datetime.utcnow() - timedelta(hours=2)
+    stale, alive = [BulkEmailJob(project_id=project_id, email_type='project_update', subject='s',
+                                 text_content='t', html_content='h', status=BulkEmailJobStatus.RUNNING,
+                                 started_at=long_ago, heartbeat_at=heartbeat)
+                    for heartbeat in (long_ago, datetime.utcnow())]
+    db.session.add_all([stale, alive])
+    db.session.commit()
+
+    assert bulk_email.fail_stale_jobs() == 1
+
+    db.session.expire_all()
+    assert stale.status == BulkEmailJobStatus.FAILED
+    assert stale.last_error.startswith('Interrupted')
+    assert alive.status == BulkEmailJobStatus.RUNNING
+
+
+def test_milestone_senders_can_poll_their_job(app, client):
+    use_memory_transport(app, batch_size=10)
+    project_id = make_backed_project(1)
+    result = BackerService().send_project_milestone_email(project_id, 'Prototype done', 'It works')
+    sender = make_user('sender')
+    sender.roles.append(Role(name='Milestones', permissions=[Permission(name='send_project_milestone')]))
+    db.session.commit()
+    with app.test_request_context():
+        token = AuthService.create_token_for_user(sender)
+
+    response = client.get(f"/api/v1/backers/projects/{project_id}/email-jobs/{result['job']['id']}",
+                          headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['email_type'] == 'project_milestone'
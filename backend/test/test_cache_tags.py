@@ -0,0 +1,78 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app import db
+from app.models import Donation
+from app.models.enums import DonationStatus
+from app.services.backer_service import BackerService
+from app.services.donation_service import DonationService
+from app.services.stats_service import get_project_stats
+from app.utils.cache_tags import invalidate_project
+from helpers import make_user, make_project, StatementCounter
+
+
+def test_donation_transitions_invalidate_cached_stats(app, monkeypatch):
+    creator, backer = make_user('creator'), make_user('backer')
+    db.session.flush()
+    project = make_project(creator)
+    donation = Donation(user_id=backer.id, project_id=project.id, amount=Decimal('12.00'),
+                        status=DonationStatus.COMPLETED)
+    db.session.add(donation)
+    db.session.commit()
+    project_id = project.id
+    service = BackerService()
+
+    assert service.get_backer_stats(project_id)['total_amount'] == 12.0
+    with StatementCounter(db.engine) as counter:
+        service.get_backer_stats(project_id)
+        service.get_public_backer_stats(project_id)
+        service.get_public_backer_stats(project_id)
+    assert counter.count == 2  # only the first public lookup
+
+    monkeypatch.setattr(DonationService, '_send_refund_notification_email', lambda self, donation: None)
+    DonationService()._handle_refund(SimpleNamespace(metadata={'donation_id': donation.id}, amount=1200))
+
+    assert get_project_stats(db.session, project_id).completed_amount == 0
+    with StatementCounter(db.engine) as counter:
+        service.get_backer_stats(project_id)
+        service.get_public_backer_stats(project_id)
+    assert counter.count == 4  # both recomputed after the refund commit
+
+
+def test_invalidate_project_only_touches_that_project(app):
+    creator = make_user('creator')
+    db.session.flush()
+    first, second = make_project(creator), make_project(creator)
+    db.session.commit()
+    first_id, second_id = first.id, second.id
+    service = BackerService()
+    service.get_public_backer_stats(first_id)
+    service.get_public_backer_stats(second_id)
+
+    invalidate_project(first_id)
+
+    with StatementCounter(db.engine) as counter:
+        service.get_public_backer_stats(second_id)
+    assert counter.count == 0
+    with StatementCounter(db.engine) as counter:
+        service.get_public_backer_stats(first_id)
+    assert counter.count == 2
+
+
+def test_savepoint_rollback_keeps_the_outer_invalidation(app):
+    creator, backer = make_user('creator'), make_user('backer')
+    db.session.flush()
+    project = make_project(creator)
+    db.session.commit()
+    project_id = project.id
+    service = BackerService()
+    service.get_public_backer_stats(project_id)
+
+    db.session.add(Donation(user_id=backer.id, project_id=project_id, amount=Decimal('5.00'),
+                            status=DonationStatus.COMPLETED))
+    db.session.flush()
+    savepoint = db.session.begin_nested()
+    savepoint.rollback()
+    db.session.commit()
+
+    assert service.get_public_backer_stats(project_id)['total_amount'] == 5.0
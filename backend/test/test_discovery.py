@@ -0,0 +1,40 @@
+import time
+from decimal import Decimal
+
+from app import db, cache
+from app.services.discovery_service import discovery_feed, FEED_KEY
+
+from helpers import make_user, make_project, StatementCounter
+
+
+def test_discovery_feed_served_from_cache_and_revalidated(app, client, monkeypatch):
+    monkeypatch.setattr(discovery_feed._refresher, 'ensure_started', lambda app: None)
+    creator = make_user('creator')
+    db.session.flush()
+    projects = [make_project(creator) for _ in range(3)]
+    for project, amount in zip(projects, ['100.00', '900.00', '500.00']):
+        project.current_amount = Decimal(amount)
+    db.session.commit()
+
+    data = client.get('/api/v1/projects/discovery?count=2').get_json()['data']
+    assert data['featured']['id'] == projects[1].id
+    assert [p['id'] for p in data['trending']] == [projects[2].id, projects[0].id]
+
+    with StatementCounter(db.engine) as counter:
+        client.get('/api/v1/projects/discovery?count=2')
+    assert counter.count == 0
+
+    # A stale feed is still served while a refresh runs in the background
+    projects[0].current_amount = Decimal('950.00')
+    db.session.commit()
+    stale = cache.get(FEED_KEY)
+    stale['generated_at'] = time.time() - 3600
+    cache.set(FEED_KEY, stale)
+    cache.delete('discovery_feed:refreshing')
+
+    data = client.get('/api/v1/projects/discovery?count=2').get_json()['data']
+    assert data['featured']['id'] == projects[1].id
+    discovery_feed._revalidating.join(timeout=5)
+
+    data = client.get('/api/v1/projects/discovery?count=2').get_json()['data']
+    assert data['featured']['id'] == projects[0].id
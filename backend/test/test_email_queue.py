@@ -0,0 +1,109 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app import db
+from app.models import EmailDelivery, EmailDeliveryStatus
+from app.services.email_queue import email_queue
+from app.services.email_service import send_templated_email, EmailServiceError
+from app.services.email_transport import MemoryTransport
+
+
+class FlakyTransport(MemoryTransport):
+    """Fails the first `failures` sends with a retryable error."""
+
+    def __init__(self, failures=0):
+        super().__init__()
+        self.failures = failures
+
+    def send_bulk(self, subject, text_content, html_content, recipients):
+        if self.failures:
+            self.failures -= 1
+            raise EmailServiceError('Failed to send email: try later', retryable=True)
+        super().send_bulk(subject, text_content, html_content, recipients)
+
+
+def use_flaky_transport(app, failures=0):
+    app.config['EMAIL_RETRY_BACKOFF'] = 0
+    transport = app.extensions['email_transport'] = FlakyTransport(failures)
+    return transport
+
+
+def wait_for_delivery(delivery_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        db.session.expire_all()
+        delivery = db.session.get(EmailDelivery, delivery_id)
+        if delivery.status in (EmailDeliveryStatus.SENT, EmailDeliveryStatus.FAILED):
+            return delivery
+        time.sleep(0.05)
+    raise AssertionError(f'delivery {delivery_id} still {delivery.status}')
+
+
+def test_celery_worker_retries_until_sent(app):
+    from celery.contrib.testing.worker import start_worker
+
+    transport = use_flaky_transport(app, failures=1)
+    app.config.update(EMAIL_QUEUE_BACKEND='celery', CELERY_BROKER_URL='memory://')
+    email_queue.init_app(app)
+    user = SimpleNamespace(username='alice')
+
+    with start_worker(email_queue.celery, pool='solo', perform_ping_check=False):
+        delivery_id = send_templated_email('alice@example.com', '2fa_disabled', user=user)
+        delivery = wait_for_delivery(delivery_id)
+
+    assert delivery.status == EmailDeliveryStatus.SENT
+    assert delivery.attempts == 2
+    assert delivery.last_error is None
+    assert len(transport.outbox) == 1
+
+
+def test_non_retryable_failure_is_recorded(app):
+    # The default SendGrid transport, without an API key
+    app.config['SENDGRID_API_KEY'] = None
+    user = SimpleNamespace(username='bob')
+
+    delivery_id = send_templated_email('bob@example.com', '2fa_disabled', user=user)
+
+    delivery = wait_for_delivery(delivery_id)
+    assert delivery.status == EmailDeliveryStatus.FAILED
+    assert delivery.attempts == 1
+    assert 'API key not configured' in delivery.last_error
+
+
+def test_local_pool_sends_without_a_broker(app):
+    use_flaky_transport(app, failures=2)
+    app.config['EMAIL_QUEUE_BACKEND'] = 'local'
+    email_queue.init_app(app)
+
+    delivery_id = send_templated_email('carol@example.com', '2fa_disabled', user=SimpleNamespace(username='carol'))
+
+    delivery = wait_for_delivery(delivery_id)
+    assert delivery.status == EmailDeliveryStatus.SENT
+    assert delivery.attempts == 3
+
+
+def test_a_delivery_is_claimed_once(app):
+    transport = use_flaky_transport(app)
+    delivery_id = send_templated_email('dave@example.com', '2fa_disabled', user=SimpleNamespace(username='dave'))
+    assert len(transport.outbox) == 1
+
+    # A redelivered task or a racing sweep finds the row already sent
+    assert email_queue.deliver(delivery_id) is None
+    assert len(transport.outbox) == 1
+
+
+def test_sweep_releases_deliveries_stuck_in_sending(app):
+    transport = use_flaky_transport(app)
+    delivery = EmailDelivery(to_email='erin@example.com', email_type='2fa_disabled', subject='Hi',
+                             text_content='Hi', html_content='<p>Hi</p>', status=EmailDeliveryStatus.SENDING,
+                             attempts=1, next_attempt_at=datetime.utcnow() - timedelta(hours=1))
+    db.session.add(delivery)
+    db.session.commit()
+
+    email_queue.requeue_overdue()
+
+    delivery = wait_for_delivery(delivery.id)
+    assert delivery.status == EmailDeliveryStatus.SENT
+    assert delivery.attempts == 2
+    assert len(transport.outbox) == 1
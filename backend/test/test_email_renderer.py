@@ -0,0 +1,36 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from flask import render_template
+
+from app.services.email_renderer import email_renderer
+from app.services.email_service import EMAIL_TEMPLATE_TYPES
+
+
+def test_every_template_type_is_precompiled(app):
+    assert set(app.extensions['email_templates']) == set(EMAIL_TEMPLATE_TYPES)
+
+
+def test_render_matches_render_template(app):
+    kwargs = dict(user_name='alice', project_title='Solar garden', update_title='News', update_content='Boxes are packed')
+
+    subject, text, html = email_renderer.render('project_update', **kwargs)
+
+    assert subject == 'New Update on Your Backed Project'
+    assert text == render_template('email/project_update.txt', current_year=datetime.now().year, **kwargs)
+    assert html == render_template('email/project_update.html', current_year=datetime.now().year, **kwargs)
+
+
+def test_render_many_checks_per_recipient_kwargs(app):
+    common = dict(user_name='alice', project_title='Solar garden', currency='USD')
+    recipients = [{'amount': 10}, {'amount': 20}]
+
+    rendered = list(email_renderer.render_many('payout_initiated', recipients, **common))
+
+    assert len(rendered) == 2
+    assert '10' in rendered[0][1] and '20' in rendered[1][1]
+    with pytest.raises(ValueError, match='amount'):
+        list(email_renderer.render_many('payout_initiated', [{}], **common))
+    with pytest.raises(ValueError, match='Unknown email type'):
+        email_renderer.render('no_such_email', user=SimpleNamespace(username='bob'))
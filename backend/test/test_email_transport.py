@@ -0,0 +1,118 @@
+import json
+import smtplib
+import threading
+from email import message_from_bytes, policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.bulk_email_service import _send_batch
+from app.services.email_service import EmailServiceError
+from app.services.email_transport import EmailTransport, FileTransport, SendGridTransport, SMTPTransport
+
+
+class StandInSendGrid(BaseHTTPRequestHandler):
+    """Answers mail/send with the next queued status, recording bodies and client ports."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        server.bodies.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+        server.client_ports.add(self.client_address[1])
+        status = server.statuses.pop(0) if server.statuses else 202
+        body = b'' if status == 202 else json.dumps({'errors': [{'message': f'status {status}'}]}).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sendgrid_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInSendGrid)
+    server.bodies, server.client_ports, server.statuses = [], set(), []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_sendgrid_transport_reuses_its_connection(sendgrid_server):
+    transport = SendGridTransport('key', 'noreply@example.com',
+                                  api_url=f'http://127.0.0.1:{sendgrid_server.server_port}', pool_size=2)
+    for i in range(5):
+        transport.send(f'user{i}@example.com', 'Hi', 'text', '<p>html</p>')
+    transport.send_bulk('Hi -name-', 'text', '<p>html</p>',
+                        [('a@example.com', {'-name-': 'A'}), ('b@example.com', {'-name-': 'B'})])
+    transport.close()
+
+    assert len(sendgrid_server.bodies) == 6
+    assert len(sendgrid_server.client_ports) == 1
+    personalizations = sendgrid_server.bodies[-1]['personalizations']
+    assert [p['substitutions'] for p in personalizations] == [{'-name-': 'A'}, {'-name-': 'B'}]
+
+
+def test_sendgrid_errors_are_flagged_retryable_or_not(sendgrid_server):
+    sendgrid_server.statuses = [503, 400]
+    transport = SendGridTransport('key', 'noreply@example.com',
+                                  api_url=f'http://127.0.0.1:{sendgrid_server.server_port}')
+
+    with pytest.raises(EmailServiceError) as unavailable:
+        transport.send('user@example.com', 'Hi', 'text', '<p>html</p>')
+    with pytest.raises(EmailServiceError) as rejected:
+        transport.send('user@example.com', 'Hi', 'text', '<p>html</p>')
+
+    assert unavailable.value.retryable and 'status 503' in str(unavailable.value)
+    assert not rejected.value.retryable
+
+
+def test_file_transport_writes_personalized_messages(tmp_path):
+    FileTransport(str(tmp_path), 'noreply@example.com').send_bulk(
+        'Hello -name-', 'Dear -name-', '<p>Dear -name-</p>', [('a@example.com', {'-name-': 'Ann'})]
+    )
+
+    [path] = tmp_path.iterdir()
+    message = message_from_bytes(path.read_bytes(), policy=policy.default)
+    assert (message['To'], message['Subject']) == ('a@example.com', 'Hello Ann')
+    assert message.get_body(('plain',)).get_content().strip() == 'Dear Ann'
+
+
+class FakeSMTP:
+    """Records sent recipients; the `fail_at`-th message gets a temporary 451 reply."""
+
+    def __init__(self, sent, fail_at=None):
+        self.sent = sent
+        self.fail_at = fail_at
+
+    def send_message(self, message):
+        if len(self.sent) == self.fail_at:
+            self.fail_at = None
+            raise smtplib.SMTPResponseException(451, b'try again later')
+        self.sent.append(message['To'])
+
+    def quit(self):
+        pass
+
+
+def test_smtp_retry_skips_recipients_already_sent():
+    sent = []
+    connections = iter([FakeSMTP(sent, fail_at=2), FakeSMTP(sent)])
+    transport = SMTPTransport('localhost', 25, 'noreply@example.com')
+    transport._connect = lambda: next(connections)
+    recipients = [(f'user{i}@example.com', {}) for i in range(4)]
+
+    result = _send_batch(transport, ('Hi', 'text', '<p>html</p>'), recipients, retry=(3, 0))
+
+    assert result == (4, 0, None)
+    assert sent == [email for email, _ in recipients]
+
+
+def test_email_transport_requires_send_bulk():
+    class Incomplete(EmailTransport):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
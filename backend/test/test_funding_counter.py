@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Project, ProjectFundingShard
+from app.models.enums import ProjectStatus
+from app.services.backer_service import BackerService
+from app.services.funding_counter_service import FundingCounterService, funding_counter
+
+from helpers import make_user, make_project, StatementCounter
+
+
+def setup_project(app, goal_amount='1000.00', backers=5):
+    app.config['FUNDING_SHARD_FOLD_INTERVAL'] = 3600
+    app.config['FUNDING_SHARD_COUNT'] = 4
+    funding_counter._local_rates.clear()
+    creator = make_user('creator')
+    users = [make_user(f'pledger{i}') for i in range(backers)]
+    db.session.flush()
+    project = make_project(creator, goal_amount=goal_amount)
+    db.session.commit()
+    return project.id, [u.id for u in users]
+
+
+def test_sharded_pledges_are_summed_and_folded(app):
+    project_id, user_ids = setup_project(app)
+    counter = FundingCounterService()
+    counter.enable_sharding(project_id)
+
+    service = BackerService()
+    for i in range(20):
+        result = service.back_project(project_id, user_ids[i % len(user_ids)], {'amount': '10.00'})
+        assert 'error' not in result
+
+    db.session.expire_all()
+    project = db.session.get(Project, project_id)
+    assert project.current_amount == Decimal('0')
+    assert project.backers_count == len(user_ids)
+    assert sum(s.amount for s in ProjectFundingShard.query.filter_by(project_id=project_id)) == Decimal('200.00')
+    assert counter.get_current_amount(project_id) == Decimal('200.00')
+
+    assert counter.fold(project_id) == Decimal('200.00')
+    db.session.expire_all()
+    assert db.session.get(Project, project_id).current_amount == Decimal('200.00')
+    assert all(s.amount == 0 for s in ProjectFundingShard.query.filter_by(project_id=project_id))
+
+
+def test_sharded_project_is_marked_funded_at_goal(app):
+    project_id, user_ids = setup_project(app, goal_amount='50.00')
+    FundingCounterService().enable_sharding(project_id)
+
+    service = BackerService()
+    statuses = [
+        service.back_project(project_id, user_ids[0], {'amount': '10.00'})['project_status']
+        for _ in range(5)
+    ]
+
+    assert statuses == ['ACTIVE'] * 4 + ['FUNDED']
+    db.session.expire_all()
+    assert db.session.get(Project, project_id).status == ProjectStatus.FUNDED
+
+
+def test_fold_marks_funded_when_concurrent_pledges_missed_the_goal(app):
+    project_id, _ = setup_project(app, goal_amount='50.00')
+    counter = FundingCounterService()
+    counter.enable_sharding(project_id)
+    # Two pledges that each saw only their own shard write and stayed ACTIVE
+    for shard_id in (0, 1):
+        shard = db.session.get(ProjectFundingShard, (project_id, shard_id))
+        shard.amount = Decimal('30.00')
+    db.session.commit()
+
+    counter.fold(project_id)
+
+    db.session.expire_all()
+    assert db.session.get(Project, project_id).status == ProjectStatus.FUNDED
+
+
+def test_sharding_switches_on_above_pledge_rate(app):
+    project_id, user_ids = setup_project(app)
+    app.config['FUNDING_SHARD_RATE_THRESHOLD'] = 3
+
+    service = BackerService()
+    for _ in range(3):
+        service.back_project(project_id, user_ids[0], {'amount': '1.00'})
+
+    db.session.expire_all()
+    project = db.session.get(Project, project_id)
+    assert project.sharded_funding is True
+    assert ProjectFundingShard.query.filter_by(project_id=project_id).count() == 4
+
+
+def test_cached_total_is_dropped_after_the_pledge_commits(app):
+    project_id, _ = setup_project(app)
+    funding_counter.enable_sharding(project_id)
+    assert funding_counter.get_current_amount(project_id) == Decimal('0.00')
+
+    with Session(db.engine) as session:
+        funding_counter.add_pledge(session, project_id, Decimal('10.00'))
+        # A reader between the pledge and its commit caches the old total
+        assert funding_counter.get_current_amount(project_id) == Decimal('0.00')
+        session.commit()
+
+    assert funding_counter.get_current_amount(project_id) == Decimal('10.00')
+
+
+def test_listings_show_the_folded_amount_without_querying_shards(app):
+    project_id, user_ids = setup_project(app)
+    funding_counter.enable_sharding(project_id)
+    BackerService().back_project(project_id, user_ids[0], {'amount': '10.00'})
+    db.session.expire_all()
+    project = db.session.get(Project, project_id)
+
+    with StatementCounter(db.engine) as counter:
+        assert project.to_dict()['current_amount'] == Decimal('0')
+    assert counter.count == 0
+    assert project.to_dict(live_amount=True)['current_amount'] == Decimal('10.00')
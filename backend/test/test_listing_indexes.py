@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app import db
+from app.models import Project
+from app.models.enums import ProjectStatus
+from app.services.backer_service import BackerService
+
+from helpers import make_user, make_project
+
+
+def query_plan(statement):
+    compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {compiled}')).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+def test_funding_ratio_kept_in_sync(app):
+    creator = make_user('creator')
+    backer = make_user('backer')
+    db.session.flush()
+    project = make_project(creator, goal_amount='200.00')
+    project.current_amount = Decimal('50.00')
+    db.session.commit()
+    assert project.funding_ratio == 0.25
+
+    BackerService().back_project(project.id, backer.id, {'amount': '50.00'})
+    db.session.expire_all()
+    assert project.funding_ratio == 0.5
+
+    project.goal_amount = Decimal('400.00')
+    db.session.commit()
+    db.session.expire_all()
+    assert project.funding_ratio == 0.25
+
+
+def test_listing_sorts_use_composite_indexes(app):
+    by_ratio = select(Project.id).where(
+        Project.status == ProjectStatus.ACTIVE, Project.is_deleted.is_(False)
+    ).order_by(Project.funding_ratio.desc()).limit(4)
+    plan = query_plan(by_ratio)
+    assert 'ix_projects_status_deleted_ratio' in plan
+    assert 'TEMP B-TREE' not in plan
+
+    newest = select(Project.id).where(Project.status == ProjectStatus.ACTIVE)\
+        .order_by(Project.created_at.desc()).limit(10)
+    plan = query_plan(newest)
+    assert 'ix_projects_status_created' in plan
+    assert 'TEMP B-TREE' not in plan
+
+    by_creator = select(Project.id).where(
+        Project.creator_id == 1, Project.status == ProjectStatus.ACTIVE
+    ).order_by(Project.created_at.desc())
+    plan = query_plan(by_creator)
+    assert 'ix_projects_creator_status_created' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,49 @@
+from app import db
+from app.models import Notification, Role
+from app.models.enums import NotificationType
+from app.models.project import project_backers
+from app.models.saved_project import SavedProject
+from app.services.notification_service import NotificationService
+from helpers import make_user, make_project, StatementCounter
+
+
+def test_admin_notification_is_one_statement(app):
+    admin_role, user_role = Role(name='Admin'), Role(name='User')
+    admins = [make_user(f'admin{i}') for i in range(30)]
+    for admin in admins:
+        admin.roles.append(admin_role)
+    make_user('regular').roles.append(user_role)
+    db.session.commit()
+    admin_ids = {admin.id for admin in admins}
+
+    with StatementCounter(db.engine) as counter:
+        count = NotificationService.create_admin_notification('Project needs review')
+
+    assert count == 30
+    assert counter.count == 1
+    notifications = Notification.query.all()
+    assert {n.user_id for n in notifications} == admin_ids
+    assert {(n.type, n.message) for n in notifications} == {(NotificationType.ADMIN_REVIEW, 'Project needs review')}
+
+
+def test_backer_and_follower_audiences(app):
+    creator, alice, bob, carol = (make_user(name) for name in ('creator', 'alice', 'bob', 'carol'))
+    db.session.flush()
+    project = make_project(creator)
+    project.backers.extend([alice, bob])
+    db.session.flush()
+    # project_backers has no key, so a pair can appear twice
+    db.session.execute(project_backers.insert().values(user_id=alice.id, project_id=project.id))
+    db.session.add(SavedProject(user_id=carol.id, project_id=project.id))
+    db.session.commit()
+    project_id = project.id
+
+    backers = NotificationService.notify_audience(
+        NotificationService.project_backer_audience(project_id), 'New update', NotificationType.PROJECT_UPDATE, project_id
+    )
+    followers = NotificationService.notify_audience(
+        NotificationService.project_follower_audience(project_id), 'New reward', NotificationType.PROJECT_UPDATE, project_id
+    )
+
+    assert (backers, followers) == (2, 1)
+    assert sorted(n.user.username for n in Notification.query.filter_by(project_id=project_id)) == ['alice', 'bob', 'carol']
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+from app import db
+from app.models import EmailDelivery, EmailDeliveryStatus, OutboxMessage, OutboxStatus, User
+from app.services.auth_service import AuthService
+from app.services.email_transport import MemoryTransport
+from app.services.outbox import outbox
+
+
+def use_memory_transport(app):
+    transport = app.extensions['email_transport'] = MemoryTransport()
+    return transport
+
+
+def test_registration_email_is_sent_after_commit(app):
+    transport = use_memory_transport(app)
+
+    with app.test_request_context():
+        ok, _ = AuthService.register_user('alice', 'alice@example.com', 'Sup3r$ecretPass')
+
+    assert ok
+    user = User.query.filter_by(username='alice').one()
+    [message] = OutboxMessage.query.all()
+    assert message.status == OutboxStatus.DISPATCHED
+    assert EmailDelivery.query.one().status == EmailDeliveryStatus.SENT
+    [email] = transport.outbox
+    assert email['to'] == 'alice@example.com'
+    assert user.verification_token in email['text']
+
+
+def test_rolled_back_changes_send_nothing(app):
+    transport = use_memory_transport(app)
+
+    outbox.add_email(db.session, 'bob@example.com', '2fa_disabled', user=SimpleNamespace(username='bob'))
+    db.session.rollback()
+    db.session.commit()
+
+    assert OutboxMessage.query.count() == 0
+    assert transport.outbox == []
+
+
+def test_relay_drains_in_batches_and_backs_off_failures(app):
+    transport = use_memory_transport(app)
+    # Written without a commit hook, as if the writing process died before relaying
+    for i in range(5):
+        db.session.add(OutboxMessage(kind='email', status=OutboxStatus.PENDING, attempts=0, payload={
+            'to_email': f'user{i}@example.com', 'email_type': '2fa_disabled',
+            'subject': 'Hi', 'text_content': 'text', 'html_content': '<p>html</p>',
+        }))
+    broken = OutboxMessage(kind='email', payload={'to_email': 'x@example.com'},
+                           status=OutboxStatus.PENDING, attempts=0)
+    db.session.add(broken)
+    db.session.commit()
+    broken_id = broken.id
+
+    assert outbox.drain(batch_size=2) == 5
+
+    assert sorted(email['to'] for email in transport.outbox) == [f'user{i}@example.com' for i in range(5)]
+    db.session.expire_all()
+    broken = db.session.get(OutboxMessage, broken_id)
+    assert (broken.status, broken.attempts) == (OutboxStatus.PENDING, 1)
+    assert outbox.drain() == 0
+
+
+def test_relay_and_sweeps_start_with_the_app(app):
+    from app import start_background_workers
+    from app.services.bulk_email_service import bulk_email
+    from app.services.email_queue import email_queue
+
+    workers = (outbox._worker, email_queue._sweeper, bulk_email._sweeper)
+    try:
+        start_background_workers(app)
+        assert all(worker._thread.is_alive() for worker in workers)
+        assert outbox._worker.interval == app.config['OUTBOX_RELAY_INTERVAL']
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+def test_workers_wait_for_the_first_request(app, monkeypatch):
+    import app as app_package
+    from config import Config
+
+    started = []
+    monkeypatch.setattr(Config, 'BACKGROUND_WORKERS_ENABLED', True)
+    monkeypatch.setattr(app_package, 'start_background_workers', started.append)
+
+    web_app = app_package.create_app()
+    assert started == []  # what `flask db upgrade` or the Celery worker would do
+
+    web_app.test_client().get('/health')
+    assert started == [web_app]
+
+
+def test_savepoint_rollback_still_wakes_the_relay(app, monkeypatch):
+    woken = []
+    monkeypatch.setattr(outbox, 'notify', lambda: woken.append(True))
+
+    outbox.add_email(db.session, 'bob@example.com', '2fa_disabled', user=SimpleNamespace(username='bob'))
+    savepoint = db.session.begin_nested()
+    savepoint.rollback()
+    db.session.commit()
+
+    assert woken == [True]
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models import Project
+from app.utils.exceptions import ValidationError
+from app.utils.pagination import keyset_paginate
+
+from helpers import make_user, make_project, StatementCounter
+
+
+@pytest.fixture
+def many_projects(app):
+    creator = make_user('creator')
+    db.session.flush()
+    # Several projects share a created_at, so the id tie-breaker matters
+    for i in range(23):
+        project = make_project(creator)
+        project.created_at = datetime(2026, 1, 1 + i // 4)
+    db.session.commit()
+
+
+def walk(query, sort_column, per_page, **kwargs):
+    ids, cursor = [], ''
+    while True:
+        page = keyset_paginate(query, sort_column, Project.id, per_page, cursor=cursor, **kwargs)
+        ids.extend(p.id for p in page.items)
+        if not page.has_more:
+            return ids
+        cursor = page.next_cursor
+
+
+def test_keyset_pages_match_offset_order(many_projects):
+    query = Project.query.filter_by(is_deleted=False)
+    expected = [p.id for p in query.order_by(Project.created_at.desc(), Project.id.desc())]
+
+    assert walk(query, Project.created_at, 5) == expected
+    assert walk(query, Project.created_at, 5, descending=False) == expected[::-1]
+
+
+def test_keyset_total_is_optional(many_projects):
+    query = Project.query.filter_by(is_deleted=False)
+    with StatementCounter(db.engine) as without_total:
+        page = keyset_paginate(query, Project.created_at, Project.id, 5)
+    assert page.total is None
+    assert keyset_paginate(query, Project.created_at, Project.id, 5, with_total=True).total == 23
+    assert without_total.count == 1
+
+
+def test_keyset_rejects_foreign_cursor(many_projects):
+    query = Project.query.filter_by(is_deleted=False)
+    cursor = keyset_paginate(query, Project.created_at, Project.id, 5).next_cursor
+
+    with pytest.raises(ValidationError):
+        keyset_paginate(query, Project.funding_ratio, Project.id, 5, cursor=cursor)
+    with pytest.raises(ValidationError):
+        keyset_paginate(query, Project.created_at, Project.id, 5, cursor='not-a-cursor')
@@ -0,0 +1,99 @@
+import pytest
+from flask_jwt_extended import create_access_token, decode_token, jwt_required
+
+from app import db
+from app.models import Role, Permission
+from app.services.auth_service import AuthService
+from app.services.permission_registry import PermissionRegistry, permission_registry
+from app.services.permission_version_cache import permission_versions
+from app.utils.decorators import permission_required
+from helpers import make_user
+
+
+@pytest.fixture
+def permissions(app):
+    permission_registry._bits = None
+    permission_versions._local.clear()
+    names = [f'perm_{i}' for i in range(40)]
+    db.session.add_all(Permission(name=name) for name in names)
+    db.session.commit()
+
+    @app.route('/needs/<name>')
+    @jwt_required()
+    def needs(name):
+        return permission_required(name)(lambda: 'ok')()
+
+    return names
+
+
+def test_bitset_round_trips_through_claims(app, permissions):
+    encoded = permission_registry.encode(['perm_3', 'perm_39'])
+    claims = {'perm_bits': encoded, 'perm_v': permission_registry.version}
+
+    assert permission_registry.token_has_permission(claims, 'perm_3')
+    assert permission_registry.token_has_permission(claims, 'perm_39')
+    assert not permission_registry.token_has_permission(claims, 'perm_4')
+    assert len(encoded) < 10
+
+
+def test_tokens_without_the_names_list_are_authorised_by_bitset(app, client, permissions):
+    assert app.config['JWT_PERMISSION_NAMES_CLAIM'] is False
+    user = make_user('admin')
+    user.roles.append(Role(name='Admin', permissions=Permission.query.all()))
+    db.session.commit()
+    with app.test_request_context():
+        token = AuthService.create_token_for_user(user)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    assert client.get('/needs/perm_17', headers=headers).status_code == 200
+    assert client.get('/needs/not_granted', headers=headers).status_code == 403
+
+
+def test_tokens_issued_before_bitsets_still_use_the_names_list(app, client, permissions):
+    user = make_user('legacy')
+    db.session.commit()
+    with app.test_request_context():
+        token = create_access_token(identity=user.id, additional_claims={
+            'permissions': ['perm_5'],
+            'last_permission_update': user.last_permission_update.timestamp()
+        })
+    headers = {'Authorization': f'Bearer {token}'}
+
+    assert client.get('/needs/perm_5', headers=headers).status_code == 200
+    assert client.get('/needs/perm_6', headers=headers).status_code == 403
+
+
+def test_unknown_version_reloads_the_mapping(app, permissions):
+    permission_registry.load()
+    db.session.add(Permission(name='added_later'))
+    db.session.commit()
+    # Issued by a worker that already knows the new permission
+    other_worker = PermissionRegistry()
+    claims = {'perm_bits': other_worker.encode(['added_later']), 'perm_v': other_worker.version}
+
+    assert permission_registry.token_has_permission(claims, 'added_later')
+    assert permission_registry.version == other_worker.version
+
+
+def test_bits_from_an_older_mapping_are_not_decoded_after_id_reuse(app, client, permissions):
+    user = make_user('reviewer')
+    user.roles.append(Role(name='Reviewer', permissions=[Permission.query.filter_by(name='perm_39').one()]))
+    db.session.commit()
+    with app.test_request_context():
+        token = AuthService.create_token_for_user(user)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # perm_39 is deleted and its id handed to a new permission
+    old = Permission.query.filter_by(name='perm_39').one()
+    reused_id = old.id
+    user.roles[0].permissions.clear()
+    db.session.delete(old)
+    db.session.flush()
+    db.session.add(Permission(id=reused_id, name='delete_everything'))
+    db.session.commit()
+    permission_registry.load()
+
+    claims = decode_token(token)
+    assert not permission_registry.token_has_permission(claims, 'delete_everything')
+    response = client.get('/needs/delete_everything', headers=headers)
+    assert response.status_code == 401
@@ -0,0 +1,73 @@
+import pytest
+from flask_jwt_extended import jwt_required
+
+from app import db
+from app.models import Role, Permission, User
+from app.services.auth_service import AuthService
+from app.services.permission_version_cache import permission_versions
+from app.services.permission_registry import permission_registry
+from app.services.revocation_cache import revocation_cache
+from app.services.role_permission_service import RolePermissionService
+from app.utils.decorators import permission_required
+from helpers import make_user, StatementCounter
+
+
+@pytest.fixture
+def editor(app):
+    app.config['JWT_REVOCATION_LOCAL_ONLY'] = True
+    revocation_cache._trusted = False
+    permission_versions._local.clear()
+    permission_registry._bits = None
+
+    @app.route('/edit')
+    @jwt_required()
+    @permission_required('edit_project')
+    def edit():
+        return 'ok'
+
+    role = Role(name='Editor', permissions=[Permission(name='edit_project')])
+    user = make_user('editor')
+    user.roles.append(role)
+    db.session.commit()
+    with app.test_request_context():
+        token = AuthService.create_token_for_user(user)
+    yield user.id, {'Authorization': f'Bearer {token}'}
+    revocation_cache.stop()
+    revocation_cache._trusted = False
+
+
+def test_permission_check_runs_no_sql_once_cached(app, client, editor):
+    _, headers = editor
+    assert client.get('/edit', headers=headers).status_code == 200
+
+    with StatementCounter(db.engine) as counter:
+        assert client.get('/edit', headers=headers).status_code == 200
+    assert counter.count == 0
+
+
+def test_role_change_invalidates_existing_tokens(app, client, editor):
+    user_id, headers = editor
+    assert client.get('/edit', headers=headers).status_code == 200
+
+    assert RolePermissionService.revoke_roles_from_user(user_id, ['Editor'])['success']
+
+    response = client.get('/edit', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()['message'] == "Your permissions have been updated. Please log in again."
+
+
+def test_tokens_issued_after_a_role_change_are_accepted(app, client, editor):
+    user_id, _ = editor
+    db.session.add(Role(name='Reviewer'))
+    db.session.commit()
+    assert RolePermissionService.assign_roles_to_user(user_id, ['Reviewer'])['success']
+
+    # Round-trip through the column, as a fresh login does
+    db.session.expire_all()
+    user = db.session.get(User, user_id)
+    assert user.last_permission_update.microsecond == 0
+    assert permission_versions.get(user_id) == user.last_permission_update.timestamp()
+
+    with app.test_request_context():
+        token = AuthService.create_token_for_user(user)
+    assert client.get('/edit', headers={'Authorization': f'Bearer {token}'}).status_code == 200
@@ -0,0 +1,41 @@
+import pytest
+
+from app.utils.rate_limit import rate_limit, local_limiter, RedisRateLimiter
+
+
+def test_rate_limit_falls_back_to_local_bucket_without_redis(app, client):
+    @app.route('/limited')
+    @rate_limit(limit=2, per=60)
+    def limited():
+        return 'ok'
+
+    local_limiter._buckets.clear()
+    assert client.get('/limited').status_code == 200
+    assert client.get('/limited').status_code == 200
+
+    response = client.get('/limited')
+    assert response.status_code == 429
+    assert 0 < response.get_json()['meta']['retry_after'] <= 30
+
+
+def test_local_bucket_refills_over_time(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr('app.utils.rate_limit.time.monotonic', lambda: clock[0])
+    local_limiter._buckets.clear()
+
+    assert [local_limiter.hit('k', 3, 3)[0] for _ in range(4)] == [True, True, True, False]
+    clock[0] += 1
+    assert local_limiter.hit('k', 3, 3) == (True, 0.0)
+    assert local_limiter.hit('k', 3, 3)[0] is False
+
+
+def test_gcra_script_allows_burst_then_denies():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    limiter = RedisRateLimiter()
+
+    results = [limiter.hit(redis_client, 'rate_limit:test', 5, 60) for _ in range(6)]
+
+    assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+    assert 11 < results[-1][1] <= 12
@@ -0,0 +1,61 @@
+from flask import Flask
+from flask_caching import Cache
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.utils import redis_client as redis_module
+from app.utils.redis_client import RedisManager
+
+
+def make_manager(url, retry_interval=5):
+    app = Flask(__name__)
+    app.config.update(REDIS_URL=url, REDIS_RETRY_INTERVAL=retry_interval, REDIS_SOCKET_TIMEOUT=1)
+    return RedisManager(app)
+
+
+def test_disabled_without_url():
+    assert make_manager('').client() is None
+
+
+def test_unreachable_redis_is_retried_lazily(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(redis_module.time, 'monotonic', lambda: clock[0])
+    manager = make_manager('redis://127.0.0.1:1/0', retry_interval=5)
+    pings = []
+    monkeypatch.setattr(manager._client, 'ping', lambda: pings.append(1) or True)
+
+    # init_app already failed once; no new attempt until the retry interval passes
+    assert manager.client() is None
+    assert pings == []
+
+    clock[0] += 6
+    assert manager.client() is manager._client
+    assert manager.client() is manager._client
+    assert pings == [1]
+
+    manager.report_error(RedisConnectionError('connection reset'))
+    assert manager.client() is None
+
+
+def test_pool_is_rebuilt_after_fork(monkeypatch):
+    manager = make_manager('redis://127.0.0.1:1/0')
+    parent_pool = manager._pool
+
+    monkeypatch.setattr(redis_module.os, 'getpid', lambda: -1)
+    monkeypatch.setattr(redis_module.time, 'monotonic', lambda: 0.0)
+    manager.client()
+
+    assert manager._pool is not parent_pool
+    assert manager._pid == -1
+
+
+def test_flask_caching_is_handed_the_managed_pool():
+    manager = make_manager('redis://127.0.0.1:1/0')
+    client = manager.binary_client()
+    app = Flask(__name__)
+    app.config.update(CACHE_TYPE='redis', CACHE_REDIS_HOST=client)
+    cache = Cache(app)
+
+    assert client is manager.binary_client()
+    assert cache.cache._write_client is client
+    assert client.connection_pool.connection_kwargs['decode_responses'] is False
+    assert client.connection_pool.max_connections == manager._options['max_connections']
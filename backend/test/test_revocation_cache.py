@@ -0,0 +1,119 @@
+import time
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+
+from app import db
+from app.models import TokenBlocklist
+from app.services.auth_service import AuthService
+from app.services.revocation_cache import revocation_cache, REVOCATION_CHANNEL, REVOKED_KEY
+from app.utils.bloom_filter import BloomFilter
+from app.utils.redis_client import redis_manager
+from helpers import StatementCounter
+
+LATER = datetime.utcnow() + timedelta(days=1)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    revocation_cache._trusted = False
+    yield
+    revocation_cache.stop()
+    revocation_cache._trusted = False
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    jtis = [str(uuid.uuid4()) for _ in range(1000)]
+    for jti in jtis:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in jtis)
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+    assert false_positives < 50
+
+
+def test_without_redis_every_lookup_goes_to_the_database(app):
+    AuthService.logout_user('revoked-jti', LATER)
+
+    with StatementCounter(db.engine) as counter:
+        assert AuthService.check_if_token_revoked('revoked-jti') is True
+        assert AuthService.check_if_token_revoked('live-jti') is False
+    assert counter.count == 2
+
+
+def test_trusted_filter_skips_the_database_for_live_tokens(app):
+    app.config['JWT_REVOCATION_LOCAL_ONLY'] = True
+    AuthService.logout_user('revoked-jti', LATER)
+    AuthService.check_if_token_revoked('warm-up')
+
+    with StatementCounter(db.engine) as counter:
+        assert AuthService.check_if_token_revoked('live-jti') is False
+    assert counter.count == 0
+
+    AuthService.logout_user('revoked-later', LATER)
+    assert AuthService.check_if_token_revoked('revoked-later') is True
+    assert AuthService.check_if_token_revoked('revoked-jti') is True
+
+
+def test_revocations_published_by_other_workers_reach_the_filter(app, monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_manager, 'client', lambda: redis_client)
+
+    AuthService.check_if_token_revoked('warm-up')
+    deadline = time.monotonic() + 5
+    while not revocation_cache._trusted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert revocation_cache._trusted
+
+    # Another worker revoked this token: the row exists, the local filter learns of it by pub/sub
+    db.session.add(TokenBlocklist(jti='elsewhere', created_at=datetime.utcnow(), expires_at=LATER))
+    db.session.commit()
+    redis_client.publish(REVOCATION_CHANNEL, 'elsewhere')
+
+    deadline = time.monotonic() + 5
+    while 'elsewhere' not in revocation_cache._filter and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert AuthService.check_if_token_revoked('elsewhere') is True
+
+
+def test_resync_restores_revocations_missing_from_redis(app, monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_manager, 'client', lambda: redis_client)
+    revocation_cache.resync()
+
+    # Revoked by a worker whose ZADD and PUBLISH failed: only the row exists
+    db.session.add(TokenBlocklist(jti='unpublished', created_at=datetime.utcnow(), expires_at=LATER))
+    db.session.commit()
+    assert 'unpublished' not in revocation_cache._filter
+
+    revocation_cache.resync()
+
+    assert 'unpublished' in revocation_cache._filter
+    assert redis_client.zscore(REVOKED_KEY, 'unpublished') is not None
+
+
+def test_prune_deletes_only_expired_rows_in_batches(app):
+    now = datetime.utcnow()
+    for i in range(7):
+        db.session.add(TokenBlocklist(jti=f'old-{i}', created_at=now - timedelta(days=40), expires_at=now - timedelta(days=10)))
+    db.session.add(TokenBlocklist(jti='current', created_at=now, expires_at=LATER))
+    db.session.commit()
+
+    assert revocation_cache.prune_expired(batch_size=3, max_batches=2) == 6
+    assert revocation_cache.prune_expired(batch_size=3) == 1
+    assert [row.jti for row in TokenBlocklist.query.all()] == ['current']
+
+
+def test_compact_command_removes_expired_rows(app):
+    now = datetime.utcnow()
+    db.session.add(TokenBlocklist(jti='old', created_at=now - timedelta(days=40), expires_at=now - timedelta(days=10)))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['compact-token-blocklist'])
+
+    assert 'Deleted 1 expired token_blocklist rows.' in result.output
+    assert TokenBlocklist.query.count() == 0
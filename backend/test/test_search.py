@@ -0,0 +1,52 @@
+from app import db
+from app.models import Category
+from app.models.enums import ProjectStatus
+from app.services.search_service import search_projects
+
+from helpers import make_user, make_project
+
+
+def make_search_project(creator, title, description, status=ProjectStatus.ACTIVE):
+    project = make_project(creator, status=status)
+    project.title = title
+    project.description = description
+    return project
+
+
+def test_search_ranks_title_matches_first(app):
+    creator = make_user('creator')
+    db.session.flush()
+    in_description = make_search_project(creator, 'Community garden', 'Raised beds and solar lights')
+    in_title = make_search_project(creator, 'Solar kiosk', 'A kiosk for the market')
+    make_search_project(creator, 'Bakery', 'Fresh bread')
+    make_search_project(creator, 'Solar draft', 'Not live yet', status=ProjectStatus.DRAFT)
+    db.session.commit()
+
+    projects, total = search_projects('solar')
+
+    assert total == 2
+    assert [p.id for p in projects] == [in_title.id, in_description.id]
+
+
+def test_search_keeps_category_filter_and_pagination(app, client):
+    creator = make_user('creator')
+    db.session.flush()
+    for i in range(5):
+        make_search_project(creator, f'Robot kit {i}', 'Build a robot')
+    other = Category(name='Music')
+    db.session.add(other)
+    music = make_search_project(creator, 'Robot band', 'Robots playing music')
+    db.session.flush()
+    music.category_id = other.id
+    db.session.commit()
+
+    response = client.get('/api/v1/projects/search?q=robot&per_page=2&page=3')
+    data = response.get_json()['data']
+    assert response.status_code == 200
+    assert data['total'] == 6
+    assert data['pages'] == 3
+    assert len(data['projects']) == 2
+
+    response = client.get(f'/api/v1/projects/search?q=robot&category_id={other.id}')
+    data = response.get_json()['data']
+    assert [p['title'] for p in data['projects']] == ['Robot band']
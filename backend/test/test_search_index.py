@@ -0,0 +1,60 @@
+from app import db
+from app.models.enums import ProjectStatus
+from app.models.tag import Tag
+from app.services import search_service
+from app.services.project_service import activate_project
+from app.services.search_index import search_index
+
+from helpers import make_user, make_project
+
+
+def test_index_ranks_and_updates_incrementally(app, monkeypatch):
+    app.config['SEARCH_INDEX_ENABLED'] = True
+    # Build and sync explicitly instead of from the background thread
+    monkeypatch.setattr(search_index, 'ensure_started', lambda: True)
+    creator = make_user('creator')
+    db.session.flush()
+    garden = make_project(creator)
+    garden.title, garden.description = 'Community garden', 'Solar powered watering'
+    kiosk = make_project(creator)
+    kiosk.title, kiosk.description = 'Solar kiosk', 'Phone charging at the market'
+    kiosk.tags.append(Tag(name='solar'))
+    pending = make_project(creator, status=ProjectStatus.PENDING)
+    pending.title, pending.description = 'Solar bikes', 'Bikes with solar lights'
+    db.session.commit()
+
+    assert search_index.rebuild() == 2
+    ids, total = search_index.search('sol')
+    assert (ids, total) == ([kiosk.id, garden.id], 2)
+
+    activate_project(pending.id)
+    ids, total = search_index.search('solar')
+    assert total == 3
+    assert ids[-1] == garden.id
+
+    garden.status = ProjectStatus.REVOKED
+    db.session.commit()
+    search_index.index_project(garden)
+    projects, total = search_service.search_projects('solar')
+    assert total == 2
+    assert garden.id not in [p.id for p in projects]
+
+    assert search_index.search('solar', category_id=garden.category_id + 1) == ([], 0)
+
+
+def test_rows_from_a_stale_index_are_filtered_on_load(app, monkeypatch):
+    app.config['SEARCH_INDEX_ENABLED'] = True
+    monkeypatch.setattr(search_index, 'ensure_started', lambda: True)
+    creator = make_user('creator')
+    db.session.flush()
+    kept, removed = make_project(creator), make_project(creator)
+    kept.title = removed.title = 'Solar kiosk'
+    db.session.commit()
+    search_index.rebuild()
+
+    # Deleted after the index was built and before it synced
+    removed.is_deleted = True
+    db.session.commit()
+
+    projects, _ = search_service.search_projects('solar')
+    assert [p.id for p in projects] == [kept.id]
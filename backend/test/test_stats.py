@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from app import db
+from app.models import Donation, ProjectStats, UserStats
+from app.models.enums import DonationStatus
+from app.models.payout import Payout, PayoutStatus
+from app.services.backer_service import BackerService
+from app.services.payout_service import PayoutService
+from app.services.stats_service import rebuild_stats
+from helpers import make_user, make_project, StatementCounter
+
+
+def donate(project, user, amount, status=DonationStatus.PENDING):
+    donation = Donation(user_id=user.id, project_id=project.id, amount=Decimal(amount), status=status)
+    db.session.add(donation)
+    db.session.commit()
+    return donation
+
+
+def snapshot(project_id, user_ids):
+    db.session.expire_all()
+    stats = db.session.get(ProjectStats, project_id)
+    project = (stats.donation_count, stats.donation_amount, stats.completed_amount,
+               stats.backer_count, stats.paid_out_amount)
+    users = {uid: (s.donation_count, s.donation_amount, s.completed_amount)
+             for uid in user_ids for s in [db.session.get(UserStats, uid)] if s}
+    return project, users
+
+
+def test_flushes_keep_stats_current(app):
+    creator, alice, bob = make_user('creator'), make_user('alice'), make_user('bob')
+    db.session.flush()
+    project = make_project(creator)
+    db.session.commit()
+
+    first = donate(project, alice, '10.00')
+    donate(project, alice, '5.00', DonationStatus.COMPLETED)
+    to_delete = donate(project, bob, '20.00')
+
+    # Changed after commit, i.e. on an expired instance
+    first.status = DonationStatus.COMPLETED
+    db.session.commit()
+    db.session.delete(to_delete)
+    db.session.add(Payout(project_id=project.id, user_id=creator.id, amount=Decimal('4.00'),
+                          status=PayoutStatus.PROCESSING))
+    db.session.commit()
+
+    project_stats, user_stats = snapshot(project.id, [alice.id, bob.id])
+    assert project_stats == (2, Decimal('15.00'), Decimal('15.00'), 1, Decimal('4.00'))
+    assert user_stats[alice.id] == (2, Decimal('15.00'), Decimal('15.00'))
+    assert user_stats[bob.id] == (0, Decimal('0'), Decimal('0'))
+
+    assert PayoutService().calculate_available_funds(project.id)['total_paid_out'] == 4.0
+
+
+def test_rebuild_matches_maintained_stats(app):
+    creator, alice, bob = make_user('creator'), make_user('alice'), make_user('bob')
+    db.session.flush()
+    project = make_project(creator)
+    db.session.commit()
+    donate(project, alice, '10.00', DonationStatus.COMPLETED)
+    donate(project, bob, '7.50')
+    db.session.add(Payout(project_id=project.id, user_id=creator.id, amount=Decimal('3.00'),
+                          status=PayoutStatus.COMPLETED))
+    db.session.commit()
+    maintained = snapshot(project.id, [alice.id, bob.id])
+
+    db.session.execute(ProjectStats.__table__.update().values(donation_count=99, backer_count=0))
+    db.session.commit()
+    assert rebuild_stats() == (1, 2)
+
+    assert snapshot(project.id, [alice.id, bob.id]) == maintained
+
+
+def test_public_stats_are_a_primary_key_lookup(app):
+    creator = make_user('creator')
+    db.session.flush()
+    project = make_project(creator)
+    db.session.commit()
+    for i in range(25):
+        backer = make_user(f'backer{i}')
+        db.session.flush()
+        donate(project, backer, '1.00')
+
+    project_id = project.id
+    with StatementCounter(db.engine) as counter:
+        result = BackerService().get_public_backer_stats(project_id)
+
+    assert result['total_backers'] == 25
+    assert result['total_amount'] == 25.0
+    assert counter.count == 2
@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from app import db
+from app.models import User
+from app.services.user_service import UserService
+from helpers import make_user, make_project, back, StatementCounter
+
+
+def make_active_user(projects, donations):
+    user = make_user(f'active{projects}x{donations}')
+    db.session.flush()
+    for _ in range(projects):
+        make_project(user)
+    target = make_project(make_user(f'creator{projects}x{donations}'))
+    for _ in range(donations):
+        back(target, user, '2.50')
+    db.session.commit()
+    return user.id
+
+
+def test_user_aggregates_match_the_collections(app):
+    user_id = make_active_user(projects=3, donations=4)
+    db.session.expire_all()
+
+    data = User.query.get(user_id).to_dict()
+
+    assert data['projects_created_count'] == 3
+    assert data['backed_projects_count'] == 1
+    assert Decimal(data['total_donations']) == Decimal('10.00')
+
+
+def test_profile_query_count_does_not_grow_with_activity(app):
+    counts = []
+    for projects, donations in ((1, 1), (5, 40)):
+        user_id = make_active_user(projects, donations)
+        db.session.expire_all()
+        with StatementCounter(db.engine) as counter:
+            UserService.get_user_public_profile(user_id)
+        counts.append(counter.count)
+
+    assert counts[0] == counts[1] <= 2
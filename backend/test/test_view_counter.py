@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy import event
+
+from app import db
+from app.models import User, Category, Project
+from app.models.enums import ProjectStatus
+from app.services.view_counter_service import ViewCounterService, FLUSHING_KEY_PREFIX
+from app.utils.redis_client import redis_manager
+
+
+def make_projects(count):
+    creator = User(username='creator', email='creator@example.com', password_hash='not-a-real-hash')
+    category = Category(name='General')
+    db.session.add_all([creator, category])
+    db.session.flush()
+    projects = [Project(
+        title=f'Project {i}',
+        description='A project used in tests',
+        goal_amount=Decimal('100.00'),
+        start_date=datetime.utcnow(),
+        end_date=datetime.utcnow() + timedelta(days=30),
+        creator_id=creator.id,
+        category_id=category.id,
+        status=ProjectStatus.ACTIVE
+    ) for i in range(count)]
+    db.session.add_all(projects)
+    db.session.commit()
+    return [p.id for p in projects]
+
+
+def test_views_are_buffered_until_flush(app):
+    app.config['VIEW_COUNT_FLUSH_INTERVAL'] = 3600
+    first, second = make_projects(2)
+    counter = ViewCounterService()
+
+    for _ in range(3):
+        counter.record_view(first)
+    counter.record_view(second)
+
+    assert db.session.get(Project, first).view_count == 0
+
+    assert counter.flush() == 4
+    db.session.expire_all()
+    assert db.session.get(Project, first).view_count == 3
+    assert db.session.get(Project, second).view_count == 1
+    assert counter.flush() == 0
+
+
+def test_flush_issues_one_update_per_batch(app):
+    app.config['VIEW_COUNT_FLUSH_INTERVAL'] = 3600
+    app.config['VIEW_COUNT_FLUSH_BATCH_SIZE'] = 10
+    project_ids = make_projects(25)
+    counter = ViewCounterService()
+    for project_id in project_ids:
+        counter.record_view(project_id)
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        counter.flush()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+    assert len([s for s in statements if s.lstrip().upper().startswith('UPDATE')]) == 3
+
+
+def test_counts_survive_a_failed_redis_drain(app, monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    app.config['VIEW_COUNT_FLUSH_INTERVAL'] = 3600
+    (project_id,) = make_projects(1)
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_manager, 'client', lambda: redis_client)
+    counter = ViewCounterService()
+    counter.record_view(project_id)
+    counter._local_counts[project_id] += 1
+
+    # Redis fails after the pending hash was renamed
+    monkeypatch.setattr(redis_client, 'hgetall', lambda key: (_ for _ in ()).throw(RedisError('gone')))
+    assert counter.flush() == 1
+    assert redis_client.keys(f'{FLUSHING_KEY_PREFIX}*')
+    monkeypatch.undo()
+    monkeypatch.setattr(redis_manager, 'client', lambda: redis_client)
+
+    # Not stale yet: left for the flusher that may still own it
+    assert counter.flush() == 0
+    app.config['VIEW_COUNT_ORPHAN_AGE'] = -1
+    assert counter.flush() == 1
+    assert not redis_client.keys(f'{FLUSHING_KEY_PREFIX}*')
+    db.session.expire_all()
+    assert db.session.get(Project, project_id).view_count == 2